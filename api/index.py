@@ -1,15 +1,17 @@
 import sys
 import os
-from dotenv import load_dotenv
-import openai
-from flask import Flask, request, jsonify, send_file
+import time
+from flask import Flask, Request, request, jsonify, send_file
 from flask_cors import CORS
-from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# 콜드 스타트 시간 단축을 위해 openai, PyPDF2, xlsxwriter 등 무거운 모듈은 처음 사용하는
+# 엔드포인트에서 임포트합니다 (openai 임포트만 수백 ms).
 
 # 상대 경로 처리를 위한 설정
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# 환경 변수 로드
+# 환경 변수 로드 (배포 환경에는 .env가 없으므로 파일이 있을 때만 python-dotenv를 임포트)
 dotenv_paths = [
     os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'),
     os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
@@ -17,6 +19,7 @@ dotenv_paths = [
 
 for dotenv_path in dotenv_paths:
     if os.path.exists(dotenv_path):
+        from dotenv import load_dotenv
         print(f"환경 설정 파일을 로드합니다: {dotenv_path}")
         load_dotenv(dotenv_path)
         break
@@ -24,34 +27,61 @@ for dotenv_path in dotenv_paths:
 # Config 클래스 및 기타 임포트
 from src.utils.config import Config
 
-# 앱 초기화
+class SpooledUploadRequest(Request):
+    """multipart 파일 파트를 요청 크기가 UPLOAD_SPOOL_MB 이하이면 메모리에, 그보다 크면 임시 파일에 받는 요청 클래스"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        from src.utils.upload import spool_file
+        return spool_file(total_content_length, Config.UPLOAD_SPOOL_MB * 1024 * 1024)
+
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 CORS(app)
 
 # Config 초기화
 Config.init_app()
 
-# OpenAI API 키 설정
-api_key = os.getenv("OPENAI_API_KEY") or Config.OPENAI_API_KEY
-if api_key:
-    openai.api_key = api_key
-    try:
-        openai_client = openai.OpenAI(api_key=api_key)
-    except Exception as e:
-        print(f"OpenAI 클라이언트 초기화 실패: {e}")
-else:
+# OpenAI API 키 확인 (공용 클라이언트(src.llm.client)가 첫 요청 시 환경 변수에서 읽음)
+if not (os.getenv("OPENAI_API_KEY") or Config.OPENAI_API_KEY):
     print("경고: API 키를 찾을 수 없습니다!")
 
 # 환경 변수 설정
-upload_folder = Config.UPLOAD_FOLDER if hasattr(Config, 'UPLOAD_FOLDER') else 'uploads'
 max_content_length = Config.MAX_CONTENT_LENGTH if hasattr(Config, 'MAX_CONTENT_LENGTH') else 16 * 1024 * 1024
 
-# 서버리스 환경에서는 /tmp 폴더를 사용해야 함
-app.config['UPLOAD_FOLDER'] = '/tmp/uploads'
+# 업로드는 디스크에 저장하지 않음 (서버리스 환경의 /tmp는 출력 파일에만 사용)
 app.config['MAX_CONTENT_LENGTH'] = int(max_content_length)
 
-# 업로드 폴더 생성
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+def warm():
+    """
+    무거운 모듈을 임포트하고 OpenAI 클라이언트를 만들어 둡니다.
+    
+    모듈 수준 싱글턴은 웜 컨테이너에서 다음 호출까지 유지되므로, 한 번 실행하면 이후
+    요청은 임포트와 연결 풀 생성 비용 없이 처리됩니다.
+    
+    Returns:
+        dict: 단계별 소요 시간 (ms)
+    """
+    timings = {}
+    started = time.perf_counter()
+    import src.pdf_processor.extractor  # noqa: F401
+    import src.excel.generator  # noqa: F401
+    timings['modules_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    started = time.perf_counter()
+    import src.llm.openai_client  # noqa: F401
+    from src.llm import client
+    client.get_client()
+    timings['openai_client_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
+
+# 초기화 단계에서 미리 로드 (스냅샷 또는 초기화 시간이 과금/제한에 포함되지 않는 플랫폼용)
+if Config.WARM_ON_START:
+    print(f"초기화 단계 미리 로드: {warm()}")
+
+@app.route('/api/warm', methods=['GET'])
+def warm_endpoint():
+    """예약 호출(cron) 등으로 컨테이너를 데워 두는 엔드포인트"""
+    return jsonify({'success': True, **warm()})
 
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
@@ -67,34 +97,37 @@ def upload_file():
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({'error': 'PDF 파일만 업로드 가능합니다'}), 400
         
+        # 요청 크기 한도(MAX_CONTENT_LENGTH)는 werkzeug가 본문을 받기 전에 검사하며(초과 시 413),
+        # 받아 둔 버퍼를 복사하지 않고 그대로 해시 계산과 추출에 사용
+        from src.utils.upload import receive_upload
         try:
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
-            
-            file_size = os.path.getsize(file_path)
-            if file_size > app.config['MAX_CONTENT_LENGTH']:
-                os.remove(file_path)
-                return jsonify({'error': f'파일 크기가 {app.config["MAX_CONTENT_LENGTH"]/1024/1024:.1f}MB를 초과합니다'}), 413
-            
+            upload = receive_upload(file.stream)
         except Exception as e:
             return jsonify({'error': f'파일 저장 중 오류 발생: {str(e)}'}), 500
         
+        # 서버리스 인스턴스에는 백그라운드 스레드가 없으므로 업로드 시점에 오래된 출력 파일 정리
+        from src.utils.retention import purge_old_files
+        purge_old_files('/tmp/output', Config.FILE_RETENTION_HOURS * 3600)
+        
         try:
             import src.pdf_processor.extractor as extractor
-            extracted_text = extractor.extract_text_from_pdf(file_path)
+            extracted_text = extractor.extract_text_from_pdf(upload.data)
             
             if not extracted_text:
                 return jsonify({'error': 'PDF에서 텍스트를 추출할 수 없습니다. 텍스트 기반 PDF인지 확인하세요.'}), 400
             
         except Exception as e:
             return jsonify({'error': f'PDF 텍스트 추출 중 오류 발생: {str(e)}'}), 500
+        finally:
+            upload.close()
         
         return jsonify({
             'success': True, 
             'text': extracted_text, 
-            'file_path': file_path
+            'file_hash': upload.sha256
         })
+    except RequestEntityTooLarge:
+        raise  # 413 핸들러에서 처리
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -135,6 +168,10 @@ def download(filename):
         filename = os.path.join('/tmp', filename)
     return send_file(filename, as_attachment=True)
 
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({'error': f'파일 크기가 {app.config["MAX_CONTENT_LENGTH"]/1024/1024:.1f}MB를 초과합니다'}), 413
+
 # Vercel 서버리스 함수 지원을 위한 handler
 def handler(event, context):
     return app(event, context)
@@ -1,7 +1,19 @@
-import pandas as pd
 import os
+import uuid
+import xlsxwriter
 from datetime import datetime
 
+SHEET_NAME = 'Test Cases'
+
+# 헤더 스타일 (기존 pandas to_excel 기본 헤더와 동일)
+HEADER_FORMAT = {
+    'bold': True,
+    'border': 1,
+    'align': 'center',
+    'valign': 'top'
+}
+
+
 def generate_excel(test_cases, output_path=None):
     """
     테스트 케이스 목록을 Excel 파일로 변환합니다.
@@ -20,26 +32,58 @@ def generate_excel(test_cases, output_path=None):
         
         # 파일명 생성 (기본값: 현재 날짜/시간)
         if not output_path:
+            # 같은 초에 들어온 요청끼리 덮어쓰지 않도록 임의 접미사를 붙임
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = os.path.join(output_dir, f"test_cases_{timestamp}.xlsx")
+            output_path = os.path.join(output_dir, f"test_cases_{timestamp}_{uuid.uuid4().hex[:8]}.xlsx")
         
-        # 데이터프레임 생성
-        df = pd.DataFrame(test_cases)
-        
-        # Excel 파일 생성
-        writer = pd.ExcelWriter(output_path, engine='xlsxwriter')
-        df.to_excel(writer, sheet_name='Test Cases', index=False)
-        
-        # 열 너비 조정
-        worksheet = writer.sheets['Test Cases']
-        for i, col in enumerate(df.columns):
-            max_len = max(df[col].astype(str).apply(len).max(), len(col)) + 2
-            worksheet.set_column(i, i, max_len)
-        
-        # 파일 저장
-        writer.close()
+        write_workbook(test_cases, output_path, HEADER_FORMAT)
         
         return output_path
     except Exception as e:
         print(f"Excel 파일 생성 중 오류 발생: {e}")
-        raise 
\ No newline at end of file
+        raise 
+
+def collect_columns(test_cases):
+    """모든 테스트 케이스의 키를 처음 등장한 순서대로 모아 열 목록을 만듭니다."""
+    columns = {}
+    for test_case in test_cases:
+        for key in test_case:
+            columns.setdefault(key, None)
+    return list(columns)
+
+def write_workbook(test_cases, output_path, header_format):
+    """
+    pandas 없이 xlsxwriter로 행을 바로 기록합니다.
+    
+    constant_memory 모드로 행을 순서대로 흘려 쓰므로 케이스 수와 관계없이 메모리
+    사용량이 일정하며, 열 너비는 기록하면서 함께 계산하여 추가 순회가 없습니다.
+    """
+    columns = collect_columns(test_cases)
+    workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet(SHEET_NAME)
+        
+        # 헤더 적용
+        header = workbook.add_format(header_format)
+        widths = [len(col) for col in columns]
+        for col_num, value in enumerate(columns):
+            worksheet.write(0, col_num, value, header)
+        
+        # 데이터 행 기록 (열 너비는 값의 문자열 길이 최댓값으로 갱신)
+        for row_num, test_case in enumerate(test_cases, start=1):
+            for col_num, col in enumerate(columns):
+                value = test_case.get(col)
+                if value is None:
+                    continue
+                if not isinstance(value, (str, int, float, bool)):
+                    value = str(value)
+                worksheet.write(row_num, col_num, value)
+                length = len(str(value))
+                if length > widths[col_num]:
+                    widths[col_num] = length
+        
+        # 열 너비 조정
+        for col_num, width in enumerate(widths):
+            worksheet.set_column(col_num, col_num, width + 2)
+    finally:
+        workbook.close()
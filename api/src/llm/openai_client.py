@@ -1,77 +1,125 @@
 import os
-import json
-import openai
-from dotenv import load_dotenv
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from src.utils.config import Config  # Config 클래스 임포트
+from src.llm import chunker, client, prompt_builder, schema
 import random
 
-# .env 파일에서 환경 변수 로드 및 API 키 설정
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# .env 파일과 API 키는 index.py에서 로드하고, openai 패키지는 공용 클라이언트(src.llm.client)가
+# 첫 요청 때 임포트함 (콜드 스타트 시간 단축)
+
+# TID 끝의 번호를 분리하기 위한 패턴 (예: ITEM_001 → "ITEM", "_", "001")
+TID_PATTERN = re.compile(r"^(.*?)([_\-]?)(\d+)$")
 
 def generate_test_cases(document_text, examples):
     """
     문서 텍스트에서 테스트 케이스를 생성합니다.
-    
+
+    문서를 헤딩/페이지 단위 청크로 나누어 동시에 요청하므로, 긴 문서도 잘리지 않고
+    전체 소요 시간은 가장 느린 청크 하나에 맞춰집니다.
+
     Args:
         document_text (str): 분석할 문서 텍스트
         examples (list): 예시 테스트 케이스
-        
+
     Returns:
         list: 생성된 테스트 케이스 목록
     """
     # API 키 확인
-    api_key = os.getenv("OPENAI_API_KEY") 
+    api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("경고: 유효한 OpenAI API 키가 설정되지 않았습니다.")
         return generate_test_data()
-    
+
     try:
-        # OpenAI 클라이언트 초기화
-        client = openai.OpenAI(api_key=api_key)
-        
-        # 시스템 프롬프트 생성
-        system_prompt = "테스트 케이스 생성 전문가로서, 문서 텍스트에서 테스트 케이스를 추출하세요."
-        
-        # 예시 데이터를 JSON 문자열로 변환
-        examples_json = json.dumps(examples, ensure_ascii=False, indent=2)
-        
-        # 타임아웃 설정 추가 (Vercel 10초 제한 고려)
-        response = client.chat.completions.create(
-            model=os.getenv("OPENAI_MODEL", "o3-mini"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"다음 형식의 테스트 케이스 예시를 참고하세요:\n\n{examples_json}\n\n이 형식에 맞게 다음 문서에서 테스트 케이스를 생성해주세요:\n\n{document_text[:4000]}"}
-            ],
-            response_format={"type": "json_object"},
-            timeout=9  # 9초 타임아웃 설정
-        )
-        
-        # 응답에서 테스트 케이스 추출
-        try:
-            response_content = response.choices[0].message.content
-            result = json.loads(response_content)
-            
-            # 응답 구조 확인하고 테스트 케이스 배열 추출
-            if "test_cases" in result:
-                return result["test_cases"]
-            else:
-                # 응답에 test_cases 키가 없는 경우 응답 전체를 확인
-                for key, value in result.items():
-                    if isinstance(value, list) and len(value) > 0:
-                        return value
-                
-                # 적절한 배열을 찾지 못한 경우 테스트 데이터 반환
-                return generate_test_data()
-            
-        except Exception as e:
-            print(f"응답 데이터 처리 오류: {e}")
+        # 공용 클라이언트의 재시도가 서버리스 제한 시간을 넘지 않도록 마감 시각 설정
+        deadline = time.monotonic() + Config.REQUEST_DEADLINE_SECONDS
+
+        chunks = chunker.chunk_text(document_text, Config.LLM_CHUNK_CHARS)
+        if not chunks:
+            return generate_test_data()
+
+        def run(index):
+            try:
+                return _generate_chunk(chunks[index], examples, deadline)
+            except Exception as e:
+                print(f"청크 {index + 1}/{len(chunks)} 생성 실패: {e}")
+                return None
+
+        # 청크별 요청을 제한된 동시성으로 병렬 실행
+        workers = max(1, min(Config.LLM_MAX_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            chunk_results = list(executor.map(run, range(len(chunks))))
+
+        if all(result is None for result in chunk_results):
             return generate_test_data()
-        
+        if len(chunk_results) == 1:
+            return chunk_results[0]
+        return merge_test_cases(chunk_results)
+
     except Exception as e:
         print(f"OpenAI API 호출 중 오류 발생: {e}")
         return generate_test_data()
 
+def _generate_chunk(document_text, examples, deadline=None):
+    """단일 청크에 대해 테스트 케이스를 생성합니다. 적절한 배열이 없으면 ValueError를 발생시킵니다."""
+    # 시스템 프롬프트 생성
+    system_prompt = "테스트 케이스 생성 전문가로서, 문서 텍스트에서 테스트 케이스를 추출하세요."
+
+    # 청크와 관련 있는 예시만 골라 열 기반 JSON으로 압축하고, 문서는 토큰 예산에 맞춤
+    selected = prompt_builder.select_examples(
+        document_text, examples, Config.PROMPT_MAX_EXAMPLES, Config.PROMPT_EXAMPLE_TOKENS
+    )
+    examples_json = prompt_builder.compact_examples(selected)
+    prompt = f"다음 형식의 테스트 케이스 예시를 참고하세요 (columns는 필드 이름, rows는 예시별 값):\n\n{examples_json}\n\n이 필드를 가진 객체로 다음 문서에서 테스트 케이스를 생성해주세요:\n\n"
+    budget = prompt_builder.document_budget(system_prompt, prompt)
+    document_text, truncated = prompt_builder.fit_to_tokens(document_text, budget)
+    if truncated:
+        print(f"경고: 문서 조각이 문맥 길이를 넘어 앞부분 {budget}토큰만 포함합니다.")
+
+    # 타임아웃 설정 추가 (Vercel 10초 제한 고려)
+    # 공용 클라이언트가 연결을 재사용하고, 마감 전까지만 429/5xx를 재시도함
+    response = client.create_chat_completion(
+        deadline=deadline,
+        model=Config.OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt + document_text}
+        ],
+        response_format=schema.RESPONSE_FORMAT,  # 테스트 케이스 JSON 스키마(strict)로 응답 형식 강제
+        timeout=9  # 9초 타임아웃 설정
+    )
+
+    # 응답을 스키마 레코드로 검증 (길이 제한으로 잘린 응답은 완성된 케이스만 건져내며,
+    # 마감 시간 때문에 이어쓰기는 요청하지 않음)
+    message = response.choices[0].message
+    if getattr(message, "refusal", None):
+        raise ValueError(f"모델이 응답을 거부했습니다: {message.refusal}")
+    test_cases, _ = schema.parse_response(message.content or "")
+    if not test_cases:
+        raise ValueError("응답에서 테스트 케이스를 찾을 수 없습니다")
+    return test_cases
+
+def merge_test_cases(chunk_results):
+    """청크별 결과를 합치고 TID 접두어별로 번호를 다시 매깁니다."""
+    merged = []
+    counters = {}
+    for cases in chunk_results:
+        for case in cases or []:
+            if not isinstance(case, dict):
+                continue
+            match = TID_PATTERN.match(str(case.get("TID", "")).strip())
+            if match and match.group(1):
+                prefix, separator, width = match.group(1), match.group(2), max(3, len(match.group(3)))
+            else:
+                prefix, separator, width = "TC", "", 3
+            key = (prefix, separator)
+            counters[key] = counters.get(key, 0) + 1
+            case["TID"] = f"{prefix}{separator}{counters[key]:0{width}d}"
+            merged.append(case)
+    return merged
+
 def generate_test_data():
     """샘플 테스트 케이스 데이터를 생성합니다."""
     # 기본 테스트 데이터 (API 호출 실패 시 사용)
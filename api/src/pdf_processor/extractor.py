@@ -1,18 +1,17 @@
+import io
 import PyPDF2
-import os
 
 def extract_text_from_pdf(pdf_path):
-    """PDF 파일에서 텍스트를 추출합니다."""
-    text = ""
+    """PDF 파일에서 텍스트를 추출합니다. 파일 경로 또는 메모리 내용(bytes, mmap)을 받습니다."""
     try:
-        with open(pdf_path, 'rb') as file:
+        if isinstance(pdf_path, str):
+            file = open(pdf_path, 'rb')
+        else:
+            file = io.BytesIO(pdf_path)
+        with file:
             pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-        return text
+            texts = [page.extract_text() for page in pdf_reader.pages]
+        return "".join(extracted + "\n" for extracted in texts if extracted)
     except Exception as e:
         print(f"PyPDF2 텍스트 추출 중 오류 발생: {e}")
-        return "PDF에서 텍스트를 추출할 수 없습니다. 텍스트 기반 PDF인지 확인하세요." 
\ No newline at end of file
+        return "PDF에서 텍스트를 추출할 수 없습니다. 텍스트 기반 PDF인지 확인하세요."
@@ -1,15 +1,45 @@
 import os
-from dotenv import load_dotenv
 
-# .env 파일 로드
-load_dotenv()
+# .env 파일 로드 (배포 환경에는 .env가 없으므로 파일이 있을 때만 python-dotenv를 임포트)
+if os.path.exists('.env'):
+    from dotenv import load_dotenv
+    load_dotenv('.env')
 
 class Config:
     """애플리케이션 설정을 관리하는 클래스"""
     
     # API 설정
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")  # 기본값 설정
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "o3-mini")  # 추론 모델 (reasoning_effort 지원)
+    
+    # OpenAI 클라이언트 연결/재시도/요청 한도 설정 (Vercel 10초 제한 안에서 재시도)
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "9"))  # 요청 타임아웃 (초)
+    OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "3"))  # 연결 타임아웃 (초)
+    OPENAI_POOL_SIZE = int(os.getenv("OPENAI_POOL_SIZE", "10"))  # keep-alive 연결 풀 크기
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))  # 429/5xx 재시도 횟수
+    OPENAI_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "0.5"))  # 백오프 기본 대기 (초)
+    OPENAI_BACKOFF_MAX = float(os.getenv("OPENAI_BACKOFF_MAX", "3"))  # 백오프 최대 대기 (초)
+    OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))  # 분당 요청 수 한도 (0이면 제한 없음)
+    OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))  # 분당 토큰 수 한도 (0이면 제한 없음)
+    REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "9"))  # 재시도를 포함한 전체 생성 마감
+    
+    # 긴 기획서 분할 생성 설정 (서버리스 10초 제한을 고려해 청크를 작게 유지)
+    LLM_CHUNK_CHARS = int(os.getenv("LLM_CHUNK_CHARS", "4000"))  # 청크 하나의 최대 글자 수
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # 동시 LLM 요청 수 상한
+    
+    # 프롬프트 토큰 예산 설정
+    LLM_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", "128000"))  # 모델 문맥 길이 (토큰)
+    LLM_COMPLETION_TOKENS = int(os.getenv("LLM_COMPLETION_TOKENS", "8000"))  # 응답용으로 예약하는 토큰 수
+    PROMPT_MAX_EXAMPLES = int(os.getenv("PROMPT_MAX_EXAMPLES", "2"))  # 청크마다 넣을 최대 예시 수
+    PROMPT_EXAMPLE_TOKENS = int(os.getenv("PROMPT_EXAMPLE_TOKENS", "800"))  # 예시에 쓸 최대 토큰 수
+    
+    # 업로드 수신 및 파일 보존 설정
+    UPLOAD_SPOOL_MB = int(os.getenv("UPLOAD_SPOOL_MB", "16"))  # 이 크기까지는 업로드를 메모리에만 유지
+    FILE_RETENTION_HOURS = float(os.getenv("FILE_RETENTION_HOURS", "1"))  # /tmp 출력 파일 보존 기간
+    
+    # 콜드 스타트 설정 (true면 함수 초기화 단계에서 OpenAI 클라이언트 등 무거운 모듈을 미리 로드,
+    # 초기화 후 스냅샷을 뜨거나 초기화 시간이 요청 시간에 포함되지 않는 플랫폼에서 사용)
+    WARM_ON_START = os.getenv("WARM_ON_START", "false").lower() == "true"
     
     # 파일 경로 설정
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,24 @@
+import os
+import time
+
+
+def purge_old_files(folder, max_age_seconds):
+    """
+    폴더에서 수정된 지 max_age_seconds가 지난 파일을 삭제합니다.
+
+    Returns:
+        int: 삭제한 파일 수
+    """
+    if not os.path.isdir(folder):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for entry in os.scandir(folder):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError as e:
+            print(f"보존 기간 지난 파일 삭제 실패 ({entry.path}): {e}")
+    return removed
+
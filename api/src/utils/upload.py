@@ -0,0 +1,79 @@
+import io
+import os
+import mmap
+import hashlib
+import tempfile
+
+
+def spool_file(total_content_length, spool_bytes):
+    """
+    werkzeug가 multipart 파일 파트를 받아 둘 버퍼를 만듭니다.
+
+    요청 전체 크기(Content-Length)가 spool_bytes 이하이면 메모리(BytesIO)에, 더 크거나
+    크기를 모르면(chunked 전송) 이름 없는 임시 파일에 받습니다. 요청 크기 한도는
+    MAX_CONTENT_LENGTH로 werkzeug가 본문을 읽기 전에(또는 읽는 도중 초과하는 즉시) 검사합니다.
+    """
+    if total_content_length is not None and total_content_length <= spool_bytes:
+        return io.BytesIO()
+    return tempfile.TemporaryFile()
+
+
+class ReceivedUpload:
+    """
+    werkzeug가 받아 둔 업로드 파일
+
+    받아 둔 버퍼를 복사하지 않고 SHA-256 해시와 크기를 계산하며, 내용은 메모리 버퍼의
+    bytes(작은 파일) 또는 임시 파일의 읽기 전용 mmap(큰 파일)으로 제공합니다.
+    닫으면 임시 파일도 삭제됩니다.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._mmap = None
+        digest = hashlib.sha256()
+        if isinstance(buffer, io.BytesIO):
+            # getvalue()는 내부 bytes를 그대로 반환하므로 복사가 없음
+            data = buffer.getvalue()
+        else:
+            buffer.flush()
+            data = self._map()
+        digest.update(data)
+        self.size = len(data)
+        self.sha256 = digest.hexdigest()
+
+    def _map(self):
+        if self._mmap is None and os.fstat(self._buffer.fileno()).st_size > 0:
+            self._mmap = mmap.mmap(self._buffer.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap if self._mmap is not None else b''
+
+    @property
+    def data(self):
+        """파일 내용 (bytes 또는 읽기 전용 mmap)"""
+        if isinstance(self._buffer, io.BytesIO):
+            return self._buffer.getvalue()
+        return self._map()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def receive_upload(stream):
+    """
+    werkzeug가 spool_file()로 받아 둔 파일 파트(FileStorage.stream)를 감쌉니다.
+
+    Args:
+        stream: spool_file()이 반환한 버퍼
+
+    Returns:
+        ReceivedUpload: 해시와 크기를 계산한 업로드
+    """
+    return ReceivedUpload(stream)
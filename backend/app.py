@@ -1,5 +1,8 @@
 import sys
 import os
+import json
+import logging
+import time
 from dotenv import load_dotenv
 import openai
 
@@ -12,168 +15,524 @@ dotenv_paths = [
     os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')  # 루트 .env
 ]
 
+loaded_dotenv_path = None
 for dotenv_path in dotenv_paths:
     if os.path.exists(dotenv_path):
-        print(f"환경 설정 파일을 로드합니다: {dotenv_path}")
         load_dotenv(dotenv_path)
+        loaded_dotenv_path = dotenv_path
         break
 
 # Config 클래스를 먼저 임포트 (중요!)
 from src.utils.config import Config
 
-# 앱 초기화 시 설정 확인 (Config 클래스 초기화)
-Config.init_app()
+logger = logging.getLogger(__name__)
 
-# OpenAI API 키 설정
-api_key = os.getenv("OPENAI_API_KEY") or Config.OPENAI_API_KEY
-if api_key:
-    print(f"API 키 설정 완료: {api_key[:10]}...")
-    openai.api_key = api_key
-    try:
-        openai_client = openai.OpenAI(api_key=api_key)
-        print("OpenAI 클라이언트 초기화 성공")
-    except Exception as e:
-        print(f"OpenAI 클라이언트 초기화 실패: {e}")
-else:
-    print("경고: API 키를 찾을 수 없습니다!")
-
-from flask import Flask, request, jsonify, send_file
+from flask import Blueprint, Flask, Request, Response, current_app, g, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
-from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
+
+class SpooledUploadRequest(Request):
+    """multipart 파일 파트를 요청 크기가 UPLOAD_SPOOL_MB 이하이면 메모리에, 그보다 크면 임시 파일에 받는 요청 클래스"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        from src.utils.upload import spool_file
+        return spool_file(total_content_length, Config.UPLOAD_SPOOL_MB * 1024 * 1024)
 
-app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": "*"}})  # CORS 설정 강화
+# 라우트는 블루프린트에 등록하고 앱은 create_app()에서 만듦
+bp = Blueprint('api', __name__)
+
+def purge_document_texts():
+    """생성 실행 없이 보존 기간이 지난 업로드 문서의 텍스트를 삭제합니다."""
+    import src.llm.case_store as case_store
+    return case_store.get_store().purge_unused_texts(Config.DOCUMENT_TEXT_RETENTION_HOURS * 3600)
+
+def create_app():
+    """
+    Flask 앱을 만들고 설정 확인, 업로드 폴더 생성, 보존 기간 정리 스레드 시작을 함께 합니다.
+    
+    모듈을 임포트하는 것만으로는 앱, 폴더, 스레드를 만들지 않으므로 PDF 추출 프로세스 풀의
+    spawn 작업자가 __main__(python app.py)을 다시 임포트해도 웹 앱은 초기화되지 않습니다.
+    gunicorn은 작업자마다 app:create_app()으로 한 번 호출합니다.
+    """
+    # 시작 시 출력은 LOG_LEVEL에 따르는 로깅으로 남김
+    from src.utils.logging_config import configure_logging
+    configure_logging()
+    if loaded_dotenv_path:
+        logger.info("환경 설정 파일을 로드했습니다: %s", loaded_dotenv_path)
+    
+    # 앱 초기화 시 설정 확인 (Config 클래스 초기화)
+    Config.init_app()
+    
+    # OpenAI API 키 설정
+    api_key = os.getenv("OPENAI_API_KEY") or Config.OPENAI_API_KEY
+    if api_key:
+        logger.info("API 키 설정 완료")
+        openai.api_key = api_key  # 공용 클라이언트(src.llm.client)가 첫 요청 시 사용
+    else:
+        logger.warning("API 키를 찾을 수 없습니다!")
+    
+    app = Flask(__name__)
+    app.request_class = SpooledUploadRequest
+    app.json.sort_keys = False  # 큰 응답의 JSON 직렬화 비용 절감
+    CORS(app, resources={r"/api/*": {"origins": "*"}})  # CORS 설정 강화
+    app.register_blueprint(bp)
+    
+    # 환경 변수에서 설정 로드 (Config 클래스 사용)
+    upload_folder = Config.UPLOAD_FOLDER if hasattr(Config, 'UPLOAD_FOLDER') else 'uploads'
+    max_content_length = Config.MAX_CONTENT_LENGTH if hasattr(Config, 'MAX_CONTENT_LENGTH') else 16 * 1024 * 1024
+    
+    # 상대 경로 대신 절대 경로 사용
+    app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), upload_folder)
+    app.config['MAX_CONTENT_LENGTH'] = int(max_content_length)
+    
+    logger.info(
+        "파일 업로드 설정: 업로드 폴더 %s, 최대 파일 크기 %.1fMB",
+        app.config['UPLOAD_FOLDER'], app.config['MAX_CONTENT_LENGTH'] / 1024 / 1024
+    )
+    
+    # 업로드 폴더가 없으면 생성
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    
+    # 업로드/출력 파일과 생성하지 않은 업로드 문서의 텍스트가 무한히 쌓이지 않도록
+    # 보존 기간이 지난 항목을 주기적으로 삭제
+    from src.utils.retention import start_retention_sweeper
+    start_retention_sweeper(
+        [app.config['UPLOAD_FOLDER'], Config.OUTPUT_FOLDER],
+        Config.FILE_RETENTION_HOURS * 3600,
+        Config.RETENTION_SWEEP_MINUTES * 60,
+        purgers=[("document_texts", purge_document_texts)]
+    )
+    
+    # API 키가 없으면 경고만 표시
+    if not Config.OPENAI_API_KEY or Config.OPENAI_API_KEY in ["your_api_key_here", "sk-actual_api_key_goes_here", "sk-your_actual_api_key_here"]:
+        logger.warning("유효한 OpenAI API 키가 설정되지 않았습니다. 테스트 데이터만 생성됩니다. .env 파일을 확인하고 실제 API 키를 설정하세요.")
+    
+    return app
 
-# 환경 변수에서 설정 로드 (Config 클래스 사용)
-upload_folder = Config.UPLOAD_FOLDER if hasattr(Config, 'UPLOAD_FOLDER') else 'uploads'
-max_content_length = Config.MAX_CONTENT_LENGTH if hasattr(Config, 'MAX_CONTENT_LENGTH') else 16 * 1024 * 1024
+from src.utils import metrics
 
-# 상대 경로 대신 절대 경로 사용
-app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), upload_folder)
-app.config['MAX_CONTENT_LENGTH'] = int(max_content_length)
+@bp.before_app_request
+def start_request_metrics():
+    # 지표 라벨은 블루프린트 이름(api.)을 뺀 뷰 함수 이름
+    g.metrics_endpoint = (request.endpoint or 'unmatched').rpartition('.')[2]
+    g.metrics_started = time.perf_counter()
+    g.metrics_status = 500
+    metrics.HTTP_REQUESTS_IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
 
-print(f"파일 업로드 설정:")
-print(f"- 업로드 폴더: {app.config['UPLOAD_FOLDER']}")
-print(f"- 최대 파일 크기: {app.config['MAX_CONTENT_LENGTH']/1024/1024:.1f}MB")
+@bp.after_app_request
+def record_response_status(response):
+    g.metrics_status = response.status_code
+    return response
 
-# 업로드 폴더가 없으면 생성
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+@bp.after_app_request
+def compress(response):
+    """GET 응답에 ETag(304 처리)를 붙이고 JSON/텍스트 응답을 br 또는 gzip으로 압축합니다."""
+    from src.utils.compression import compress_response
+    return compress_response(response, request)
 
-# API 키 상태 확인
-print(f"현재 OPENAI_API_KEY 환경 변수: {'설정됨' if os.environ.get('OPENAI_API_KEY') else '설정되지 않음'}")
+@bp.teardown_app_request
+def finish_request_metrics(exc):
+    # 스트리밍 응답은 전송이 끝난 뒤에 호출되므로 전송 시간까지 포함됨
+    if 'metrics_started' not in g:
+        return
+    metrics.HTTP_REQUESTS_IN_FLIGHT.dec(endpoint=g.metrics_endpoint)
+    metrics.HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - g.metrics_started,
+        endpoint=g.metrics_endpoint,
+        status=g.metrics_status
+    )
 
-# API 키가 없으면 경고만 표시
-if not Config.OPENAI_API_KEY or Config.OPENAI_API_KEY in ["your_api_key_here", "sk-actual_api_key_goes_here", "sk-your_actual_api_key_here"]:
-    print("=== 경고: 유효한 OpenAI API 키가 설정되지 않았습니다. 테스트 데이터만 생성됩니다. ===")
-    print("=== .env 파일을 확인하고 실제 API 키를 설정하세요. ===")
+@bp.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus 형식 지표 (단계별 소요 시간, 토큰 사용량, 진행 중 요청 수, 캐시 적중률 등)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
 
-@app.route('/api/upload', methods=['POST'])
+@bp.route('/api/upload', methods=['POST'])
 def upload_file():
     try:
-        print("=== 파일 업로드 요청 시작 ===")
+        logger.debug("파일 업로드 요청 시작")
         
         if 'file' not in request.files:
-            print("오류: 요청에 'file' 필드가 없습니다")
+            logger.info("업로드 거부: 요청에 'file' 필드가 없습니다")
             return jsonify({'error': '파일이 없습니다'}), 400
         
         file = request.files['file']
-        print(f"업로드된 파일: {file.filename}, 타입: {file.content_type}")
+        logger.debug("업로드된 파일: %s, 타입: %s", file.filename, file.content_type)
         
         if file.filename == '':
-            print("오류: 선택된 파일 없음")
+            logger.info("업로드 거부: 선택된 파일 없음")
             return jsonify({'error': '선택된 파일이 없습니다'}), 400
         
         if not file.filename.lower().endswith('.pdf'):
-            print(f"오류: PDF 파일이 아님 ({file.filename})")
+            logger.info("업로드 거부: PDF 파일이 아님 (%s)", file.filename)
             return jsonify({'error': 'PDF 파일만 업로드 가능합니다'}), 400
         
+        # 요청 크기 한도(MAX_CONTENT_LENGTH)는 werkzeug가 본문을 받기 전에 검사하며(초과 시 413),
+        # 받아 둔 버퍼를 복사하지 않고 그대로 해시 계산과 추출에 사용
+        from src.utils.upload import receive_upload
         try:
-            # 파일 저장 시도
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
-            print(f"파일 성공적으로 저장됨: {file_path}")
-            
-            # 파일 크기 확인
-            file_size = os.path.getsize(file_path)
-            print(f"파일 크기: {file_size/1024/1024:.2f}MB")
-            
-            if file_size > app.config['MAX_CONTENT_LENGTH']:
-                os.remove(file_path)  # 초과 크기 파일 삭제
-                print(f"파일 크기 초과: {file_size/1024/1024:.2f}MB > {app.config['MAX_CONTENT_LENGTH']/1024/1024:.2f}MB")
-                return jsonify({'error': f'파일 크기가 {app.config["MAX_CONTENT_LENGTH"]/1024/1024:.1f}MB를 초과합니다'}), 413
-            
+            upload = receive_upload(file.stream)
+            logger.info("파일 수신 완료: %.2fMB (SHA-256 %s)", upload.size / 1024 / 1024, upload.sha256[:12])
+            metrics.UPLOAD_SIZE_BYTES.observe(upload.size)
         except Exception as e:
-            print(f"파일 저장 오류: {e}")
+            logger.exception("파일 수신 오류")
             return jsonify({'error': f'파일 저장 중 오류 발생: {str(e)}'}), 500
         
-        # PDF에서 텍스트 추출 시도
+        # PDF에서 텍스트 추출 시도 (메모리 버퍼 또는 스풀 파일의 mmap을 그대로 전달)
         try:
             import src.pdf_processor.extractor as extractor
-            print("PDF 텍스트 추출 시작...")
-            extracted_text = extractor.extract_text_from_pdf(file_path)
+            logger.debug("PDF 텍스트 추출 시작")
+            extracted_text, engine = extractor.extract_text_with_engine(upload.data, sha256=upload.sha256)
             
             # 추출된 텍스트 확인
             if extracted_text:
-                preview = extracted_text[:200] + "..." if len(extracted_text) > 200 else extracted_text
-                print(f"텍스트 추출 성공 (일부): {preview}")
+                logger.info("텍스트 추출 성공: %d자 (%s)", len(extracted_text), engine)
+                logger.debug("추출 텍스트 (일부): %s", extracted_text[:200])
             else:
-                print("추출된 텍스트 없음")
+                logger.info("추출된 텍스트 없음 (%s)", engine)
                 return jsonify({'error': 'PDF에서 텍스트를 추출할 수 없습니다. 텍스트 기반 PDF인지 확인하세요.'}), 400
             
         except Exception as e:
-            print(f"텍스트 추출 오류: {e}")
+            logger.exception("텍스트 추출 오류")
             return jsonify({'error': f'PDF 텍스트 추출 중 오류 발생: {str(e)}'}), 500
+        finally:
+            upload.close()
         
-        print("=== 파일 업로드 요청 성공 ===")
-        return jsonify({
-            'success': True, 
-            'text': extracted_text, 
-            'file_path': file_path
-        })
+        # 추출 텍스트는 서버에 보관하고 문서 핸들(파일 해시)과 미리보기만 응답
+        import src.llm.case_store as case_store
+        case_store.get_store().save_document(upload.sha256, extracted_text, name=file.filename)
+        
+        logger.debug("파일 업로드 요청 성공")
+        result = {
+            'success': True,
+            'document': upload.sha256,
+            'file_hash': upload.sha256,
+            'extractor': engine,
+            'length': len(extracted_text),
+            'preview': extracted_text[:Config.UPLOAD_PREVIEW_CHARS]
+        }
+        if request.args.get('include_text') == 'true':
+            result['text'] = extracted_text
+        return jsonify(result)
+    except RequestEntityTooLarge:
+        raise  # 413 핸들러에서 처리
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"전체 처리 중 예외 발생: {error_details}")
+        logger.exception("업로드 처리 중 예외 발생")
         return jsonify({'error': f'PDF 처리 중 오류 발생: {str(e)}'}), 500
 
-@app.route('/api/generate', methods=['POST'])
-def generate():
-    data = request.json
-    file_path = data.get('file_path')
-    extracted_text = data.get('text')
+def record_run(test_cases, extracted_text, excel_path, file_hash=None, document_id=None, models=None):
+    """
+    생성 결과를 테스트 케이스 보관소에 저장하고 실행 ID를 반환합니다.
+    
+    문서는 업로드 응답의 file_hash(없으면 추출 텍스트의 SHA-256)로 구분합니다.
+    생성이 모두 실패하여 예시 데이터가 반환된 경우와 저장 실패 시에는 None을 반환하며,
+    저장 실패가 생성 응답을 막지 않도록 합니다. test_cases는 TestCaseBatch이고, models는
+    생성에 사용한 모델 이름 집합입니다 (라우팅으로 여러 개면 쉼표로 이어 기록).
+    """
+    import hashlib
+    import src.llm.openai_client as openai_client
+    import src.llm.case_store as case_store
+    
+    fallback = openai_client.generate_test_data()
+    if not len(test_cases) or (len(test_cases) == len(fallback) and test_cases.to_records() == fallback):
+        return None
+    try:
+        document_hash = file_hash or hashlib.sha256(extracted_text.encode('utf-8')).hexdigest()
+        return case_store.get_store().record_run(
+            test_cases, document_hash, name=document_id, model=", ".join(sorted(models or ())) or None,
+            excel_path=excel_path
+        )
+    except Exception as e:
+        logger.exception("테스트 케이스 보관소 저장 실패")
+        return None
+
+def run_generation(extracted_text, use_cache=True, refresh=False, document_id=None, file_hash=None,
+                   per_page=None):
+    """
+    테스트 케이스를 생성하고 Excel 파일을 만든 뒤 응답 데이터를 반환합니다.
+    
+    동기 요청(/api/generate)과 백그라운드 작업(/api/jobs)이 함께 사용합니다.
+    결과가 보관소에 저장되면 케이스는 첫 페이지(per_page개)만 포함하고, 나머지는
+    cases_url(/api/cases?run=<run_id>)로 페이지 단위로 조회합니다.
+    """
+    # 예시 테스트 케이스 로드
+    import src.llm.example_loader as example_loader
+    examples = example_loader.load_example_library()
+    
+    # OpenAI API를 사용하여 테스트 케이스 생성 (Excel, 응답, 보관소가 함께 쓰는 열 기반 배치로 변환)
+    import src.llm.openai_client as openai_client
+    from src.llm.test_case import TestCaseBatch
+    models = set()
+    test_cases = TestCaseBatch.from_records(openai_client.generate_test_cases(
+        extracted_text,
+        examples,
+        use_cache=use_cache,
+        refresh=refresh,
+        document_id=document_id,
+        models=models
+    ))
+    
+    # Excel 파일 생성
+    import src.excel.generator as generator
+    excel_path = generator.generate_excel(test_cases)
+    run_id = record_run(test_cases, extracted_text, excel_path, file_hash, document_id, models)
+    
+    # 테스트 케이스 데이터와 Excel 경로 모두 반환 (보관소 저장에 실패하면 전체 케이스를 포함)
+    per_page = per_page or Config.RESPONSE_PAGE_SIZE
+    result = {
+        'success': True, 
+        'excel_path': excel_path,
+        'run_id': run_id,
+        'total': len(test_cases),
+        'test_cases': test_cases.to_records() if run_id is None else test_cases.to_records(0, per_page)
+    }
+    if run_id is not None:
+        result['per_page'] = per_page
+        result['cases_url'] = f'/api/cases?run={run_id}&per_page={per_page}'
+    return result
+
+def resolve_document(data):
+    """
+    생성 요청에서 문서 텍스트와 파일 해시를 구합니다.
+    
+    document(업로드 응답의 문서 핸들)가 있으면 보관된 텍스트를, 없으면 text를 사용합니다.
     
+    Returns:
+        tuple: (텍스트, 파일 해시, 오류 응답) - 오류가 없으면 오류 응답은 None
+    """
+    handle = data.get('document')
+    if handle:
+        import src.llm.case_store as case_store
+        extracted_text = case_store.get_store().document_text(handle)
+        if extracted_text is None:
+            return None, None, (jsonify({'error': '문서를 찾을 수 없습니다. PDF를 다시 업로드하세요.'}), 404)
+        return extracted_text, handle, None
+    
+    extracted_text = data.get('text')
     if not extracted_text:
-        return jsonify({'error': '추출된 텍스트가 없습니다'}), 400
+        return None, None, (jsonify({'error': '추출된 텍스트가 없습니다'}), 400)
+    return extracted_text, data.get('file_hash'), None
+
+@bp.route('/api/generate', methods=['POST'])
+def generate():
+    data = request.json or {}
+    extracted_text, file_hash, error = resolve_document(data)
+    if error:
+        return error
     
     try:
-        # 예시 테스트 케이스 로드
+        # - cache: false 이면 생성 캐시를 사용하지 않음
+        # - refresh: true 이면 기존 캐시 항목을 무효화하고 다시 생성
+        # - document_id: 같은 문서의 개정판이면 변경된 섹션만 다시 생성
+        # - per_page: 응답에 포함할 케이스 수 (나머지는 cases_url로 조회)
+        return jsonify(run_generation(
+            extracted_text,
+            use_cache=data.get('cache', True),
+            refresh=data.get('refresh', False),
+            document_id=data.get('document_id'),
+            file_hash=file_hash,
+            per_page=data.get('per_page')
+        ))
+    except Exception as e:
+        logger.exception("테스트 케이스 생성 중 오류 발생")
+        return jsonify({'error': f'테스트 케이스 생성 중 오류 발생: {str(e)}'}), 500
+
+def _sse(event, payload):
+    """Server-Sent Events 형식의 메시지 하나를 만듭니다."""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+@bp.route('/api/generate/stream', methods=['POST'])
+def generate_stream():
+    """
+    테스트 케이스를 모델이 생성하는 즉시 Server-Sent Events로 전송합니다.
+    
+    이벤트 종류:
+    - test_case: 완성된 테스트 케이스 하나
+    - done: 모든 케이스 전송 완료 (Excel 경로, 보관소 실행 ID, 케이스 수 포함)
+    - error: 생성 중 오류
+    """
+    data = request.json or {}
+    extracted_text, file_hash, error = resolve_document(data)
+    if error:
+        return error
+    
+    use_cache = data.get('cache', True)
+    refresh = data.get('refresh', False)
+    document_id = data.get('document_id')
+    
+    def events():
         import src.llm.example_loader as example_loader
-        examples = example_loader.load_examples()
-        
-        # OpenAI API를 사용하여 테스트 케이스 생성
         import src.llm.openai_client as openai_client
-        test_cases = openai_client.generate_test_cases(extracted_text, examples)
-        
-        # Excel 파일 생성
         import src.excel.generator as generator
-        excel_path = generator.generate_excel(test_cases)
+        from src.llm.test_case import TestCaseBatch
         
-        # 테스트 케이스 데이터와 Excel 경로 모두 반환
-        return jsonify({
-            'success': True, 
-            'excel_path': excel_path,
-            'test_cases': test_cases  # 테스트 케이스 데이터 추가
-        })
-    except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"오류 발생: {error_details}")
-        return jsonify({'error': f'테스트 케이스 생성 중 오류 발생: {str(e)}'}), 500
+        test_cases = []
+        models = set()
+        try:
+            examples = example_loader.load_example_library()
+            for test_case in openai_client.stream_test_cases(
+                extracted_text, examples, use_cache, refresh, document_id, models
+            ):
+                test_cases.append(test_case)
+                yield _sse('test_case', test_case)
+            
+            test_cases = TestCaseBatch.from_records(test_cases)
+            excel_path = generator.generate_excel(test_cases)
+            run_id = record_run(test_cases, extracted_text, excel_path, file_hash, document_id, models)
+            yield _sse('done', {'success': True, 'excel_path': excel_path, 'run_id': run_id, 'count': len(test_cases)})
+        except Exception as e:
+            logger.exception("스트리밍 생성 오류")
+            yield _sse('error', {'error': f'테스트 케이스 생성 중 오류 발생: {str(e)}'})
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@bp.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """생성 작업을 백그라운드 대기열에 넣고 작업 ID를 바로 반환합니다."""
+    data = request.json or {}
+    extracted_text, file_hash, error = resolve_document(data)
+    if error:
+        return error
+    
+    from src.utils.jobs import get_job_queue, QueueFullError
+    try:
+        job_id = get_job_queue().submit(
+            run_generation,
+            extracted_text,
+            use_cache=data.get('cache', True),
+            refresh=data.get('refresh', False),
+            document_id=data.get('document_id'),
+            file_hash=file_hash,
+            per_page=data.get('per_page')
+        )
+    except QueueFullError:
+        response = jsonify({'error': '대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도하세요.'})
+        response.headers['Retry-After'] = '10'
+        return response, 503
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/api/jobs/{job_id}',
+        'result_url': f'/api/jobs/{job_id}/result'
+    }), 202
+
+@bp.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """작업 상태를 조회합니다 (결과 본문은 포함하지 않음)."""
+    from src.utils.jobs import get_job_queue
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    job.pop('result')
+    return jsonify(job)
+
+@bp.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """완료된 작업의 결과를 반환합니다. 아직 진행 중이면 202를 반환합니다."""
+    from src.utils.jobs import get_job_queue
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    if job['status'] == 'failed':
+        return jsonify({'error': f'테스트 케이스 생성 중 오류 발생: {job["error"]}'}), 500
+    if job['status'] != 'succeeded':
+        return jsonify({'job_id': job_id, 'status': job['status']}), 202
+    return jsonify(job['result'])
+
+@bp.route('/api/generate/cache', methods=['GET', 'DELETE'])
+def generation_cache_status():
+    """생성 캐시 적중/실패 통계를 조회하거나(GET) 전체 캐시를 비웁니다(DELETE)."""
+    import src.llm.generation_cache as generation_cache
+    cache = generation_cache.get_cache()
+    if request.method == 'DELETE':
+        removed = cache.invalidate()
+        return jsonify({'success': True, 'removed': removed})
+    return jsonify(cache.stats())
 
-@app.route('/api/download/<path:filename>', methods=['GET'])
+def _page_args():
+    """페이지 조회 공통 인자 (page는 1부터, per_page는 보관소 상한까지)"""
+    return {
+        'page': request.args.get('page', 1, type=int),
+        'per_page': request.args.get('per_page', 50, type=int)
+    }
+
+@bp.route('/api/documents', methods=['GET'])
+def list_documents():
+    """테스트 케이스를 생성한 적 있는 문서 목록을 최근 생성 순으로 조회합니다."""
+    import src.llm.case_store as case_store
+    return jsonify(case_store.get_store().list_documents(**_page_args()))
+
+@bp.route('/api/runs', methods=['GET'])
+def list_runs():
+    """생성 실행 목록을 최신순으로 조회합니다 (document로 문서 해시를 지정하면 해당 문서만)."""
+    import src.llm.case_store as case_store
+    return jsonify(case_store.get_store().list_runs(request.args.get('document'), **_page_args()))
+
+@bp.route('/api/runs/<int:run_id>', methods=['GET'])
+def get_run(run_id):
+    """생성 실행 정보를 조회합니다. 케이스는 /api/cases?run=<run_id>로 페이지 단위로 조회합니다."""
+    import src.llm.case_store as case_store
+    run = case_store.get_store().get_run(run_id)
+    if run is None:
+        return jsonify({'error': '실행 기록을 찾을 수 없습니다'}), 404
+    return jsonify(run)
+
+@bp.route('/api/runs/<int:run_id>/excel', methods=['GET'])
+def download_run_excel(run_id):
+    """보관된 실행의 테스트 케이스로 Excel을 다시 만들어 내려받습니다 (원래 파일이 정리된 뒤에도 가능)."""
+    import src.llm.case_store as case_store
+    import src.excel.generator as generator
+    store = case_store.get_store()
+    run = store.get_run(run_id)
+    if run is None:
+        return jsonify({'error': '실행 기록을 찾을 수 없습니다'}), 404
+    excel_path = run['excel_path']
+    if not excel_path or not os.path.isfile(excel_path):
+        excel_path = generator.generate_excel(store.run_cases(run_id))
+    return send_file(excel_path, as_attachment=True, download_name=f"test_cases_run{run_id}.xlsx")
+
+@bp.route('/api/cases', methods=['GET'])
+def search_cases():
+    """
+    보관된 테스트 케이스를 검색합니다.
+    
+    조건 (모두 선택, 함께 지정하면 AND):
+    - q: 테스트 단계/기대 결과 본문 검색어 (공백으로 나눈 단어를 모두 포함)
+    - tid, major(대분류), middle(중분류), minor(소분류): 정확히 일치
+    - document: 문서 해시, run: 실행 ID
+    - page, per_page: 페이지 (기본 1, 50)
+    """
+    import src.llm.case_store as case_store
+    args = request.args
+    return jsonify(case_store.get_store().search_cases(
+        query=args.get('q'),
+        tid=args.get('tid'),
+        major=args.get('major'),
+        middle=args.get('middle'),
+        minor=args.get('minor'),
+        document_hash=args.get('document'),
+        run_id=args.get('run', type=int),
+        **_page_args()
+    ))
+
+@bp.route('/api/download/<path:filename>', methods=['GET'])
 def download(filename):
+    if not os.path.isfile(filename):
+        # 보존 기간이 지나 삭제된 파일
+        return jsonify({'error': '파일을 찾을 수 없습니다. 테스트 케이스를 다시 생성하세요.'}), 404
     return send_file(filename, as_attachment=True)
 
+@bp.app_errorhandler(413)
+def request_too_large(e):
+    """Content-Length가 한도를 넘는 요청은 본문을 읽기 전에 거부합니다."""
+    return jsonify({'error': f'파일 크기가 {current_app.config["MAX_CONTENT_LENGTH"]/1024/1024:.1f}MB를 초과합니다'}), 413
+
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    # 개발용 서버 (운영에서는 gunicorn -c gunicorn.conf.py 사용, README 참고)
+    create_app().run(host='127.0.0.1', port=5000, debug=Config.FLASK_DEBUG, threaded=True) 
\ No newline at end of file
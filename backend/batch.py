@@ -0,0 +1,271 @@
+"""
+기획서 PDF 일괄 처리 (명령줄)
+
+디렉토리 또는 glob 패턴에 해당하는 PDF들을 한 번에 처리하여 테스트 케이스 Excel을 만듭니다.
+
+- 텍스트 추출은 프로세스 풀에서 파일 단위로 병렬 실행
+- 테스트 케이스 생성은 전체 동시 LLM 요청 수를 제한하여 여러 파일을 동시에 진행
+- 기획서마다 Excel 한 개(기본) 또는 기획서별 시트를 가진 통합 Excel 한 개(--combined)
+- 출력 폴더의 manifest.json에 완료한 파일을 기록하므로, 중단 후 다시 실행하면
+  내용이 바뀌지 않은 완료 파일은 건너뜀
+
+사용 예:
+    python batch.py specs/ -o batch_output
+    python batch.py "specs/**/*.pdf" -o batch_output --combined --llm-concurrency 16
+"""
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+import openai
+
+# 현재 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# 환경 변수 로드 - 여러 위치 시도
+dotenv_paths = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'),  # backend/.env
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')  # 루트 .env
+]
+
+for dotenv_path in dotenv_paths:
+    if os.path.exists(dotenv_path):
+        load_dotenv(dotenv_path)
+        break
+
+from src.utils.config import Config
+from src.utils.logging_config import configure_logging
+from src.pdf_processor.cache import file_sha256
+from src.llm.test_case import TestCaseBatch
+
+MANIFEST_NAME = 'manifest.json'
+CASES_FOLDER = 'cases'
+COMBINED_NAME = 'test_cases_combined.xlsx'
+
+
+def find_pdfs(source, recursive=False):
+    """디렉토리 또는 glob 패턴에서 PDF 파일 목록을 찾아 정렬하여 반환합니다."""
+    if os.path.isdir(source):
+        pattern = os.path.join(source, '**', '*.pdf') if recursive else os.path.join(source, '*.pdf')
+    else:
+        pattern = source
+    return sorted(
+        os.path.abspath(path)
+        for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path) and path.lower().endswith('.pdf')
+    )
+
+
+def document_name(path, root):
+    """출력 파일 이름과 문서 식별자로 쓸 상대 경로 기반 이름 (예: combat/skill.pdf → combat__skill)"""
+    relative = os.path.relpath(path, root) if root else os.path.basename(path)
+    return os.path.splitext(relative)[0].replace(os.sep, '__')
+
+
+class Manifest:
+    """
+    완료한 파일을 기록하는 JSON 매니페스트
+
+    파일마다 내용 해시, 케이스 수, 결과 경로를 저장하며, 기록할 때마다 임시 파일에 쓴 뒤
+    교체하므로 실행 중 중단되어도 매니페스트가 손상되지 않습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f).get('files', {})
+
+    def is_done(self, name, sha256):
+        entry = self.entries.get(name)
+        return bool(entry) and entry.get('status') == 'done' and entry.get('sha256') == sha256
+
+    def record(self, name, **entry):
+        entry['updated_at'] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.entries[name] = entry
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.entries}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _init_extract_worker():
+    # 파일 단위로 이미 병렬 처리하므로 작업자 안에서 페이지 단위 프로세스 풀을 다시 만들지 않음
+    Config.EXTRACT_PARALLEL_MIN_PAGES = sys.maxsize
+
+
+def _extract(path):
+    from src.pdf_processor.extractor import extract_text_with_engine
+    return extract_text_with_engine(path)
+
+
+def _generate(text, examples, document_id, refresh):
+    import src.llm.openai_client as openai_client
+    return openai_client.generate_test_cases(text, examples, refresh=refresh, document_id=document_id)
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def run_batch(files, root, output_dir, combined=False, extract_workers=None,
+              concurrent_files=4, llm_concurrency=8, refresh=False):
+    """
+    PDF 목록을 처리하여 테스트 케이스 Excel을 만듭니다.
+
+    추출이 끝난 파일부터 바로 생성을 시작하므로 추출과 LLM 호출이 겹쳐서 진행됩니다.
+    동시에 생성하는 파일 수 × 파일당 동시 요청 수가 llm_concurrency를 넘지 않습니다.
+
+    Returns:
+        dict: 처리 결과 요약 (done, skipped, failed 파일 수)
+    """
+    import src.llm.example_loader as example_loader
+    import src.llm.openai_client as openai_client
+    import src.excel.generator as generator
+
+    cases_dir = os.path.join(output_dir, CASES_FOLDER)
+    os.makedirs(cases_dir, exist_ok=True)
+    manifest = Manifest(os.path.join(output_dir, MANIFEST_NAME))
+
+    pending = []
+    skipped = 0
+    for path in files:
+        name = document_name(path, root)
+        sha256 = file_sha256(path)
+        if not refresh and manifest.is_done(name, sha256):
+            skipped += 1
+        else:
+            pending.append((path, name, sha256))
+    print(f"PDF {len(files)}개 중 {skipped}개는 이미 완료되어 건너뛰고 {len(pending)}개를 처리합니다.")
+
+    concurrent_files = max(1, concurrent_files)
+    Config.LLM_MAX_CONCURRENCY = max(1, llm_concurrency // concurrent_files)
+    examples = example_loader.load_example_library()
+    fallback = openai_client.generate_test_data()
+    done = failed = 0
+
+    with ProcessPoolExecutor(max_workers=extract_workers or Config.EXTRACT_WORKERS,
+                             initializer=_init_extract_worker) as extract_pool, \
+            ThreadPoolExecutor(max_workers=concurrent_files) as generate_pool:
+        extracting = {extract_pool.submit(_extract, path): (path, name, sha256) for path, name, sha256 in pending}
+        generating = {}
+
+        while extracting or generating:
+            finished, _ = wait(list(extracting) + list(generating), return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future in extracting:
+                    path, name, sha256 = extracting.pop(future)
+                    try:
+                        text, engine = future.result()
+                    except Exception as e:
+                        text, engine = str(e), None
+                    if not engine:
+                        failed += 1
+                        print(f"[실패] {name}: 텍스트 추출 실패 ({text[:80]})")
+                        manifest.record(name, status='failed', sha256=sha256, error='extraction')
+                        continue
+                    print(f"[추출] {name}: {len(text)}자 ({engine})")
+                    generating[generate_pool.submit(_generate, text, examples, name, refresh)] = (path, name, sha256)
+                    continue
+
+                path, name, sha256 = generating.pop(future)
+                try:
+                    test_cases = future.result()
+                except Exception as e:
+                    test_cases, error = None, str(e)
+                else:
+                    # 생성이 모두 실패하면 예시 데이터가 반환되므로 실패로 기록하여 다음 실행 때 다시 처리
+                    error = 'generation' if test_cases == fallback else None
+                if error:
+                    failed += 1
+                    print(f"[실패] {name}: 테스트 케이스 생성 실패 ({error})")
+                    manifest.record(name, status='failed', sha256=sha256, error=error)
+                    continue
+
+                # 기본 필드를 한 번 채운 열 기반 배치로 JSON과 Excel을 같은 내용으로 기록
+                test_cases = TestCaseBatch.from_records(test_cases)
+                cases_path = os.path.join(cases_dir, f"{name}.json")
+                _write_json(cases_path, test_cases.to_records())
+                workbook = None
+                if not combined:
+                    workbook = generator.generate_excel(test_cases, os.path.join(output_dir, f"{name}.xlsx"))
+                manifest.record(name, status='done', sha256=sha256, source=path, cases=len(test_cases),
+                                cases_path=cases_path, workbook=workbook)
+                done += 1
+                print(f"[완료] {name}: 테스트 케이스 {len(test_cases)}개")
+
+    if combined:
+        # 이전 실행에서 완료한 파일을 포함하여 현재 대상 파일 전체로 통합 Excel을 다시 만듦
+        sheets = {}
+        for path in files:
+            entry = manifest.entries.get(document_name(path, root))
+            if entry and entry.get('status') == 'done':
+                with open(entry['cases_path'], encoding='utf-8') as f:
+                    sheets[document_name(path, root)] = json.load(f)
+        combined_path = generator.generate_combined_excel(sheets, os.path.join(output_dir, COMBINED_NAME))
+        print(f"통합 Excel 생성: {combined_path} (시트 {len(sheets)}개)")
+
+    return {'done': done, 'skipped': skipped, 'failed': failed}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="기획서 PDF를 일괄 처리하여 테스트 케이스 Excel을 생성합니다.")
+    parser.add_argument('source', help="PDF가 있는 디렉토리 또는 glob 패턴 (예: \"specs/**/*.pdf\")")
+    parser.add_argument('-o', '--output', default=os.path.join(Config.OUTPUT_FOLDER, 'batch'),
+                        help="결과 폴더 (매니페스트와 Excel 저장 위치)")
+    parser.add_argument('-r', '--recursive', action='store_true', help="디렉토리를 하위 폴더까지 검색")
+    parser.add_argument('--combined', action='store_true', help="기획서별 시트를 가진 통합 Excel 하나로 저장")
+    parser.add_argument('--extract-workers', type=int, default=Config.EXTRACT_WORKERS, help="추출 프로세스 수")
+    parser.add_argument('--concurrent-files', type=int, default=4, help="동시에 생성하는 파일 수")
+    parser.add_argument('--llm-concurrency', type=int, default=Config.LLM_MAX_CONCURRENCY * 2,
+                        help="전체 동시 LLM 요청 수 상한")
+    parser.add_argument('--refresh', action='store_true', help="완료 기록과 이전 결과를 무시하고 모두 다시 생성")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # 진행 상황은 표준 출력으로, 추출·생성 모듈의 경고와 재시도 기록은 로깅으로 표시
+    configure_logging()
+
+    api_key = os.getenv("OPENAI_API_KEY") or Config.OPENAI_API_KEY
+    if not api_key:
+        print("오류: OPENAI_API_KEY가 설정되지 않았습니다.")
+        return 1
+    openai.api_key = api_key
+
+    files = find_pdfs(args.source, args.recursive)
+    if not files:
+        print(f"처리할 PDF가 없습니다: {args.source}")
+        return 1
+    root = args.source if os.path.isdir(args.source) else os.path.commonpath([os.path.dirname(f) for f in files])
+
+    Config.init_app()
+    started = time.monotonic()
+    summary = run_batch(
+        files,
+        root,
+        args.output,
+        combined=args.combined,
+        extract_workers=args.extract_workers,
+        concurrent_files=args.concurrent_files,
+        llm_concurrency=args.llm_concurrency,
+        refresh=args.refresh
+    )
+    print(
+        f"완료 {summary['done']}개, 건너뜀 {summary['skipped']}개, 실패 {summary['failed']}개 "
+        f"({time.monotonic() - started:.1f}초)"
+    )
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+벤치마크용 로컬 OpenAI chat completions 모의 서버
+
+POST /v1/chat/completions 요청에 설정한 지연 후 테스트 케이스 JSON을 응답합니다.
+stream=True 요청에는 SSE 조각으로, response_format이 있으면 {"test_cases": [...]}
+객체로 응답합니다. repair_ratio 비율만큼은 설명 문구와 ```json 펜스를 붙여
+JSON 복구 경로를 거치게 하고, truncate_ratio 비율만큼은 응답을 중간에서 자르고
+finish_reason "length"로 응답하여 이어쓰기 요청 경로를 거치게 합니다
+(이어쓰기 요청에는 잘리지 않은 응답을 보냄).
+"""
+import json
+import time
+import zlib
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _item_name(i, length=6):
+    """케이스마다 다른 아이템 이름 (중복 케이스 병합에 걸리지 않도록 단계 내용을 다르게 함)"""
+    return "".join(chr(0xAC00 + (i * 7919 + k * 104729) % 11172) for k in range(length))
+
+
+def _test_cases(count, offset=0):
+    return [
+        {
+            "TID": f"BENCH_{i:03d}",
+            "대분류": "인벤토리",
+            "중분류": "아이템 사용",
+            "소분류": f"케이스 {i}",
+            "Precondition": "캐릭터가 로그인되어 있음",
+            "Test_Step": f"1. 인벤토리 열기\n2. {_item_name(offset + i)} 선택\n3. {_item_name(offset + i + count)} 사용 버튼 클릭",
+            "Expected_Result": f"1. {_item_name(offset + i)}이 소모됨\n2. {_item_name(offset + i + 2 * count)} 효과가 적용됨",
+            "Result": "",
+            "BTS_Key": "",
+            "Comment": ""
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+class MockOpenAIServer:
+    """백그라운드 스레드에서 동작하는 모의 서버"""
+
+    def __init__(self, latency=0.5, cases_per_response=20, repair_ratio=0.0, truncate_ratio=0.0,
+                 stream_chunk_chars=64):
+        self.latency = latency
+        self.cases_per_response = cases_per_response
+        self.repair_ratio = repair_ratio
+        self.truncate_ratio = truncate_ratio
+        self.stream_chunk_chars = stream_chunk_chars
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _content(self, wrap_object, continuation, prompt=""):
+        """응답 본문과 finish_reason을 반환합니다 (같은 프롬프트에는 같은 케이스, 청크마다 다른 케이스)."""
+        cases = _test_cases(self.cases_per_response, zlib.crc32(prompt.encode('utf-8')) % 100000 * 3)
+        content = json.dumps({"test_cases": cases} if wrap_object else cases, ensure_ascii=False)
+        if random.random() < self.repair_ratio:
+            content = f"다음은 생성된 테스트 케이스입니다.\n```json\n{content}\n```"
+        if not continuation and random.random() < self.truncate_ratio:
+            return content[:len(content) // 2], "length"
+        return content, "stop"
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                with mock._lock:
+                    mock.requests += 1
+                time.sleep(mock.latency)
+
+                continuation = any(message.get('role') == 'assistant' for message in body.get('messages', []))
+                prompt = next((message.get('content') or "" for message in body.get('messages', [])
+                               if message.get('role') == 'user'), "")
+                content, finish_reason = mock._content('response_format' in body, continuation, prompt)
+                usage = {"prompt_tokens": 1000, "completion_tokens": len(content) // 2}
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                base = {"id": "chatcmpl-bench", "created": int(time.time()), "model": body.get("model", "mock")}
+
+                if body.get('stream'):
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/event-stream')
+                    self.end_headers()
+                    step = mock.stream_chunk_chars
+                    for start in range(0, len(content), step):
+                        chunk = dict(base, object="chat.completion.chunk", choices=[{
+                            "index": 0, "delta": {"content": content[start:start + step]}, "finish_reason": None
+                        }])
+                        self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+                    final = dict(base, object="chat.completion.chunk", choices=[{
+                        "index": 0, "delta": {}, "finish_reason": finish_reason
+                    }])
+                    self.wfile.write(f"data: {json.dumps(final)}\n\n".encode('utf-8'))
+                    if (body.get('stream_options') or {}).get('include_usage'):
+                        usage_chunk = dict(base, object="chat.completion.chunk", choices=[], usage=usage)
+                        self.wfile.write(f"data: {json.dumps(usage_chunk)}\n\n".encode('utf-8'))
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    return
+
+                payload = dict(base, object="chat.completion", usage=usage, choices=[{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": finish_reason
+                }])
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
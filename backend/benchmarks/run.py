@@ -0,0 +1,345 @@
+"""
+테스트 케이스 생성 파이프라인 벤치마크
+
+합성 PDF와 로컬 OpenAI 모의 서버를 사용하여 단계별 소요 시간을 측정합니다.
+
+- extraction: extract_text_from_pdf (페이지 수별)
+- generation: generate_test_cases (JSON 복구, 잘린 응답 이어쓰기 경로 포함, 개정판 추적 시 청크 수)
+- export: generate_excel
+- flow: Flask 테스트 클라이언트로 /api/upload → /api/generate 전체 흐름
+- coldstart: 서버리스 함수(api/index.py)를 새 프로세스에서 임포트하고 첫 업로드/생성 요청까지의
+  시간 (기본 지연 로드와 WARM_ON_START 미리 로드를 각각 측정, -X importtime으로 임포트 비용이
+  큰 모듈 목록 포함)
+
+각 단계는 p50/p95 지연 시간, 처리량(초당 횟수), 측정 후 최대 RSS를 JSON으로 출력하므로
+릴리스 간 결과 파일을 diff 할 수 있습니다.
+
+사용 예:
+    python benchmarks/run.py --pages 1,20,100 --iterations 5 --llm-latency 0.2 --output bench.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import contextlib
+import platform
+import resource
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+API_DIR = os.path.join(os.path.dirname(BACKEND_DIR), 'api')
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from mock_openai import MockOpenAIServer
+from synthetic_pdf import make_pdf
+
+STAGES = ("extraction", "generation", "export", "flow", "coldstart")
+
+# 콜드 스타트 측정용 자식 프로세스 스크립트 (마지막 줄에 단계별 시간을 JSON으로 출력)
+COLD_START_SCRIPT = """
+import io, os, sys, json, time
+started = time.perf_counter()
+import index
+imported = time.perf_counter()
+client = index.app.test_client()
+with open(sys.argv[1], 'rb') as f:
+    upload = client.post('/api/upload', data={'file': (io.BytesIO(f.read()), 'bench.pdf')},
+                         content_type='multipart/form-data')
+assert upload.status_code == 200, upload.get_data(as_text=True)
+uploaded = time.perf_counter()
+generate = client.post('/api/generate', json={'text': upload.get_json()['text']})
+assert generate.status_code == 200, generate.get_data(as_text=True)
+generated = time.perf_counter()
+os.remove(generate.get_json()['excel_path'])
+print(json.dumps({'import': imported - started, 'first_upload': uploaded - imported,
+                  'first_generate': generated - uploaded, 'total': generated - started}))
+"""
+
+
+def percentile(samples, fraction):
+    """nearest-rank 방식 백분위수"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    """현재 프로세스와 종료된 자식 프로세스(추출 작업자 등)의 최대 RSS (MB)"""
+    # Linux는 KB, macOS는 바이트 단위
+    unit = 1 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return round(own / 1024 / 1024, 1), round(children / 1024 / 1024, 1)
+
+
+def measure(func, iterations, warmup=1):
+    """func를 warmup회 실행한 뒤 iterations회 측정하여 요약 통계를 반환합니다."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+
+    rss, children_rss = peak_rss_mb()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+        "throughput_per_s": round(len(samples) / sum(samples), 3),
+        "peak_rss_mb": rss,
+        "peak_children_rss_mb": children_rss
+    }
+
+
+def configure_environment(args, base_url, workdir):
+    """src 모듈을 임포트하기 전에 모의 서버와 임시 폴더를 가리키도록 환경 변수를 설정합니다."""
+    os.environ.update({
+        "OPENAI_API_KEY": "sk-benchmark-0000000000000000000000000000",
+        "OPENAI_BASE_URL": base_url,
+        "OPENAI_MODEL": "mock-model",
+        "LLM_FAST_MODEL": "mock-fast-model",
+        "OPENAI_RPM_LIMIT": "0",
+        "OPENAI_TPM_LIMIT": "0",
+        "LLM_CHUNK_CHARS": str(args.chunk_chars),
+        "OUTPUT_FOLDER": os.path.join(workdir, "output"),
+        "UPLOAD_FOLDER": os.path.join(workdir, "uploads"),
+        "CACHE_FOLDER": os.path.join(workdir, "cache"),
+        "DATA_FOLDER": os.path.join(workdir, "data"),
+        # 캐시 적중이 측정값을 왜곡하지 않도록 추출 캐시를 사실상 비활성화
+        "EXTRACTION_CACHE_MAX_MB": "0",
+    })
+
+
+def bench_extraction(args, pdfs):
+    from src.pdf_processor.extractor import extract_text_from_pdf
+
+    results = {}
+    for pages, path in pdfs.items():
+        results[f"{pages}_pages"] = measure(
+            lambda: extract_text_from_pdf(path, use_cache=False), args.iterations
+        )
+    return results
+
+
+def bench_generation(args, pdfs, mock):
+    from src.llm.example_loader import load_example_library
+    from src.llm.openai_client import document_chunks, generate_test_cases
+    from src.pdf_processor.extractor import extract_text_from_pdf
+
+    examples = load_example_library()
+    results = {}
+    for pages, path in pdfs.items():
+        text = extract_text_from_pdf(path, use_cache=False)
+        before = mock.requests
+        stats = measure(lambda: generate_test_cases(text, examples, use_cache=False), args.iterations)
+        stats["llm_requests_per_run"] = round((mock.requests - before) / (args.iterations + 1), 2)
+        # 개정판을 추적하는 문서(document_id)는 내용 기반 경계에서도 끊으므로 청크가 늘 수 있음
+        stats["chunks"] = len(document_chunks(text))
+        stats["chunks_with_document_id"] = len(document_chunks(text, "benchmark.pdf"))
+        results[f"{pages}_pages"] = stats
+    return results
+
+
+def bench_export(args):
+    from src.excel.generator import generate_excel
+
+    results = {}
+    for rows in args.rows:
+        cases = [
+            {
+                "TID": f"BENCH_{i:05d}",
+                "대분류": "인벤토리",
+                "중분류": "아이템 사용",
+                "소분류": f"케이스 {i}",
+                "Precondition": "캐릭터가 로그인되어 있음",
+                "Test_Step": "1. 인벤토리 열기\n2. 아이템 선택\n3. 사용 버튼 클릭",
+                "Expected_Result": "1. 아이템이 소모됨\n2. 효과가 적용됨"
+            }
+            for i in range(rows)
+        ]
+
+        def run():
+            path = generate_excel([dict(case) for case in cases])
+            os.remove(path)
+
+        results[f"{rows}_rows"] = measure(run, args.iterations)
+    return results
+
+
+def bench_flow(args, pdfs):
+    from app import create_app
+
+    app = create_app()
+
+    client = app.test_client()
+    results = {}
+    for pages, path in pdfs.items():
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        def run():
+            # 매 반복마다 내용이 달라지도록 주석을 덧붙여 해시 기반 캐시를 우회
+            data = content + f"\n% {random.random()}\n".encode('ascii')
+            upload = client.post('/api/upload', data={'file': (io.BytesIO(data), 'bench.pdf')},
+                                 content_type='multipart/form-data')
+            assert upload.status_code == 200, upload.get_data(as_text=True)
+            generate = client.post('/api/generate', json={'document': upload.get_json()['document'], 'cache': False})
+            assert generate.status_code == 200, generate.get_data(as_text=True)
+
+        results[f"{pages}_pages"] = measure(run, args.iterations)
+    return results
+
+
+def _summary(samples):
+    return {
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2)
+    }
+
+
+def import_profile(env, top=10):
+    """-X importtime 출력에서 index가 직접 임포트한 모듈을 누적 임포트 시간 순으로 반환합니다."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import index'], cwd=API_DIR,
+                            env=env, capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # 이름 앞 들여쓰기(2칸 단위)가 임포트 깊이, 깊이 1이 index가 직접 임포트한 모듈 (하위 임포트 포함)
+        if (len(name) - len(name.lstrip()) - 1) // 2 == 1:
+            modules.append((int(cumulative), name.strip()))
+    modules.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for us, name in modules[:top]]
+
+
+def bench_coldstart(args, pdfs):
+    """api/index.py를 매번 새 프로세스에서 임포트하여 콜드 스타트 후 첫 요청까지 측정합니다."""
+    path = pdfs[min(pdfs)]
+    results = {}
+    for mode, warm in (("lazy", "false"), ("warm_on_start", "true")):
+        env = dict(os.environ, WARM_ON_START=warm, PYTHONDONTWRITEBYTECODE="1")
+        samples = {}
+        for _ in range(args.iterations):
+            result = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT, path], cwd=API_DIR,
+                                    env=env, capture_output=True, text=True, check=True)
+            for key, value in json.loads(result.stdout.strip().splitlines()[-1]).items():
+                samples.setdefault(key, []).append(value)
+        results[mode] = {key: _summary(values) for key, values in samples.items()}
+        results[mode]["top_imports"] = import_profile(env)
+    return results
+
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="테스트 케이스 생성 파이프라인 벤치마크")
+    parser.add_argument('--pages', default="1,20,100", help="합성 PDF 페이지 수 목록 (쉼표 구분)")
+    parser.add_argument('--rows', default="100,5000", help="Excel 내보내기 행 수 목록 (쉼표 구분)")
+    parser.add_argument('--iterations', type=int, default=5, help="단계별 측정 반복 횟수")
+    parser.add_argument('--stages', default=",".join(STAGES), help=f"실행할 단계 ({', '.join(STAGES)})")
+    parser.add_argument('--llm-latency', type=float, default=0.2, help="모의 LLM 응답 지연 (초)")
+    parser.add_argument('--cases-per-response', type=int, default=20, help="모의 LLM 응답당 테스트 케이스 수")
+    parser.add_argument('--repair-ratio', type=float, default=0.5,
+                        help="JSON 복구가 필요한 형태로 응답할 비율 (0~1)")
+    parser.add_argument('--truncate-ratio', type=float, default=0.1,
+                        help="길이 제한으로 잘린 응답을 보낼 비율 (0~1, 이어쓰기 요청 발생)")
+    parser.add_argument('--chunk-chars', type=int, default=12000, help="LLM_CHUNK_CHARS 값")
+    parser.add_argument('--output', help="결과 JSON 파일 경로 (생략 시 표준 출력)")
+    args = parser.parse_args(argv)
+    args.pages = [int(value) for value in args.pages.split(",") if value]
+    args.rows = [int(value) for value in args.rows.split(",") if value]
+    args.stages = [value for value in args.stages.split(",") if value]
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(0)
+
+    mock = MockOpenAIServer(
+        latency=args.llm_latency,
+        cases_per_response=args.cases_per_response,
+        repair_ratio=args.repair_ratio,
+        truncate_ratio=args.truncate_ratio
+    ).start()
+
+    with tempfile.TemporaryDirectory(prefix="tc_bench_") as workdir:
+        configure_environment(args, mock.base_url, workdir)
+
+        pdfs = {}
+        for pages in args.pages:
+            path = os.path.join(workdir, f"synthetic_{pages}p.pdf")
+            with open(path, 'wb') as f:
+                f.write(make_pdf(pages))
+            pdfs[pages] = path
+
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                "pages": args.pages,
+                "rows": args.rows,
+                "iterations": args.iterations,
+                "llm_latency_s": args.llm_latency,
+                "cases_per_response": args.cases_per_response,
+                "repair_ratio": args.repair_ratio,
+                "truncate_ratio": args.truncate_ratio,
+                "chunk_chars": args.chunk_chars
+            },
+            "stages": {}
+        }
+
+        try:
+            for stage in args.stages:
+                print(f"[benchmark] {stage} 측정 중...", file=sys.stderr)
+                # 파이프라인 로그가 JSON 결과와 섞이지 않도록 표준 오류로 보냄
+                with contextlib.redirect_stdout(sys.stderr):
+                    if stage == "extraction":
+                        report["stages"][stage] = bench_extraction(args, pdfs)
+                    elif stage == "generation":
+                        report["stages"][stage] = bench_generation(args, pdfs, mock)
+                    elif stage == "export":
+                        report["stages"][stage] = bench_export(args)
+                    elif stage == "flow":
+                        report["stages"][stage] = bench_flow(args, pdfs)
+                    elif stage == "coldstart":
+                        report["stages"][stage] = bench_coldstart(args, pdfs)
+        finally:
+            mock.stop()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+        print(f"[benchmark] 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""벤치마크용 합성 PDF 생성기 (외부 라이브러리 없이 PDF 구조를 직접 작성)"""
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(page_count, lines_per_page=40):
+    """
+    헤딩과 본문 줄로 이루어진 텍스트 PDF를 만듭니다.
+
+    Args:
+        page_count (int): 페이지 수
+        lines_per_page (int): 페이지당 본문 줄 수
+
+    Returns:
+        bytes: PDF 파일 내용
+    """
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(page_count)), page_count
+        ),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page in range(1, page_count + 1):
+        lines = [f"{page}. Feature {page} specification"]
+        lines += [
+            f"Rule {page}.{line}: when the player selects item {line}, the inventory slot count "
+            f"changes and a confirmation popup is shown."
+            for line in range(1, lines_per_page + 1)
+        ]
+        body = " ".join(f"({_escape(line)}) '" for line in lines)
+        stream = f"BT /F1 9 Tf 40 780 Td 11 TL {body} ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * (page - 1)} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    output = "%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return output.encode('latin-1')
@@ -0,0 +1,51 @@
+"""
+운영 서버(gunicorn) 설정
+
+backend 디렉토리에서 실행합니다:
+    gunicorn -c gunicorn.conf.py
+
+- gthread 작업자: LLM 호출은 대부분 응답 대기이므로 작업자 프로세스 하나가 WEB_THREADS개의
+  요청(생성, SSE 스트림 포함)을 동시에 처리합니다. 요청 안에서도 청크별 LLM 호출은
+  LLM_MAX_CONCURRENCY개씩 병렬로 진행됩니다.
+- 종료(SIGTERM) 시 새 연결을 받지 않고 진행 중인 요청을 WEB_GRACEFUL_TIMEOUT초까지
+  기다리며, 백그라운드 작업 대기열(/api/jobs)의 남은 작업도 같은 시간 안에서 마칩니다.
+- 작업 대기열과 /metrics 지표는 작업자 프로세스별로 유지되므로 WEB_WORKERS를 늘리면
+  작업 상태 조회가 다른 프로세스로 갈 수 있습니다 (기본 1개).
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.config import Config
+
+wsgi_app = "app:create_app()"  # 작업자마다 앱을 만듦 (app.create_app)
+bind = Config.WEB_BIND
+worker_class = "gthread"
+workers = Config.WEB_WORKERS
+threads = Config.WEB_THREADS
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = Config.WEB_GRACEFUL_TIMEOUT
+keepalive = 5
+
+loglevel = Config.LOG_LEVEL.lower()
+accesslog = "-"
+errorlog = "-"
+
+
+def worker_exit(server, worker):
+    """
+    작업자 종료 전에 백그라운드 작업 대기열의 남은 생성 작업을 마치고, PDF 추출 프로세스
+    풀을 닫습니다.
+
+    작업 스레드는 진행 중 요청을 기다리는 동안에도 계속 실행되며, 마스터는 종료 신호 후
+    graceful_timeout이 지나면 작업자를 강제로 종료합니다.
+    """
+    from src.utils.jobs import drain_job_queue
+    if not drain_job_queue(Config.WEB_GRACEFUL_TIMEOUT):
+        server.log.warning("작업자 %s: 종료 대기 시간 안에 끝나지 않은 백그라운드 작업이 있습니다.", worker.pid)
+
+    # 병렬 추출을 한 번도 하지 않은 작업자는 추출 모듈을 임포트하지 않음
+    extractor = sys.modules.get("src.pdf_processor.extractor")
+    if extractor is not None:
+        extractor.shutdown_process_pool()
@@ -1,13 +1,38 @@
-import pandas as pd
+import logging
 import os
+import re
+import uuid
+import xlsxwriter
+from src.utils import metrics
+from src.utils.config import Config
+from src.llm.test_case import TestCaseBatch
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+SHEET_NAME = 'Test Cases'
+
+# 시트 이름에 쓸 수 없는 문자와 최대 길이 (Excel 제한)
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+MAX_SHEET_NAME_LENGTH = 31
+
+# 헤더 스타일
+HEADER_FORMAT = {
+    'bold': True,
+    'text_wrap': True,
+    'valign': 'top',
+    'fg_color': '#D7E4BC',
+    'border': 1
+}
+
+
 def generate_excel(test_cases, output_path=None):
     """
     테스트 케이스 목록을 Excel 파일로 변환합니다.
     
     Args:
-        test_cases (list): 테스트 케이스 목록
+        test_cases (TestCaseBatch | list): 테스트 케이스 배치 또는 목록 (목록은 배치로 바꾸며
+            빠진 Result, BTS_Key, Comment 등은 빈 문자열로 채움)
         output_path (str, optional): 출력 파일 경로
         
     Returns:
@@ -15,54 +40,97 @@ def generate_excel(test_cases, output_path=None):
     """
     try:
         # 결과 디렉토리
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'output')
+        output_dir = Config.OUTPUT_FOLDER
         os.makedirs(output_dir, exist_ok=True)
         
         # 파일명 생성 (기본값: 현재 날짜/시간)
         if not output_path:
+            # 같은 초에 들어온 요청끼리 덮어쓰지 않도록 임의 접미사를 붙임
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = os.path.join(output_dir, f"test_cases_{timestamp}.xlsx")
-        
-        # 데이터프레임 생성
-        df = pd.DataFrame(test_cases)
-        
-        # Excel 파일 생성
-        writer = pd.ExcelWriter(output_path, engine='xlsxwriter')
-        df.to_excel(writer, sheet_name='Test Cases', index=False)
-        
-        # 열 너비 조정
-        worksheet = writer.sheets['Test Cases']
-        for i, col in enumerate(df.columns):
-            max_len = max(df[col].astype(str).apply(len).max(), len(col)) + 2
-            worksheet.set_column(i, i, max_len)
+            output_path = os.path.join(output_dir, f"test_cases_{timestamp}_{uuid.uuid4().hex[:8]}.xlsx")
         
-        # 헤더 스타일 지정
-        header_format = writer.book.add_format({
-            'bold': True,
-            'text_wrap': True,
-            'valign': 'top',
-            'fg_color': '#D7E4BC',
-            'border': 1
-        })
-        
-        # 헤더 적용
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-        
-        # 파일 저장
-        writer.close()
-        
-        # Excel 생성 시 추가 필드 처리
-        # 만약 테스트 케이스에 Result, BTS_Key, Comment 등의 필드가 없다면 빈 문자열 추가
-        for test_case in test_cases:
-            if 'Result' not in test_case:
-                test_case['Result'] = ''
-            if 'BTS_Key' not in test_case:
-                test_case['BTS_Key'] = ''
-            if 'Comment' not in test_case:
-                test_case['Comment'] = ''
+        with metrics.EXCEL_RENDER_SECONDS.time():
+            write_workbook(test_cases, output_path, HEADER_FORMAT)
         
         return output_path
     except Exception as e:
-        print(f"Excel 파일 생성 중 오류 발생: {e}")
-        raise 
\ No newline at end of file
+        logger.error("Excel 파일 생성 중 오류 발생: %s", e)
+        raise 
+
+def write_workbook(test_cases, output_path, header_format):
+    """
+    pandas 없이 xlsxwriter로 행을 바로 기록합니다.
+    
+    constant_memory 모드로 행을 순서대로 흘려 쓰므로 케이스 수와 관계없이 메모리
+    사용량이 일정하며, 열 너비도 행을 쓰면서 열마다 가장 긴 값으로 갱신합니다.
+    """
+    write_sheets({SHEET_NAME: test_cases}, output_path, header_format)
+
+def generate_combined_excel(sheets, output_path):
+    """
+    여러 문서의 테스트 케이스를 문서별 시트로 나누어 하나의 Excel 파일로 만듭니다.
+    
+    Args:
+        sheets (dict): 시트 이름(예: 문서 이름) → 테스트 케이스 배치 또는 목록
+        output_path (str): 출력 파일 경로
+        
+    Returns:
+        str: 생성된 Excel 파일 경로
+    """
+    used = set()
+    named = {}
+    for name, test_cases in sheets.items():
+        named[sheet_name(name, used)] = test_cases
+    write_sheets(named, output_path, HEADER_FORMAT)
+    return output_path
+
+def sheet_name(name, used):
+    """Excel 제한에 맞게 시트 이름을 정리하고, 이미 쓰인 이름과 겹치지 않게 만듭니다."""
+    base = INVALID_SHEET_CHARS.sub('_', name).strip("'") or SHEET_NAME
+    base = base[:MAX_SHEET_NAME_LENGTH]
+    candidate = base
+    suffix = 2
+    while candidate.lower() in used:
+        tail = f" ({suffix})"
+        candidate = base[:MAX_SHEET_NAME_LENGTH - len(tail)] + tail
+        suffix += 1
+    used.add(candidate.lower())
+    return candidate
+
+def write_sheets(sheets, output_path, header_format):
+    """시트 이름 → 테스트 케이스 배치(또는 목록)를 시트별로 기록합니다 (constant_memory 모드)."""
+    workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True})
+    try:
+        header = workbook.add_format(header_format)
+        for name, test_cases in sheets.items():
+            _write_sheet(workbook.add_worksheet(name), TestCaseBatch.of(test_cases), header)
+    finally:
+        workbook.close()
+
+def _cell_length(value):
+    return len(value) if isinstance(value, str) else len(str(value))
+
+def _write_sheet(worksheet, batch, header):
+    columns = batch.fields
+    
+    # 헤더 적용 (열 너비는 열마다 값의 문자열 길이 최댓값)
+    widths = []
+    for col_num, col in enumerate(columns):
+        worksheet.write(0, col_num, col, header)
+        widths.append(len(col))
+    
+    # 데이터 행 기록 (constant_memory 모드이므로 행 순서대로, 열 너비도 쓰면서 갱신)
+    for row_num, row in enumerate(batch.rows(), start=1):
+        for col_num, value in enumerate(row):
+            if value is None:
+                continue
+            if not isinstance(value, (str, int, float, bool)):
+                value = str(value)
+            worksheet.write(row_num, col_num, value)
+            length = _cell_length(value)
+            if length > widths[col_num]:
+                widths[col_num] = length
+    
+    # 열 너비 조정
+    for col_num, width in enumerate(widths):
+        worksheet.set_column(col_num, col_num, width + 2)
@@ -0,0 +1,368 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import count, repeat
+from src.utils.config import Config
+from src.llm.test_case import TestCaseBatch
+
+# 페이지당 최대 항목 수
+MAX_PER_PAGE = 500
+
+# 분류 열 이름 → 검색 조건 이름
+CATEGORY_COLUMNS = (("대분류", "major"), ("중분류", "middle"), ("소분류", "minor"))
+
+# cases 테이블의 tid, major, middle, minor, test_step, expected_result 열에 넣을 필드
+INDEXED_FIELDS = ("TID", *(field for field, _ in CATEGORY_COLUMNS), "Test_Step", "Expected_Result")
+
+# trigram 토크나이저의 최소 검색어 길이 (이보다 짧은 단어는 LIKE로 검색)
+TRIGRAM_MIN_LENGTH = 3
+
+
+class CaseStore:
+    """
+    기획서 문서, 생성 실행(run), 테스트 케이스를 보관하는 SQLite 저장소
+
+    생성할 때마다 결과를 실행 단위로 쌓아 두므로, 지난 결과를 Excel을 다시 내려받지 않고
+    TID·분류·문서 해시로 조회하거나 테스트 단계/기대 결과 본문을 전문 검색(FTS5)할 수
+    있습니다. 한글 부분 일치를 위해 trigram 토크나이저를 사용하며, 이를 지원하지 않는
+    SQLite(3.34 미만)에서는 단어 단위 토크나이저로 대신합니다.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " id INTEGER PRIMARY KEY,"
+                " sha256 TEXT NOT NULL UNIQUE,"
+                " name TEXT,"
+                " created_at REAL NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS document_texts ("
+                " document_id INTEGER PRIMARY KEY REFERENCES documents (id),"
+                " text TEXT NOT NULL,"
+                " saved_at REAL NOT NULL DEFAULT 0);"
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " id INTEGER PRIMARY KEY,"
+                " document_id INTEGER NOT NULL REFERENCES documents (id),"
+                " model TEXT,"
+                " case_count INTEGER NOT NULL,"
+                " excel_path TEXT,"
+                " created_at REAL NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS cases ("
+                " id INTEGER PRIMARY KEY,"
+                " run_id INTEGER NOT NULL REFERENCES runs (id),"
+                " document_id INTEGER NOT NULL REFERENCES documents (id),"
+                " position INTEGER NOT NULL,"
+                " tid TEXT,"
+                " major TEXT,"
+                " middle TEXT,"
+                " minor TEXT,"
+                " test_step TEXT,"
+                " expected_result TEXT,"
+                " data TEXT NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS idx_runs_document ON runs (document_id, id);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_run ON cases (run_id, position);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_document ON cases (document_id);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_tid ON cases (tid);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_category ON cases (major, middle, minor);"
+            )
+            # saved_at 열이 없던 저장소는 열을 추가 (기존 텍스트는 보존 기간이 지난 것으로 취급)
+            if "saved_at" not in {row[1] for row in conn.execute("PRAGMA table_info(document_texts)")}:
+                conn.execute("ALTER TABLE document_texts ADD COLUMN saved_at REAL NOT NULL DEFAULT 0")
+            self.tokenizer = self._create_fts(conn)
+
+    @contextmanager
+    def _connect(self):
+        """트랜잭션을 커밋하고 연결을 닫는 SQLite 연결 컨텍스트"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _create_fts(self, conn):
+        """cases 테이블을 원본으로 하는 전문 검색 색인과 동기화 트리거를 만듭니다."""
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'cases_fts'").fetchone()
+        if row is not None:
+            return "trigram" if "trigram" in row[0] else "unicode61"
+
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE cases_fts USING fts5("
+                    " test_step, expected_result,"
+                    f" content='cases', content_rowid='id', tokenize='{tokenizer}')"
+                )
+                break
+            except sqlite3.OperationalError:
+                continue
+        else:
+            raise RuntimeError("SQLite FTS5를 사용할 수 없습니다.")
+
+        conn.executescript(
+            "CREATE TRIGGER IF NOT EXISTS cases_fts_insert AFTER INSERT ON cases BEGIN"
+            " INSERT INTO cases_fts (rowid, test_step, expected_result)"
+            " VALUES (new.id, new.test_step, new.expected_result);"
+            " END;"
+            "CREATE TRIGGER IF NOT EXISTS cases_fts_delete AFTER DELETE ON cases BEGIN"
+            " INSERT INTO cases_fts (cases_fts, rowid, test_step, expected_result)"
+            " VALUES ('delete', old.id, old.test_step, old.expected_result);"
+            " END;"
+        )
+        return tokenizer
+
+    def _upsert_document(self, conn, document_hash, name, now):
+        """문서 행을 만들거나(이미 있으면 새 이름만 반영) 문서 ID를 반환합니다."""
+        conn.execute(
+            "INSERT INTO documents (sha256, name, created_at) VALUES (?, ?, ?)"
+            " ON CONFLICT (sha256) DO UPDATE SET name = COALESCE(excluded.name, name)",
+            (document_hash, name, now)
+        )
+        return conn.execute("SELECT id FROM documents WHERE sha256 = ?", (document_hash,)).fetchone()[0]
+
+    def save_document(self, document_hash, text, name=None):
+        """
+        업로드한 문서의 추출 텍스트를 저장합니다.
+
+        생성 요청은 텍스트 대신 문서 해시(문서 핸들)만 보내고 서버가 이 텍스트를 읽습니다.
+        생성 실행이 없는 텍스트는 purge_unused_texts()로 보존 기간이 지나면 삭제됩니다.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            document_id = self._upsert_document(conn, document_hash, name, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO document_texts (document_id, text, saved_at) VALUES (?, ?, ?)",
+                (document_id, text, now)
+            )
+
+    def document_text(self, document_hash):
+        """문서 핸들로 저장된 추출 텍스트를 반환합니다. 없으면 None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT t.text FROM document_texts t JOIN documents d ON d.id = t.document_id WHERE d.sha256 = ?",
+                (document_hash,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def record_run(self, test_cases, document_hash, name=None, model=None, excel_path=None):
+        """
+        생성 결과 하나를 실행으로 저장합니다.
+
+        Args:
+            test_cases (TestCaseBatch | list): 생성된 테스트 케이스 배치 또는 목록
+            document_hash (str): 문서 해시 (업로드 파일 또는 추출 텍스트의 SHA-256)
+            name (str, optional): 문서 이름 (처음 저장할 때 또는 새 이름이 주어지면 기록)
+            model (str, optional): 생성에 사용한 모델 (여러 개면 쉼표로 구분)
+            excel_path (str, optional): 함께 만든 Excel 파일 경로
+
+        Returns:
+            int: 실행 ID
+        """
+        batch = TestCaseBatch.of(test_cases)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            document_id = self._upsert_document(conn, document_hash, name, now)
+            run_id = conn.execute(
+                "INSERT INTO runs (document_id, model, case_count, excel_path, created_at) VALUES (?, ?, ?, ?, ?)",
+                (document_id, model, len(batch), excel_path, now)
+            ).lastrowid
+            # 검색용 열은 배치의 열을 그대로 순회하고, 전체 레코드만 행 단위 JSON으로 저장
+            conn.executemany(
+                "INSERT INTO cases (run_id, document_id, position, tid, major, middle, minor,"
+                " test_step, expected_result, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    repeat(run_id), repeat(document_id), count(),
+                    *(map(_text, batch.column(field)) for field in INDEXED_FIELDS),
+                    (json.dumps(record, ensure_ascii=False) for record in batch.records())
+                )
+            )
+        return run_id
+
+    def purge_unused_texts(self, max_age_seconds):
+        """
+        업로드만 하고 생성하지 않은 채 max_age_seconds가 지난 문서 텍스트를 삭제합니다.
+
+        생성 실행이 있는 문서의 텍스트는 다시 생성할 수 있도록 남깁니다. 텍스트와 실행이
+        모두 없는 문서 행도 함께 삭제합니다.
+
+        Returns:
+            int: 삭제한 텍스트 수
+        """
+        cutoff = time.time() - max_age_seconds
+        with self._lock, self._connect() as conn:
+            removed = conn.execute(
+                "DELETE FROM document_texts WHERE saved_at < ?"
+                " AND NOT EXISTS (SELECT 1 FROM runs r WHERE r.document_id = document_texts.document_id)",
+                (cutoff,)
+            ).rowcount
+            conn.execute(
+                "DELETE FROM documents WHERE created_at < ?"
+                " AND NOT EXISTS (SELECT 1 FROM runs r WHERE r.document_id = documents.id)"
+                " AND NOT EXISTS (SELECT 1 FROM document_texts t WHERE t.document_id = documents.id)",
+                (cutoff,)
+            )
+        return removed
+
+    def list_documents(self, page=1, per_page=50):
+        """
+        문서 목록을 최근 실행 순으로 반환합니다.
+
+        업로드만 하고 아직 생성하지 않은 문서(보존 기간이 지나지 않은 것)도 실행 수 0으로
+        포함하며, 실행이 있는 문서 뒤에 옵니다.
+        """
+        page, per_page = _page_bounds(page, per_page)
+        with self._connect() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            rows = conn.execute(
+                "SELECT d.sha256, d.name, d.created_at, COUNT(r.id), MAX(r.id), MAX(r.created_at)"
+                " FROM documents d LEFT JOIN runs r ON r.document_id = d.id"
+                " GROUP BY d.id ORDER BY MAX(r.id) DESC LIMIT ? OFFSET ?",
+                (per_page, (page - 1) * per_page)
+            ).fetchall()
+        items = [
+            {
+                'document_hash': sha256,
+                'name': name,
+                'created_at': created_at,
+                'run_count': run_count,
+                'latest_run_id': latest_run_id,
+                'latest_run_at': latest_run_at
+            }
+            for sha256, name, created_at, run_count, latest_run_id, latest_run_at in rows
+        ]
+        return _page(items, total, page, per_page)
+
+    def list_runs(self, document_hash=None, page=1, per_page=50):
+        """실행 목록을 최신순으로 반환합니다 (document_hash를 지정하면 해당 문서만)."""
+        page, per_page = _page_bounds(page, per_page)
+        where, params = "", []
+        if document_hash:
+            where, params = " WHERE d.sha256 = ?", [document_hash]
+        with self._connect() as conn:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM runs r JOIN documents d ON d.id = r.document_id{where}", params
+            ).fetchone()[0]
+            rows = conn.execute(
+                "SELECT r.id, d.sha256, d.name, r.model, r.case_count, r.excel_path, r.created_at"
+                f" FROM runs r JOIN documents d ON d.id = r.document_id{where}"
+                " ORDER BY r.id DESC LIMIT ? OFFSET ?",
+                params + [per_page, (page - 1) * per_page]
+            ).fetchall()
+        return _page([_run(row) for row in rows], total, page, per_page)
+
+    def get_run(self, run_id):
+        """실행 정보를 반환합니다. 없으면 None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT r.id, d.sha256, d.name, r.model, r.case_count, r.excel_path, r.created_at"
+                " FROM runs r JOIN documents d ON d.id = r.document_id WHERE r.id = ?",
+                (run_id,)
+            ).fetchone()
+        return _run(row) if row else None
+
+    def run_cases(self, run_id):
+        """실행의 테스트 케이스 전체를 생성 순서대로 반환합니다."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT data FROM cases WHERE run_id = ? ORDER BY position", (run_id,)).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def search_cases(self, query=None, tid=None, major=None, middle=None, minor=None,
+                     document_hash=None, run_id=None, page=1, per_page=50):
+        """
+        테스트 케이스를 검색합니다.
+
+        Args:
+            query (str, optional): 테스트 단계/기대 결과 본문 검색어 (공백으로 나눈 단어를 모두 포함)
+            tid (str, optional): TID (정확히 일치)
+            major, middle, minor (str, optional): 대분류/중분류/소분류 (정확히 일치)
+            document_hash (str, optional): 문서 해시
+            run_id (int, optional): 실행 ID
+            page (int): 1부터 시작하는 페이지 번호
+            per_page (int): 페이지당 항목 수 (최대 MAX_PER_PAGE)
+
+        Returns:
+            dict: {'items': [...], 'total': 전체 일치 수, 'page': ..., 'per_page': ...}
+        """
+        page, per_page = _page_bounds(page, per_page)
+        conditions, params = [], []
+        for column, value in (("c.tid", tid), ("c.major", major), ("c.middle", middle),
+                              ("c.minor", minor), ("c.run_id", run_id)):
+            if value not in (None, ""):
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if document_hash:
+            conditions.append("c.document_id = (SELECT id FROM documents WHERE sha256 = ?)")
+            params.append(document_hash)
+
+        match_terms = []
+        for word in (query or "").split():
+            if self.tokenizer == "trigram" and len(word) < TRIGRAM_MIN_LENGTH:
+                # trigram 색인으로 찾을 수 없는 짧은 단어는 본문에서 직접 찾음
+                conditions.append("(instr(c.test_step, ?) > 0 OR instr(c.expected_result, ?) > 0)")
+                params.extend([word, word])
+            else:
+                match_terms.append('"' + word.replace('"', '""') + '"')
+        if match_terms:
+            conditions.append("c.id IN (SELECT rowid FROM cases_fts WHERE cases_fts MATCH ?)")
+            params.append(" AND ".join(match_terms))
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM cases c{where}", params).fetchone()[0]
+            rows = conn.execute(
+                "SELECT c.id, c.run_id, d.sha256, c.data FROM cases c"
+                f" JOIN documents d ON d.id = c.document_id{where}"
+                " ORDER BY c.run_id DESC, c.position LIMIT ? OFFSET ?",
+                params + [per_page, (page - 1) * per_page]
+            ).fetchall()
+        items = [
+            {'id': case_id, 'run_id': case_run_id, 'document_hash': sha256, 'test_case': json.loads(data)}
+            for case_id, case_run_id, sha256, data in rows
+        ]
+        return _page(items, total, page, per_page)
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def _page_bounds(page, per_page):
+    return max(1, int(page)), max(1, min(int(per_page), MAX_PER_PAGE))
+
+
+def _page(items, total, page, per_page):
+    return {'items': items, 'total': total, 'page': page, 'per_page': per_page}
+
+
+def _run(row):
+    run_id, sha256, name, model, case_count, excel_path, created_at = row
+    return {
+        'run_id': run_id,
+        'document_hash': sha256,
+        'document_name': name,
+        'model': model,
+        'case_count': case_count,
+        'excel_path': excel_path,
+        'created_at': created_at
+    }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """설정값으로 생성한 공용 테스트 케이스 저장소를 반환합니다."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CaseStore(Config.CASE_STORE_PATH)
+    return _store
@@ -0,0 +1,159 @@
+import re
+import zlib
+
+# pdfminer / pdftotext는 페이지마다 폼 피드(\f)를 삽입하므로 이를 페이지 경계로 사용
+PAGE_BREAK = "\f"
+
+# 헤딩으로 간주할 최대 줄 길이 (긴 문장은 본문으로 취급)
+MAX_HEADING_LENGTH = 60
+
+# 섹션 내용의 해시가 이 값으로 나누어떨어지면 그 섹션 뒤에서 청크를 끊음 (내용 기반 경계).
+# 경계가 앞뒤 내용이 아니라 섹션 자신의 내용으로 정해지므로, 개정판에서 한 섹션이 바뀌어도
+# 멀리 떨어진 청크의 구성은 그대로 유지되어 이전 생성 결과를 재사용할 수 있음.
+# 청크가 작아져 LLM 호출이 늘어나므로 개정판을 추적하는 문서(stable_boundaries)에만 적용
+BOUNDARY_MODULUS = 4
+
+# 내용 기반 경계에서 끊기 위한 청크의 최소 길이 (최대 길이 대비 비율)
+BOUNDARY_MIN_FILL = 0.5
+
+# 기획서에서 자주 쓰이는 헤딩 형태
+HEADING_PATTERN = re.compile(
+    r"""^\s*(?:
+        \#{1,6}\s+\S                       # 마크다운 헤딩
+      | 제\s*\d+\s*[장절편부]              # 제1장, 제2절
+      | \d+(?:\.\d+)*\.?\s+\S              # 1. 개요 / 2.3 전투 규칙
+      | [IVX]+\.\s+\S                      # 로마 숫자 헤딩
+      | [■□◆◇●▶▷]\s*\S                    # 기호 헤딩
+      | \[[^\]]{1,40}\]\s*$                # [섹션명]
+    )""",
+    re.VERBOSE,
+)
+
+
+def is_heading(line):
+    """줄이 섹션 헤딩인지 판단합니다."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > MAX_HEADING_LENGTH:
+        return False
+    return bool(HEADING_PATTERN.match(stripped))
+
+
+def split_sections(text):
+    """
+    추출된 텍스트를 페이지 경계와 헤딩 기준으로 섹션 단위로 나눕니다.
+
+    Args:
+        text (str): PDF에서 추출한 텍스트
+
+    Returns:
+        list: 섹션 텍스트 목록 (원문 순서 유지)
+    """
+    sections = []
+    current = []
+
+    def flush():
+        section = "\n".join(current).strip()
+        if section:
+            sections.append(section)
+        current.clear()
+
+    for page in text.split(PAGE_BREAK):
+        flush()
+        for line in page.splitlines():
+            if is_heading(line):
+                flush()
+            current.append(line)
+    flush()
+    return sections
+
+
+def _pack(parts, separator, max_chars):
+    """조각들을 구분자로 이어 붙이되 최대 길이를 넘지 않도록 묶습니다."""
+    packed = []
+    current = ""
+    for part in parts:
+        candidate = f"{current}{separator}{part}" if current else part
+        if current and len(candidate) > max_chars:
+            packed.append(current)
+            current = part
+        else:
+            current = candidate
+    if current:
+        packed.append(current)
+    return packed
+
+
+def normalize(text):
+    """공백 차이를 무시하도록 연속된 공백을 하나로 줄입니다 (섹션 지문 계산용)."""
+    return " ".join(text.split())
+
+
+def _is_boundary(section):
+    return zlib.crc32(normalize(section).encode('utf-8')) % BOUNDARY_MODULUS == 0
+
+
+def _pack_sections(sections, max_chars):
+    """
+    섹션들을 최대 길이 이내로 묶되, 내용 기반 경계 섹션 뒤에서는 청크를 끊습니다.
+
+    너무 작은 청크가 생기지 않도록 최대 길이의 BOUNDARY_MIN_FILL 미만인 청크는 경계에서도
+    이어 붙입니다.
+    """
+    min_fill = int(max_chars * BOUNDARY_MIN_FILL)
+    packed = []
+    current = ""
+    for section in sections:
+        candidate = f"{current}\n\n{section}" if current else section
+        if current and len(candidate) > max_chars:
+            packed.append(current)
+            current = section
+        else:
+            current = candidate
+        if _is_boundary(section) and len(current) >= min_fill:
+            packed.append(current)
+            current = ""
+    if current:
+        packed.append(current)
+    return packed
+
+
+def _split_oversized(section, max_chars):
+    """최대 길이를 넘는 섹션을 문단 → 줄 → 글자 순으로 잘라 나눕니다."""
+    parts = []
+    for paragraph in section.split("\n\n"):
+        if len(paragraph) <= max_chars:
+            parts.append(paragraph)
+            continue
+        # 문단 하나가 너무 길면 줄 단위로, 줄도 너무 길면 글자 단위로 나눔
+        lines = []
+        for line in paragraph.split("\n"):
+            lines.extend(line[i:i + max_chars] for i in range(0, len(line), max_chars))
+        parts.extend(_pack(lines, "\n", max_chars))
+    return [piece for piece in _pack(parts, "\n\n", max_chars) if piece.strip()]
+
+
+def chunk_text(text, max_chars, stable_boundaries=False):
+    """
+    섹션을 최대 길이 이내의 청크로 묶습니다.
+
+    섹션 경계를 최대한 유지하며, 인접한 작은 섹션은 하나의 청크로 합칩니다.
+    stable_boundaries이면 청크 경계를 섹션 내용으로도 정하므로 같은 섹션들은 개정판에서도
+    같은 청크로 묶입니다 (청크 수는 늘어남).
+
+    Args:
+        text (str): PDF에서 추출한 텍스트
+        max_chars (int): 청크 하나의 최대 글자 수
+        stable_boundaries (bool): 개정판 섹션 재사용을 위해 내용 기반 경계에서도 끊을지 여부
+
+    Returns:
+        list: 청크 텍스트 목록
+    """
+    parts = []
+    for section in split_sections(text):
+        if len(section) > max_chars:
+            parts.extend(_split_oversized(section, max_chars))
+        else:
+            parts.append(section)
+    if stable_boundaries:
+        return _pack_sections(parts, max_chars)
+    return _pack(parts, "\n\n", max_chars)
@@ -0,0 +1,289 @@
+import logging
+import os
+import time
+import random
+import threading
+import httpx
+import openai
+from src.utils.config import Config
+from src.llm import prompt_builder
+from src.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 HTTP 상태 코드 (요청 한도 초과 및 서버 오류)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 생성 깊이 (낮은 순). 타임아웃이나 마감이 가까운 재시도는 한 단계씩 낮춤
+EFFORT_LEVELS = ("low", "medium", "high")
+
+
+class TokenBucket:
+    """
+    분당 한도를 초 단위로 나누어 채우는 토큰 버킷
+
+    acquire()는 필요한 양이 채워질 때까지 대기하며, 실제 사용량이 추정치와 다르면
+    adjust()로 차이만큼 보정합니다. limit_per_minute가 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(self, limit_per_minute):
+        self.capacity = float(limit_per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.capacity > 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1):
+        """amount만큼의 토큰을 확보할 때까지 대기합니다."""
+        if not self.enabled:
+            return
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def adjust(self, delta):
+        """추정치와 실제 사용량의 차이(delta = 실제 - 추정)를 반영합니다."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - delta)
+
+
+class RateLimiter:
+    """조직의 RPM(분당 요청 수)과 TPM(분당 토큰 수) 한도를 함께 지키는 클라이언트 측 제한기"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, estimated_tokens):
+        self.requests.acquire(1)
+        self.tokens.acquire(estimated_tokens)
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+def estimate_tokens(messages, max_completion_tokens=0):
+    """요청의 프롬프트 토큰 수와 응답 예약분을 합한 토큰 수를 추정합니다."""
+    return prompt_builder.count_message_tokens(messages) + (max_completion_tokens or 0)
+
+
+def retry_delay(attempt, error=None):
+    """
+    재시도 전 대기 시간을 계산합니다.
+
+    서버가 Retry-After(-ms) 헤더를 보내면 그 값을 따르고, 없으면 지수 백오프에
+    전체 지터(0 ~ 상한 사이 임의 값)를 적용합니다.
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        headers = response.headers
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000.0
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except ValueError:
+            pass
+    ceiling = min(Config.OPENAI_BACKOFF_MAX, Config.OPENAI_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def is_retryable(error):
+    """일시적인 오류(연결 실패, 타임아웃, 429/5xx)인지 판단합니다."""
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def lower_effort(effort):
+    """한 단계 낮은 생성 깊이를 반환합니다. 이미 가장 낮거나 알 수 없는 값이면 None."""
+    if effort not in EFFORT_LEVELS:
+        return None
+    index = EFFORT_LEVELS.index(effort)
+    return EFFORT_LEVELS[index - 1] if index > 0 else None
+
+
+def _should_lower_effort(error, deadline, delay):
+    """
+    재시도 전에 생성 깊이를 낮출지 판단합니다.
+
+    응답이 타임아웃으로 끝났거나, 대기 후 마감까지 남은 시간이
+    Config.LLM_EFFORT_FALLBACK_SECONDS보다 짧으면 같은 깊이로는 제때 끝나기 어렵다고 봅니다.
+    """
+    if isinstance(error, openai.APITimeoutError):
+        return True
+    return deadline is not None and deadline - time.monotonic() - delay < Config.LLM_EFFORT_FALLBACK_SECONDS
+
+
+_client = None
+_rate_limiter = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    프로세스 전체에서 공유하는 OpenAI 클라이언트를 반환합니다.
+
+    keep-alive 연결 풀을 가진 httpx 클라이언트를 재사용하므로 요청마다 TLS 연결을
+    새로 맺지 않습니다. 재시도는 create_chat_completion()에서 직접 처리하므로
+    SDK 자체 재시도는 끕니다.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=Config.OPENAI_POOL_SIZE,
+                        max_keepalive_connections=Config.OPENAI_POOL_SIZE
+                    ),
+                    timeout=httpx.Timeout(Config.OPENAI_TIMEOUT, connect=Config.OPENAI_CONNECT_TIMEOUT)
+                )
+                _client = openai.OpenAI(
+                    api_key=openai.api_key or os.getenv("OPENAI_API_KEY"),
+                    http_client=http_client,
+                    max_retries=0
+                )
+    return _client
+
+
+def get_rate_limiter():
+    """설정된 RPM/TPM 한도로 생성한 공용 제한기를 반환합니다."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _client_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(Config.OPENAI_RPM_LIMIT, Config.OPENAI_TPM_LIMIT)
+    return _rate_limiter
+
+
+def record_usage(usage, route=None):
+    """응답의 토큰 사용량을 지표에 기록합니다 (route가 있으면 경로별 사용량도)."""
+    if usage is None:
+        return
+    for kind, histogram in (("prompt", metrics.LLM_PROMPT_TOKENS), ("completion", metrics.LLM_COMPLETION_TOKENS)):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens is None:
+            continue
+        histogram.observe(tokens)
+        if route:
+            metrics.LLM_ROUTE_TOKENS.inc(tokens, route=route, kind=kind)
+
+
+def _observe_request(started, mode, outcome, route):
+    elapsed = time.perf_counter() - started
+    metrics.LLM_REQUEST_SECONDS.observe(elapsed, mode=mode, outcome=outcome)
+    if route:
+        metrics.LLM_ROUTE_SECONDS.observe(elapsed, route=route, outcome=outcome)
+
+
+def _instrumented_stream(stream, started, route=None, limiter=None, estimated=0):
+    """
+    스트림을 끝까지 읽는 동안 진행 중 요청 수, 소요 시간, 토큰 사용량을 기록합니다.
+
+    마지막 조각의 토큰 사용량(stream_options.include_usage)으로 제한기의 추정치를
+    보정합니다. 사용량을 받기 전에 끊긴 스트림은 추정치만큼 사용한 것으로 남습니다.
+    """
+    outcome = "error"
+    try:
+        for event in stream:
+            usage = getattr(event, "usage", None)
+            record_usage(usage, route)
+            if limiter is not None and usage is not None and getattr(usage, "total_tokens", None):
+                limiter.record_usage(estimated, usage.total_tokens)
+            yield event
+        outcome = "ok"
+    finally:
+        metrics.LLM_REQUESTS_IN_FLIGHT.dec()
+        _observe_request(started, "stream", outcome, route)
+
+
+def create_chat_completion(deadline=None, route=None, **kwargs):
+    """
+    공용 클라이언트로 chat.completions.create를 호출합니다.
+
+    호출 전 요청/토큰 한도를 확보하고, 일시적인 오류는 지터가 적용된 지수 백오프로
+    Config.OPENAI_MAX_RETRIES회까지 재시도합니다. stream=True 요청은 스트림을 여는
+    단계까지만 재시도합니다. 요청 시간(재시도 대기 포함), 진행 중 요청 수, 토큰
+    사용량은 지표로 기록하고, 실제 사용량으로 토큰 한도의 추정치를 보정합니다
+    (스트림은 마지막 조각의 사용량으로).
+
+    reasoning_effort를 지정한 요청이 타임아웃되었거나 마감이 가까우면 재시도할 때
+    생성 깊이를 한 단계씩 낮춥니다 (high → medium → low).
+
+    Args:
+        deadline (float, optional): time.monotonic() 기준 마감 시각. 대기 후 마감을
+            넘기게 되면 재시도하지 않고 바로 오류를 발생시킵니다.
+        route (str, optional): 지표에 기록할 라우팅 경로 이름 (router.Route.name)
+        **kwargs: chat.completions.create에 전달할 인자
+
+    Returns:
+        ChatCompletion 또는 스트림 객체
+    """
+    client = get_client()
+    limiter = get_rate_limiter()
+    estimated = estimate_tokens(
+        kwargs.get("messages", []),
+        kwargs.get("max_completion_tokens") or kwargs.get("max_tokens")
+    )
+
+    stream = bool(kwargs.get("stream"))
+    if stream:
+        # 스트림 마지막 조각에 토큰 사용량을 포함하도록 요청
+        kwargs.setdefault("stream_options", {"include_usage": True})
+
+    started = time.perf_counter()
+    metrics.LLM_REQUESTS_IN_FLIGHT.inc()
+    attempt = 0
+    while True:
+        limiter.acquire(estimated)
+        try:
+            response = client.chat.completions.create(**kwargs)
+        except Exception as e:
+            retryable = is_retryable(e) and attempt < Config.OPENAI_MAX_RETRIES
+            delay = retry_delay(attempt, e) if retryable else 0
+            if not retryable or (deadline is not None and time.monotonic() + delay >= deadline):
+                metrics.LLM_REQUESTS_IN_FLIGHT.dec()
+                _observe_request(started, "stream" if stream else "blocking", "error", route)
+                raise
+            attempt += 1
+            metrics.LLM_RETRIES.inc()
+            logger.warning("OpenAI 일시 오류로 %.1f초 후 재시도 (%d/%d): %s", delay, attempt, Config.OPENAI_MAX_RETRIES, e)
+            lowered = lower_effort(kwargs.get("reasoning_effort"))
+            if lowered and _should_lower_effort(e, deadline, delay):
+                logger.info("제때 끝나도록 생성 깊이를 %s에서 %s(으)로 낮춰 재시도합니다.", kwargs['reasoning_effort'], lowered)
+                kwargs["reasoning_effort"] = lowered
+                metrics.LLM_EFFORT_FALLBACKS.inc(effort=lowered)
+            time.sleep(delay)
+            continue
+
+        if stream:
+            return _instrumented_stream(response, started, route, limiter, estimated)
+
+        metrics.LLM_REQUESTS_IN_FLIGHT.dec()
+        _observe_request(started, "blocking", "ok", route)
+        usage = getattr(response, "usage", None)
+        record_usage(usage, route)
+        if usage is not None and getattr(usage, "total_tokens", None):
+            limiter.record_usage(estimated, usage.total_tokens)
+        return response
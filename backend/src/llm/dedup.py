@@ -0,0 +1,379 @@
+import logging
+import re
+from src.utils.config import Config
+from src.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 순수 파이썬으로 계산 (정규화 결과는 같고 속도만 느림)
+    np = None
+
+# TID 끝의 번호를 분리하기 위한 패턴 (예: ITEM_001 → "ITEM", "_", "001")
+TID_PATTERN = re.compile(r"^(.*?)([_\-]?)(\d+)$")
+
+# 줄 앞의 단계 번호 ("1.", "2)", "3 -" 등) - 줄 앞에서 숫자·공백·구분 기호가 이어지는 부분
+STEP_NUMBER_PATTERN = re.compile(r"(?m)^[\d\s.)\-:]+")
+STEP_NUMBER_CHAR = re.compile(r"[\d\s.)\-:]")
+
+# 글자·숫자 이외의 문자 (공백, 문장 부호) - 띄어쓰기나 문장 부호만 다른 케이스를 같게 봄
+NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+# 유사도 비교에 사용하는 필드
+COMPARED_FIELDS = ("Test_Step", "Expected_Result")
+
+# 글자 n-gram 크기 (한글은 띄어쓰기를 없앤 3글자 조각이 표현 차이에 적당히 둔감함)
+SHINGLE_SIZE = 3
+
+# MinHash 서명 길이와 LSH 구간 수 (구간당 4개 → 유사도 약 0.6 이상이면 후보가 될 확률이 높음)
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+
+# 서명 일치율이 기준보다 이만큼 낮으면 실제 자카드 유사도를 계산하지 않음 (서명 추정 오차 여유)
+SIGNATURE_SLACK = 0.2
+
+_MASK64 = (1 << 64) - 1
+_BASE = 1000003
+
+# 순열마다 쓰는 (곱, 더하기) 상수 (곱은 홀수, 실행마다 같도록 고정 시드로 생성)
+_PERMUTATIONS = []
+_state = 0x9E3779B97F4A7C15
+for _ in range(NUM_PERM):
+    _state = (_state * 6364136223846793005 + 1442695040888963407) & _MASK64
+    _multiplier = _state | 1
+    _state = (_state * 6364136223846793005 + 1442695040888963407) & _MASK64
+    _PERMUTATIONS.append((_multiplier, _state))
+
+
+def normalize(text):
+    """단계 번호, 대소문자, 공백, 문장 부호 차이를 없앤 비교용 텍스트를 만듭니다."""
+    text = STEP_NUMBER_PATTERN.sub("", str(text or "")).lower()
+    return NON_WORD_PATTERN.sub("", text)
+
+
+def case_text(case):
+    """테스트 케이스에서 비교할 필드를 이어 붙여 정규화합니다."""
+    return normalize("\n".join(str(case.get(field) or "") for field in COMPARED_FIELDS))
+
+
+def _shingle_hashes(text):
+    """글자 n-gram마다 64비트 해시를 계산합니다 (짧은 텍스트는 전체를 하나의 조각으로)."""
+    codes = [ord(char) for char in text] or [0]
+    codes += [0] * (SHINGLE_SIZE - len(codes))
+    hashes = set()
+    for start in range(len(codes) - SHINGLE_SIZE + 1):
+        value = 0
+        for code in codes[start:start + SHINGLE_SIZE]:
+            value = (value * _BASE + code) & _MASK64
+        hashes.add(value)
+    return hashes
+
+
+def _signature(hashes):
+    """조각 해시 집합의 MinHash 서명 (순수 파이썬)"""
+    return tuple(
+        min(((multiplier * value + offset) & _MASK64) >> 32 for value in hashes)
+        for multiplier, offset in _PERMUTATIONS
+    )
+
+
+_tables = None
+
+
+def _char_flags(chars):
+    """글자별 (남길 글자 여부, 단계 번호 글자 여부) - normalize가 쓰는 정규식과 같은 판정"""
+    keep = np.fromiter((NON_WORD_PATTERN.fullmatch(char) is None for char in chars), dtype=bool, count=len(chars))
+    step = np.fromiter((STEP_NUMBER_CHAR.fullmatch(char) is not None for char in chars), dtype=bool, count=len(chars))
+    return keep, step
+
+
+def _char_tables():
+    """기본 다국어 평면 글자별 (남길 글자 여부, 단계 번호 글자 여부) 조회표"""
+    global _tables
+    if _tables is None:
+        _tables = _char_flags([chr(code) for code in range(0x10000)])
+    return _tables
+
+
+def _normalized_codes(test_cases):
+    """
+    모든 케이스의 비교용 텍스트(normalize와 같은 결과)를 하나의 코드 포인트 배열로 만듭니다.
+
+    케이스마다 줄바꿈을 붙이고 소문자로 바꿔 이어 붙인 뒤, 줄 앞 단계 번호와 글자·숫자
+    이외의 문자를 조회표로 한 번에 걸러내므로 케이스마다 정규식을 실행하지 않습니다.
+    소문자 변환은 str.lower로 케이스 전체에 하므로 여러 글자로 바뀌는 글자(İ)와 문맥에
+    따르는 글자(어말 Σ)도 normalize와 같습니다. 단계 번호 글자는 소문자 변환에 영향을
+    받지 않으므로 변환 뒤에 찾아도 결과가 같습니다. 보조 평면 글자는 종류가 적으므로
+    조회표 대신 나온 글자만 따로 판정합니다.
+
+    Returns:
+        tuple: (코드 포인트 배열, 케이스별 글자 수)
+    """
+    keep_table, step_table = _char_tables()
+    parts = [
+        ("\n".join(str(case.get(field) or "") for field in COMPARED_FIELDS) + "\n").lower()
+        for case in test_cases
+    ]
+    codes = np.frombuffer("".join(parts).encode("utf-32-le"), dtype=np.uint32)
+    # 케이스 경계 (케이스마다 붙인 마지막 줄바꿈 위치)
+    case_ends = np.cumsum(np.fromiter(map(len, parts), dtype=np.int64, count=len(parts))) - 1
+
+    bmp = np.minimum(codes, 0xFFFF)
+    is_keep = keep_table[bmp]
+    is_step = step_table[bmp]
+    wide = codes > 0xFFFF
+    if wide.any():
+        wide_codes, inverse = np.unique(codes[wide], return_inverse=True)
+        wide_keep, wide_step = _char_flags([chr(code) for code in wide_codes.tolist()])
+        is_keep[wide] = wide_keep[inverse]
+        is_step[wide] = wide_step[inverse]
+
+    # 줄 시작부터 단계 번호 글자만 이어진 구간을 찾음 (줄 안의 첫 다른 글자 이전)
+    positions = np.arange(len(codes))
+    line_start = np.maximum.accumulate(np.where(codes == ord("\n"), positions + 1, 0))
+    non_step = np.cumsum(~is_step)
+    before_line = np.where(line_start > 0, non_step[np.maximum(line_start - 1, 0)], 0)
+    leading = (non_step - before_line) == 0
+    keep = is_keep & ~leading
+
+    kept_before = np.concatenate(([0], np.cumsum(keep)))
+    lengths = kept_before[case_ends + 1] - kept_before[np.concatenate(([0], case_ends[:-1] + 1))]
+    return codes[keep].astype(np.uint64), lengths
+
+
+def _signatures_numpy(test_cases):
+    """
+    모든 케이스의 조각 해시와 MinHash 서명을 한 번에 계산합니다.
+
+    정규화한 코드 포인트 배열에서 n-gram 해시를 벡터 연산으로 만들고, 순열마다
+    케이스 구간별 최솟값(np.minimum.reduceat)을 구합니다.
+
+    Returns:
+        tuple: (서명 배열 [케이스 수 x NUM_PERM], 조각 해시 배열, 케이스별 조각 시작 위치)
+    """
+    codes, lengths = _normalized_codes(test_cases)
+
+    # 짧은 케이스는 0으로 채워 조각이 최소 하나는 생기도록 함 (_shingle_hashes와 같은 규칙)
+    padding = np.maximum(SHINGLE_SIZE - lengths, 0)
+    if padding.any():
+        ends = np.cumsum(lengths)
+        codes = np.insert(codes, np.repeat(ends, padding), 0)
+        lengths = lengths + padding
+
+    # 케이스 경계를 넘는 n-gram은 버림
+    count = len(codes) - SHINGLE_SIZE + 1
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    local = np.arange(len(codes)) - offsets[owner]
+    valid = (local <= (lengths - SHINGLE_SIZE)[owner])[:count]
+
+    hashes = np.zeros(count, dtype=np.uint64)
+    base = np.uint64(_BASE)
+    for shift in range(SHINGLE_SIZE):
+        hashes = hashes * base + codes[shift:count + shift]
+    hashes = hashes[valid]
+
+    starts = np.concatenate(([0], np.cumsum(lengths - SHINGLE_SIZE + 1)[:-1]))
+    signatures = np.empty((len(lengths), NUM_PERM), dtype=np.uint64)
+    shift = np.uint64(32)
+    for column, (multiplier, offset) in enumerate(_PERMUTATIONS):
+        values = (hashes * np.uint64(multiplier) + np.uint64(offset)) >> shift
+        signatures[:, column] = np.minimum.reduceat(values, starts)
+    return signatures, hashes, starts
+
+
+class DuplicateIndex:
+    """
+    MinHash/LSH로 거의 같은 테스트 케이스를 찾는 색인
+
+    대표 케이스(처음 나온 케이스)만 LSH 구간에 등록하고, 새 케이스는 같은 구간에 있는
+    대표들과만 실제 자카드 유사도를 비교하므로 케이스 수에 거의 선형으로 동작합니다.
+    스트리밍처럼 케이스가 하나씩 도착할 때도 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = Config.DEDUP_THRESHOLD if threshold is None else threshold
+        self._buckets = [{} for _ in range(BANDS)]
+        self._representatives = []  # (케이스, 조각 해시 집합)
+
+    def add(self, case, signature=None, hashes=None, keys=None):
+        """
+        케이스를 색인에 추가합니다.
+
+        Args:
+            case (dict): 테스트 케이스
+            signature (list, optional): 미리 계산한 MinHash 서명
+            hashes (optional): 미리 계산한 조각 해시 (집합 또는 정수 배열)
+            keys (list, optional): 미리 계산한 LSH 구간 키 (구간마다 하나)
+
+        Returns:
+            dict: 거의 같은 대표 케이스 (중복이 아니면 None이며 이 케이스가 대표가 됨)
+        """
+        if hashes is None:
+            hashes = _shingle_hashes(case_text(case))
+        if signature is None:
+            signature = _signature(hashes)
+        if keys is None:
+            keys = [tuple(signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+        entry = [case, signature, hashes]
+        minimum_agreement = (self.threshold - SIGNATURE_SLACK) * NUM_PERM
+        checked = set()
+        for band, key in enumerate(keys):
+            for index in self._buckets[band].get(key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                representative = self._representatives[index]
+                agreement = sum(1 for a, b in zip(signature, representative[1]) if a == b)
+                if agreement >= minimum_agreement and _jaccard(entry, representative) >= self.threshold:
+                    return representative[0]
+
+        index = len(self._representatives)
+        self._representatives.append(entry)
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(index)
+        return None
+
+
+def _jaccard(first, second):
+    """두 색인 항목의 조각 해시 자카드 유사도 (배열로 받은 해시는 처음 비교할 때 집합으로 바꿈)"""
+    for entry in (first, second):
+        if not isinstance(entry[2], set):
+            entry[2] = set(entry[2].tolist())
+    union = len(first[2] | second[2])
+    return len(first[2] & second[2]) / union if union else 1.0
+
+
+def find_duplicates(test_cases, threshold=None):
+    """
+    테스트 케이스마다 거의 같은 앞선 대표 케이스의 위치를 찾습니다.
+
+    numpy가 있으면 정규화와 서명 계산을 벡터 연산으로 한 번에 하고, 어떤 LSH 구간도
+    다른 케이스와 겹치지 않는 케이스(대부분)는 비교 없이 대표로 확정합니다.
+
+    Returns:
+        list: 케이스별 대표 케이스 위치 (중복이 아니면 None)
+    """
+    index = DuplicateIndex(threshold)
+    representatives = [None] * len(test_cases)
+    if not test_cases:
+        return representatives
+
+    if np is not None:
+        signatures, hashes, starts = _signatures_numpy(test_cases)
+        ends = np.append(starts[1:], len(hashes))
+        band_ids = np.empty((len(test_cases), BANDS), dtype=np.int64)
+        shared = np.zeros(len(test_cases), dtype=bool)
+        for band in range(BANDS):
+            # 구간의 서명 조각을 정수 식별자로 바꿔 같은 조각을 가진 케이스를 찾음
+            columns = np.ascontiguousarray(signatures[:, band * ROWS:(band + 1) * ROWS])
+            keys = columns.view(np.dtype((np.void, ROWS * columns.itemsize))).ravel()
+            _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            band_ids[:, band] = inverse.ravel()
+            shared |= counts[inverse.ravel()] > 1
+        candidates = np.flatnonzero(shared).tolist()
+        items = (
+            (position, signatures[position].tolist(), hashes[starts[position]:ends[position]],
+             band_ids[position].tolist())
+            for position in candidates
+        )
+    else:
+        items = (
+            (position, None, _shingle_hashes(case_text(case)), None)
+            for position, case in enumerate(test_cases)
+        )
+
+    positions = {}
+    for position, signature, case_hashes, keys in items:
+        case = test_cases[position]
+        representative = index.add(case, signature, case_hashes, keys)
+        if representative is None:
+            positions[id(case)] = position
+        else:
+            representatives[position] = positions[id(representative)]
+    return representatives
+
+
+class CategoryRenumberer:
+    """
+    대분류별로 TID 번호를 다시 매깁니다.
+
+    대분류마다 처음 본 케이스의 TID 접두어를 그 대분류의 접두어로 사용하고, 번호는
+    접두어별로 이어서 매기므로 여러 대분류가 같은 접두어를 써도 TID가 겹치지 않습니다.
+    """
+
+    def __init__(self):
+        self._prefixes = {}
+        self._counters = {}
+
+    def __call__(self, case):
+        category = str(case.get("대분류", "")).strip()
+        if category not in self._prefixes:
+            match = TID_PATTERN.match(str(case.get("TID", "")).strip())
+            if match and match.group(1):
+                self._prefixes[category] = (match.group(1), match.group(2), max(3, len(match.group(3))))
+            else:
+                self._prefixes[category] = ("TC", "", 3)
+        prefix, separator, width = self._prefixes[category]
+        key = (prefix, separator)
+        self._counters[key] = self._counters.get(key, 0) + 1
+        case["TID"] = f"{prefix}{separator}{self._counters[key]:0{width}d}"
+        return case
+
+
+def deduplicate(test_cases, mode=None, threshold=None):
+    """
+    거의 같은 테스트 케이스를 합치거나 표시하고, 대분류별로 TID를 다시 매깁니다.
+
+    Args:
+        test_cases (list): 테스트 케이스 목록 (케이스 dict는 제자리에서 수정됨)
+        mode (str, optional): "merge"(중복 제거), "flag"(Duplicate_Of 열에 대표 TID 표시),
+            "off"(그대로 반환). 기본값은 Config.DEDUP_MODE
+        threshold (float, optional): 중복으로 볼 자카드 유사도 (기본값 Config.DEDUP_THRESHOLD)
+
+    Returns:
+        list: 대분류 순서로 묶고 TID를 다시 매긴 테스트 케이스 목록
+    """
+    mode = mode or Config.DEDUP_MODE
+    if mode == "off" or not test_cases:
+        return test_cases
+
+    representatives = find_duplicates(test_cases, threshold)
+    duplicates = sum(1 for position in representatives if position is not None)
+
+    kept = []
+    for case, position in zip(test_cases, representatives):
+        if position is None:
+            kept.append(case)
+        elif mode == "merge":
+            _merge_into(test_cases[position], case)
+        else:
+            kept.append(case)
+
+    # 대분류가 처음 나온 순서대로 묶어 대분류 안에서 번호가 이어지도록 함
+    categories = {}
+    for case in kept:
+        categories.setdefault(str(case.get("대분류", "")).strip(), []).append(case)
+    renumber = CategoryRenumberer()
+    result = [renumber(case) for cases in categories.values() for case in cases]
+
+    if mode == "flag":
+        for case, position in zip(test_cases, representatives):
+            if position is not None:
+                case["Duplicate_Of"] = test_cases[position]["TID"]
+
+    if duplicates:
+        action = "merged" if mode == "merge" else "flagged"
+        metrics.DUPLICATE_CASES.inc(duplicates, action=action)
+        logger.info("거의 같은 테스트 케이스 %d개를 %s.", duplicates, "합쳤습니다" if mode == "merge" else "표시했습니다")
+    return result
+
+
+def _merge_into(representative, duplicate):
+    """대표 케이스에 비어 있는 필드를 중복 케이스의 값으로 채웁니다."""
+    for key, value in duplicate.items():
+        if key != "TID" and value and not representative.get(key):
+            representative[key] = value
@@ -1,3 +1,11 @@
+import logging
+import os
+import json
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
 def load_examples():
     """테스트 케이스 예시를 로드합니다."""
     # 간단한 예시 데이터 반환
@@ -20,4 +28,23 @@ def load_examples():
             "Test_Step": "1. 로그인 페이지 접속\n2. 유효한 이메일 입력\n3. 잘못된 비밀번호 입력\n4. 로그인 버튼 클릭",
             "Expected_Result": "1. 오류 메시지 표시: '이메일 또는 비밀번호가 잘못되었습니다'\n2. 로그인 페이지 유지됨"
         }
-    ] 
\ No newline at end of file
+    ]
+
+
+def load_example_library():
+    """
+    청크별 예시 선택에 사용할 예시 라이브러리를 로드합니다.
+
+    Config.EXAMPLE_LIBRARY_PATH의 JSON 배열을 읽고, 파일이 없거나 읽을 수 없으면
+    기본 예시(load_examples)를 사용합니다.
+    """
+    path = Config.EXAMPLE_LIBRARY_PATH
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                library = json.load(f)
+            if isinstance(library, list) and library:
+                return [example for example in library if isinstance(example, dict)]
+        except (OSError, ValueError) as e:
+            logger.warning("예시 라이브러리 로드 오류 (%s): %s", path, e)
+    return load_examples()
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from src.utils.config import Config
+from src.utils import metrics
+
+
+def fingerprint(**parts):
+    """프롬프트 구성 요소들을 정규화된 JSON으로 직렬화하여 SHA-256 키를 만듭니다."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """
+    LLM 테스트 케이스 생성 결과를 저장하는 SQLite 캐시
+
+    TTL이 지난 항목은 조회 시 무시되고 저장 시 정리되며, 항목 수가 상한을 넘으면
+    가장 오래 사용되지 않은 항목부터 삭제합니다. 적중/실패 횟수를 함께 집계합니다.
+    """
+
+    def __init__(self, db_path, ttl_seconds, max_entries):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS generation_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_generation_cache_accessed"
+                " ON generation_cache (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """트랜잭션을 커밋하고 연결을 닫는 SQLite 연결 컨텍스트"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """캐시된 테스트 케이스 목록을 반환합니다. 없거나 만료되었으면 None."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM generation_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                metrics.CACHE_LOOKUPS.inc(cache="generation", result="miss")
+                return None
+            conn.execute("UPDATE generation_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        metrics.CACHE_LOOKUPS.inc(cache="generation", result="hit")
+        return json.loads(row[0])
+
+    def put(self, key, test_cases):
+        """생성 결과를 저장하고 만료/초과 항목을 정리합니다."""
+        now = time.time()
+        value = json.dumps(test_cases, ensure_ascii=False)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO generation_cache (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            conn.execute("DELETE FROM generation_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM generation_cache WHERE key NOT IN ("
+                " SELECT key FROM generation_cache ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    def invalidate(self, key=None):
+        """지정한 항목(또는 key가 없으면 전체)을 삭제하고 삭제된 개수를 반환합니다."""
+        with self._lock, self._connect() as conn:
+            if key is None:
+                cursor = conn.execute("DELETE FROM generation_cache")
+            else:
+                cursor = conn.execute("DELETE FROM generation_cache WHERE key = ?", (key,))
+            return cursor.rowcount
+
+    def stats(self):
+        """캐시 적중률 등 집계 정보를 반환합니다."""
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """설정값으로 생성한 공용 생성 캐시를 반환합니다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GenerationCache(
+                    Config.GENERATION_CACHE_PATH,
+                    Config.GENERATION_CACHE_TTL_HOURS * 3600,
+                    Config.GENERATION_CACHE_MAX_ENTRIES
+                )
+    return _cache
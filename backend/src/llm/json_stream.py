@@ -0,0 +1,111 @@
+import json
+
+
+class TestCaseStreamParser:
+    """
+    스트리밍으로 도착하는 JSON 텍스트에서 테스트 케이스 객체를 점진적으로 꺼내는 파서
+
+    응답에서 처음 열리는 배열을 테스트 케이스 목록으로 간주하고, 그 배열의 원소인
+    객체가 닫힐 때마다 파싱하여 반환합니다. 배열 앞의 설명 문구나 ```json 펜스,
+    {"test_cases": [...]} 형태의 래퍼 객체는 자연스럽게 건너뜁니다.
+    """
+
+    __test__ = False  # 이름이 Test로 시작해도 pytest가 테스트 클래스로 수집하지 않도록 함
+
+    def __init__(self):
+        self.complete = False       # 테스트 케이스 배열이 닫혔는지 여부
+        self._depth = 0
+        self._array_depth = None    # 테스트 케이스 배열이 열린 깊이
+        self._in_string = False
+        self._escape = False
+        self._parts = None          # 수집 중인 객체의 조각 (수집 중이 아니면 None)
+
+    @property
+    def started(self):
+        """테스트 케이스 배열이 열렸는지 여부"""
+        return self._array_depth is not None
+
+    def feed(self, text):
+        """
+        텍스트 조각을 입력하고, 이번 조각에서 완성된 객체 목록을 반환합니다.
+
+        Args:
+            text (str): 모델 응답의 다음 조각
+
+        Returns:
+            list: 새로 완성된 테스트 케이스(dict) 목록
+        """
+        completed = []
+        if not text or self.complete:
+            return completed
+
+        start = 0 if self._parts is not None else None
+        for index, char in enumerate(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char == '[' or char == '{':
+                self._depth += 1
+                if char == '[' and self._array_depth is None:
+                    self._array_depth = self._depth
+                elif (char == '{' and self._parts is None and self._array_depth is not None
+                        and self._depth == self._array_depth + 1):
+                    self._parts = []
+                    start = index
+            elif char == ']' or char == '}':
+                if char == '}' and self._parts is not None and self._depth == self._array_depth + 1:
+                    self._parts.append(text[start:index + 1])
+                    obj = self._decode(''.join(self._parts))
+                    if obj is not None:
+                        completed.append(obj)
+                    self._parts = None
+                    start = None
+                elif char == ']' and self._depth == self._array_depth:
+                    self.complete = True
+                    self._depth -= 1
+                    return completed
+                self._depth -= 1
+
+        if self._parts is not None and start is not None:
+            self._parts.append(text[start:])
+        return completed
+
+    @staticmethod
+    def _decode(raw):
+        try:
+            obj = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return obj if isinstance(obj, dict) else None
+
+
+def salvage_test_cases(text):
+    """
+    잘리거나 설명 문구·펜스가 섞인 응답에서 완성된 테스트 케이스 객체를 모두 건져냅니다.
+
+    응답을 한 번만 순회하므로 큰 응답에서도 정규식 역추적이 없으며, 배열이 중간에
+    끊겼더라도 끊기기 전까지 닫힌 객체는 모두 반환합니다.
+
+    Args:
+        text (str): 모델 응답 텍스트
+
+    Returns:
+        tuple: (테스트 케이스 목록, 배열이 끝까지 닫혔는지 여부)
+
+    Raises:
+        ValueError: 응답에 JSON 배열이 없는 경우
+    """
+    parser = TestCaseStreamParser()
+    cases = parser.feed(text)
+    if not parser.started:
+        raise ValueError("응답에서 JSON 배열을 찾을 수 없습니다")
+    return cases, parser.complete
+
@@ -1,136 +1,781 @@
+import logging
 import os
 import json
+import hashlib
+import queue
+import time
 import openai
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from src.utils.config import Config  # Config 클래스 임포트
+from src.utils import metrics
+from src.llm import chunker, client, dedup, generation_cache, prompt_builder, router, schema, section_store, single_flight
+from src.llm.dedup import TID_PATTERN
+from src.llm.json_stream import TestCaseStreamParser, salvage_test_cases
+
+logger = logging.getLogger(__name__)
 
 # .env 파일에서 환경 변수 로드 및 API 키 설정
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-def generate_test_cases(document_text, examples):
+# 시스템 프롬프트: 테스트 케이스를 풍부하게 생성하도록 지시
+#     - 다양한 범주의 테스트(기본 시나리오, 예외 케이스, 경계값, 상태 전이 등)를 반드시 포함
+#     - 예시 구조를 참고하여 JSON 형식으로만 반환하도록 강력하게 요구
+SYSTEM_PROMPT = (
+    "당신은 게임 10년 이상의 경력을 가진 게임 QA 시니어입니다.\n"
+    "아래에 주어진 게임 기획서 내용을 꼼꼼히 분석하여, 가능한 한 풍부한 테스트 케이스를 생성해 주세요.\n"
+    "테스트 케이스 작성 시 다음 사항을 반드시 포함해야 합니다:\n"
+    "  1) 정상 시나리오(정상적인 흐름)\n"
+    "  2) 예외/에러 상황(비정상 흐름)\n"
+    "  3) 경계값/엣지 케이스\n"
+    "  4) 상태 전이(특정 상태에서 다른 상태로 넘어가는 흐름, 유효 전이/무효 전이 모두 고려)\n"
+    "  5) 기능별 제약사항 및 제한사항 검증\n\n"
+    "테스트 케이스를 최대한 상세하게, 그리고 많은 개수를 생성해 주십시오.\n"
+    "형식은 JSON 배열(list)로만 작성하고, 예시는 아래와 같은 필드를 가져야 합니다:\n"
+    "  - TID: 테스트 ID (예: ITEM_001, CHAR_001 등 식별이 용이하도록)\n"
+    "  - 대분류: 테스트 대분류 (NPC, 캐릭터, 아이템 등)\n"
+    "  - 중분류: 테스트 중분류\n"
+    "  - 소분류: 테스트 소분류\n"
+    "  - Precondition: 사전 조건(캐릭터 레벨, 게임 환경 등)\n"
+    "  - Test_Step: 테스트 실행 단계 혹은 절차\n"
+    "  - Expected_Result: 기대 결과\n"
+    "  - Result: (빈 문자열로)\n"
+    "  - BTS_Key: (빈 문자열로)\n"
+    "  - Comment: (빈 문자열로)\n\n"
+    "절대 JSON 형식 외의 불필요한 문구나 해설을 포함하지 말고,\n"
+    "정확한 JSON 배열로만 결과를 응답하세요."
+)
+
+# 응답이 max_completion_tokens에서 잘렸을 때 나머지를 이어서 요청하는 최대 횟수
+MAX_CONTINUATIONS = 2
+
+# 잘린 응답 뒤에 보내는 이어쓰기 요청 (이미 받은 케이스는 assistant 메시지로 전달)
+CONTINUATION_PROMPT = (
+    "응답이 길이 제한으로 중간에 끊겼습니다. 위 배열의 테스트 케이스는 이미 받았습니다.\n"
+    "이미 받은 케이스와 중복되지 않게, 그 다음 테스트 케이스부터 나머지만 새 JSON 배열로 응답하세요.\n"
+    "더 생성할 케이스가 없으면 빈 배열 []로 응답하세요."
+)
+
+
+def build_user_prompt(document_text, examples, part=None):
+    """
+    유저 프롬프트(실제 기획서 및 예시 정보)를 구성합니다.
+
+    예시 라이브러리에서 이 청크와 어휘가 많이 겹치는 예시만 골라 열 기반 JSON으로
+    압축해 넣고, 기획서는 모델 문맥 길이에서 응답 예약분과 나머지 프롬프트를 뺀
+    토큰 수에 맞춥니다.
+
+    Args:
+        document_text (str): 기획서 텍스트 (또는 그 일부)
+        examples (list): 테스트 케이스 예시 라이브러리
+        part (tuple, optional): (현재 청크 번호, 전체 청크 수)
+    """
+    part_notice = ""
+    if part and part[1] > 1:
+        part_notice = (
+            f"\n※ 아래 내용은 전체 기획서를 {part[1]}개로 나눈 것 중 {part[0]}번째 부분입니다. "
+            "이 부분에 해당하는 테스트 케이스만 생성하세요.\n"
+        )
+    selected = prompt_builder.select_examples(
+        document_text,
+        examples,
+        Config.PROMPT_MAX_EXAMPLES,
+        Config.PROMPT_EXAMPLE_TOKENS
+    )
+    prompt = f"""
+다음은 테스트 케이스 예시입니다 (columns는 필드 이름, rows는 예시별 값):
+{prompt_builder.compact_examples(selected)}
+
+아래 기획서 내용에 대해 위 예시의 필드를 가진 객체로, 가능한 한 많은 테스트 케이스를 생성해주세요.
+{part_notice}
+기획서 내용:
+"""
+    budget = prompt_builder.document_budget(SYSTEM_PROMPT, prompt + "\n")
+    document_text, truncated = prompt_builder.fit_to_tokens(document_text, budget)
+    if truncated:
+        logger.warning("기획서 조각이 문맥 길이를 넘어 앞부분 %d토큰만 포함합니다. LLM_CHUNK_CHARS를 줄이세요.", budget)
+    return f"{prompt}{document_text}\n"
+
+
+def _is_valid_api_key(api_key):
+    return bool(api_key) and api_key not in ["your_api_key_here", "sk-actual_api_key_goes_here", "sk-your_actual_api_key_here"]
+
+
+def response_format():
+    """구조화 출력을 켜면 테스트 케이스 JSON 스키마를, 끄면 None을 반환합니다."""
+    return schema.RESPONSE_FORMAT if Config.LLM_STRUCTURED_OUTPUT else None
+
+
+def cache_key(document_text, examples):
+    """모델 라우팅 설정, 프롬프트, 예시, 문서 텍스트로 생성 캐시 키를 만듭니다."""
+    return generation_cache.fingerprint(
+        routing=router.signature(),
+        response_format=response_format(),
+        system_prompt=SYSTEM_PROMPT,
+        chunk_chars=Config.LLM_CHUNK_CHARS,
+        examples=examples,
+        document_text=document_text
+    )
+
+
+def flight_key(mode, document_text, examples, document_id=None, use_cache=True, refresh=False):
+    """
+    진행 중인 생성을 찾는 키를 만듭니다.
+
+    생성 캐시 키에 문서 식별자(섹션 재사용 여부가 달라짐)와 캐시 사용·새로 생성 여부를
+    더하므로, 캐시나 이전 판 결과를 건너뛰라는 요청이 캐시를 쓰는 생성에 붙지 않습니다.
+    일반 생성과 스트림은 결과 순서가 다르므로 서로 합치지 않습니다.
+    """
+    return (mode, cache_key(document_text, examples), document_id, bool(use_cache), bool(refresh))
+
+
+def section_fingerprints(chunks, examples):
+    """
+    청크(섹션 묶음)별 지문을 계산합니다.
+
+    공백 차이는 무시하며, 모델·프롬프트·예시가 바뀌면 모든 지문이 달라지므로
+    이전 판의 결과를 재사용하지 않습니다.
+    """
+    prompt = generation_cache.fingerprint(
+        routing=router.signature(),
+        response_format=response_format(),
+        system_prompt=SYSTEM_PROMPT,
+        examples=examples
+    )
+    return [generation_cache.fingerprint(prompt=prompt, text=chunker.normalize(chunk)) for chunk in chunks]
+
+
+def route_models(chunks):
+    """
+    청크마다 고르는 경로(router.choose)의 모델 이름 집합을 반환합니다.
+
+    생성 캐시·이전 판에서 가져온 결과나 진행 중인 생성에 합쳐진 요청처럼 이번에 모델을
+    호출하지 않은 결과의 생성 모델로 씁니다. 캐시 키와 섹션 지문에 라우팅 설정이 들어가므로
+    같은 청크는 같은 경로로 생성된 결과입니다 (빠른 모델에서 올려 보낸 경우는 제외).
+    """
+    return {router.choose(chunk).model for chunk in chunks}
+
+
+def _note_route_models(models, document_text, document_id=None):
+    """합쳐진 요청처럼 모델 이름을 모으지 못한 경우 문서 청크의 경로 모델로 채웁니다."""
+    if models is not None and not models:
+        models.update(route_models(document_chunks(document_text, document_id)))
+
+
+def document_chunks(document_text, document_id=None):
+    """
+    문서를 청크로 나눕니다.
+
+    개정판을 추적하는 문서(document_id)만 내용 기반 경계에서도 끊어, 섹션이 바뀌어도 먼
+    청크의 구성이 유지되도록 합니다. 그 밖의 문서는 청크(LLM 호출) 수가 가장 적게 묶습니다.
+    """
+    return chunker.chunk_text(document_text, Config.LLM_CHUNK_CHARS, stable_boundaries=bool(document_id))
+
+
+def reuse_sections(document_id, fingerprints, refresh=False):
+    """
+    이전 판에서 지문이 같은 섹션의 테스트 케이스를 찾습니다.
+
+    Args:
+        document_id (str): 문서 식별자 (None이면 재사용하지 않음)
+        fingerprints (list): 현재 판의 청크별 지문
+        refresh (bool): True이면 이전 판을 무시하고 전부 다시 생성
+
+    Returns:
+        dict: 청크 번호 → 재사용할 테스트 케이스 목록
+    """
+    if not document_id or refresh:
+        return {}
+    previous = section_store.get_store().load(document_id)
+    if not previous:
+        return {}
+
+    reused = {index: previous[fp] for index, fp in enumerate(fingerprints) if fp in previous}
+    logger.info(
+        "문서 '%s' 개정판: 섹션 %d개 중 %d개 재사용, %d개 새로 생성",
+        document_id, len(fingerprints), len(reused), len(fingerprints) - len(reused)
+    )
+    return reused
+
+
+def save_sections(document_id, document_text, fingerprints, chunk_results):
+    """
+    청크별 생성 결과를 문서의 현재 판으로 저장합니다.
+
+    판은 문서 이름과 추출 텍스트의 SHA-256으로 구분하므로 이름이 같은 다른 문서의 기록을
+    덮어쓰지 않습니다. 실패한 청크는 저장하지 않으므로 다음 판에서 다시 생성됩니다.
+    TID를 다시 매기기 전에 호출해야 청크 원래의 결과가 저장됩니다.
+    """
+    if not document_id:
+        return
+    sections = [
+        (fingerprint, cases)
+        for fingerprint, cases in zip(fingerprints, chunk_results)
+        if cases is not None
+    ]
+    if sections:  # 모두 실패했으면 이전 판 기록을 그대로 둠
+        document_hash = hashlib.sha256(document_text.encode('utf-8')).hexdigest()
+        section_store.get_store().save(document_id, document_hash, sections)
+
+
+def generate_test_cases(document_text, examples, use_cache=True, refresh=False, document_id=None, models=None):
     """
-    OpenAI의 o3-mini (reasoning model)을 사용하여 문서 텍스트에서 테스트 케이스를 생성합니다.
-    
+    OpenAI 모델로 문서 텍스트에서 테스트 케이스를 생성합니다.
+
+    긴 기획서는 헤딩/페이지 단위 청크로 나누어 동시에 요청하고(동시 요청 수는
+    Config.LLM_MAX_CONCURRENCY로 제한), 청크마다 난이도에 따라 빠른 모델 또는 추론
+    모델로 보냅니다(router.choose). 결과를 하나의 목록으로 합친 뒤 거의 같은 케이스를
+    정리하고(Config.DEDUP_MODE) 대분류별로 TID를 다시 매깁니다. 동일한 프롬프트 지문의 결과는 생성 캐시에서 바로 반환합니다.
+
+    document_id를 지정하면 청크별 지문과 결과를 문서 단위로 저장해 두고, 같은 문서의
+    개정판에서는 추가·변경된 청크만 LLM으로 생성하고 나머지는 이전 결과를 재사용합니다.
+
+    같은 문서·예시로 이미 진행 중인 생성이 있으면(Config.COALESCE_REQUESTS) LLM을 다시
+    호출하지 않고 그 결과를 함께 받습니다.
+
     Args:
         document_text (str): 기획서에서 추출한 텍스트
         examples (list): 테스트 케이스 예시 목록
-        
+        use_cache (bool): False이면 캐시를 조회하거나 저장하지 않음
+        refresh (bool): True이면 기존 캐시 항목과 이전 판 결과를 무시하고 다시 생성
+        document_id (str, optional): 개정판을 식별할 문서 식별자 (예: 업로드 파일 이름)
+        models (set, optional): 결과를 만든 모델 이름을 모을 집합 (라우팅으로 청크마다
+            모델이 다르므로 실행 기록에 남길 때 사용)
+
     Returns:
         list: 생성된 테스트 케이스 목록
     """
+    def generate():
+        return _generate_test_cases(document_text, examples, use_cache, refresh, document_id, models)
+
+    if not Config.COALESCE_REQUESTS or not _is_valid_api_key(openai.api_key):
+        return generate()
+    key = flight_key("generate", document_text, examples, document_id, use_cache, refresh)
+    test_cases = single_flight.get_group().do(key, generate)
+    _note_route_models(models, document_text, document_id)
+    return test_cases
+
+
+def _generate_test_cases(document_text, examples, use_cache, refresh, document_id, models=None):
+    """generate_test_cases의 실제 생성 과정 (요청 합치기 없이)."""
     # API 키 확인
-    if not openai.api_key or openai.api_key in ["your_api_key_here", "sk-actual_api_key_goes_here", "sk-your_actual_api_key_here"]:
-        print("경고: 유효한 OpenAI API 키가 설정되지 않았습니다. 테스트 데이터를 반환합니다.")
-        return generate_test_data()
-    
-    # (1) 시스템 프롬프트를 더욱 강화하여, 테스트 케이스를 풍부하게 생성하도록 지시
-    #     - 다양한 범주의 테스트(기본 시나리오, 예외 케이스, 경계값, 상태 전이 등)를 반드시 포함
-    #     - 예시 구조를 참고하여 JSON 형식으로만 반환하도록 강력하게 요구
-    system_prompt = (
-        "당신은 게임 10년 이상의 경력을 가진 게임 QA 시니어입니다.\n"
-        "아래에 주어진 게임 기획서 내용을 꼼꼼히 분석하여, 가능한 한 풍부한 테스트 케이스를 생성해 주세요.\n"
-        "테스트 케이스 작성 시 다음 사항을 반드시 포함해야 합니다:\n"
-        "  1) 정상 시나리오(정상적인 흐름)\n"
-        "  2) 예외/에러 상황(비정상 흐름)\n"
-        "  3) 경계값/엣지 케이스\n"
-        "  4) 상태 전이(특정 상태에서 다른 상태로 넘어가는 흐름, 유효 전이/무효 전이 모두 고려)\n"
-        "  5) 기능별 제약사항 및 제한사항 검증\n\n"
-        "테스트 케이스를 최대한 상세하게, 그리고 많은 개수를 생성해 주십시오.\n"
-        "형식은 JSON 배열(list)로만 작성하고, 예시는 아래와 같은 필드를 가져야 합니다:\n"
-        "  - TID: 테스트 ID (예: ITEM_001, CHAR_001 등 식별이 용이하도록)\n"
-        "  - 대분류: 테스트 대분류 (NPC, 캐릭터, 아이템 등)\n"
-        "  - 중분류: 테스트 중분류\n"
-        "  - 소분류: 테스트 소분류\n"
-        "  - Precondition: 사전 조건(캐릭터 레벨, 게임 환경 등)\n"
-        "  - Test_Step: 테스트 실행 단계 혹은 절차\n"
-        "  - Expected_Result: 기대 결과\n"
-        "  - Result: (빈 문자열로)\n"
-        "  - BTS_Key: (빈 문자열로)\n"
-        "  - Comment: (빈 문자열로)\n\n"
-        "절대 JSON 형식 외의 불필요한 문구나 해설을 포함하지 말고,\n"
-        "정확한 JSON 배열로만 결과를 응답하세요."
-    )
+    if not _is_valid_api_key(openai.api_key):
+        logger.warning("유효한 OpenAI API 키가 설정되지 않았습니다. 테스트 데이터를 반환합니다.")
+        return _fallback_test_data()
 
-    # (2) 유저 프롬프트(실제 기획서 및 예시 정보 전달)
-    user_prompt = f"""
-다음은 테스트 케이스 예시입니다:
-{json.dumps(examples, ensure_ascii=False, indent=2)}
+    cache = generation_cache.get_cache() if use_cache else None
+    key = cache_key(document_text, examples) if cache else None
+    if cache and refresh:
+        cache.invalidate(key)
+    elif cache:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("생성 캐시 적중: %s", key[:12])
+            metrics.GENERATIONS.inc(source="cache")
+            _note_route_models(models, document_text, document_id)
+            return cached
 
-아래 기획서 내용에 대해 위 예시와 같은 구조로, 가능한 한 많은 테스트 케이스를 생성해주세요.
+    chunks = document_chunks(document_text, document_id)
+    if not chunks:
+        return _fallback_test_data()
 
-기획서 내용:
-{document_text}
-"""
+    total = len(chunks)
+    fingerprints = section_fingerprints(chunks, examples) if document_id else []
+    reused = reuse_sections(document_id, fingerprints, refresh)
+    pending = [index for index in range(total) if index not in reused]
+    if models is not None:
+        models.update(route_models([chunks[index] for index in reused]))
 
-    try:
-        # (3) ChatCompletion API를 호출하되, o3-mini (reasoning model) 사용 및
-        #     reasoning_effort 파라미터를 medium 혹은 high로 설정.
-        #     max_completion_tokens를 크게 잡아 테스트케이스가 잘리지 않도록 함.
-        try:
-            print(f"API 호출 시작: 모델 = {Config.OPENAI_MODEL}")
-            response = openai.chat.completions.create(
-                model=Config.OPENAI_MODEL,         # o3-mini (reasoning model)이라고 가정
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_completion_tokens=8000,  # 충분한 응답 길이를 확보
-                reasoning_effort="medium"    # 생성 깊이: "low", "medium", "high" 중 선택
-            )
-            print("API 호출 성공!")
-        except (AttributeError, TypeError) as e:
-            # 이전 버전 API 호환성 처리 (필요한 경우에만)
-            print(f"새 API 인터페이스 오류, 이전 버전으로 시도: {e}")
-            response = openai.ChatCompletion.create(
-                model=Config.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=4000
-            )
-        
-        # (4) 응답 텍스트 추출
+    chunk_results = [reused.get(index) for index in range(total)]
+    if pending:
+        generated = generate_chunks(
+            [chunks[index] for index in pending],
+            examples,
+            parts=[(index + 1, total) for index in pending],
+            models=models
+        )
+        for index, result in zip(pending, generated):
+            chunk_results[index] = result
+    save_sections(document_id, document_text, fingerprints, chunk_results)
+
+    if all(result is None for result in chunk_results):
+        return _fallback_test_data()
+    test_cases = chunk_results[0] if len(chunk_results) == 1 else merge_test_cases(chunk_results)
+    test_cases = dedup.deduplicate(test_cases)
+
+    # 일부 청크가 실패한 불완전한 결과는 캐시하지 않음
+    if cache and all(result is not None for result in chunk_results):
+        cache.put(key, test_cases)
+    metrics.GENERATIONS.inc(source="llm")
+    return test_cases
+
+
+def generate_chunks(chunks, examples, parts=None, models=None):
+    """
+    청크별 테스트 케이스 생성을 제한된 동시성으로 병렬 실행합니다.
+
+    전체 소요 시간은 청크 시간의 합이 아니라 가장 느린 청크(배치)에 의해 결정됩니다.
+
+    Args:
+        chunks (list): 청크 텍스트 목록
+        examples (list): 테스트 케이스 예시 목록
+        parts (list, optional): 청크별 (청크 번호, 전체 청크 수). 문서의 일부 청크만
+            생성할 때 원래 위치를 프롬프트에 알리기 위해 사용
+        models (set, optional): 케이스를 만든 모델 이름을 모을 집합
+
+    Returns:
+        list: 청크 순서대로 정렬된 결과 목록 (실패한 청크는 None)
+    """
+    total = len(chunks)
+    if parts is None:
+        parts = [(index + 1, total) for index in range(total)]
+
+    def run(index):
         try:
-            response_text = response.choices[0].message.content.strip()
-        except AttributeError:
-            response_text = response.choices[0].message['content'].strip()
-        
-        # (5) JSON 파싱 시도
+            return _generate_chunk(chunks[index], examples, part=parts[index], models=models)
+        except Exception as e:
+            logger.warning("청크 %d/%d 생성 실패: %s", parts[index][0], parts[index][1], e)
+            return None
+
+    if total == 1:
+        return [run(0)]
+
+    workers = max(1, min(Config.LLM_MAX_CONCURRENCY, total))
+    logger.info("%d개 청크를 생성합니다 (동시 요청 %d개)", total, workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, range(total)))
+
+
+class TidRenumberer:
+    """여러 청크의 테스트 케이스에 TID 접두어별로 연속된 번호를 다시 매깁니다."""
+
+    def __init__(self):
+        self._counters = {}
+
+    def __call__(self, case):
+        match = TID_PATTERN.match(str(case.get("TID", "")).strip())
+        if match and match.group(1):
+            prefix, separator, width = match.group(1), match.group(2), max(3, len(match.group(3)))
+        else:
+            prefix, separator, width = "TC", "", 3
+        key = (prefix, separator)
+        self._counters[key] = self._counters.get(key, 0) + 1
+        case["TID"] = f"{prefix}{separator}{self._counters[key]:0{width}d}"
+        return case
+
+
+def merge_test_cases(chunk_results):
+    """
+    청크별 결과를 합치고 TID 접두어별로 번호를 다시 매깁니다.
+
+    Args:
+        chunk_results (list): 청크별 테스트 케이스 목록 (None은 건너뜀)
+
+    Returns:
+        list: 중복 없는 TID를 가진 하나의 테스트 케이스 목록
+    """
+    renumber = TidRenumberer()
+    return [
+        renumber(case)
+        for cases in chunk_results
+        for case in cases or []
+        if isinstance(case, dict)
+    ]
+
+
+def stream_test_cases(document_text, examples, use_cache=True, refresh=False, document_id=None, models=None):
+    """
+    모델이 생성하는 즉시 테스트 케이스를 하나씩 반환하는 제너레이터입니다.
+
+    OpenAI 스트리밍 응답을 조각 단위로 읽어, JSON 배열 안의 객체가 닫힐 때마다
+    바로 내보냅니다. 여러 청크는 병렬로 스트리밍되며 도착 순서대로 거의 같은 케이스를
+    걸러내고(Config.DEDUP_MODE) TID를 매깁니다.
+    generate_test_cases와 같은 생성 캐시와 문서별 섹션 저장소를 사용하며,
+    이전 판에서 재사용하는 케이스를 먼저 내보냅니다.
+
+    같은 문서·예시로 이미 진행 중인 스트림이 있으면(Config.COALESCE_REQUESTS) 그 스트림에
+    붙어 지금까지 나온 케이스를 먼저 받고, 이후 케이스는 도착하는 대로 받습니다.
+
+    Args:
+        document_text (str): 기획서에서 추출한 텍스트
+        examples (list): 테스트 케이스 예시 목록
+        use_cache (bool): False이면 캐시를 조회하거나 저장하지 않음
+        refresh (bool): True이면 기존 캐시 항목과 이전 판 결과를 무시하고 다시 생성
+        document_id (str, optional): 개정판을 식별할 문서 식별자 (예: 업로드 파일 이름)
+        models (set, optional): 결과를 만든 모델 이름을 모을 집합 (스트림이 끝나면 채워짐)
+
+    Yields:
+        dict: 완성된 테스트 케이스
+    """
+    def generate():
+        return _stream_test_cases(document_text, examples, use_cache, refresh, document_id, models)
+
+    if not Config.COALESCE_REQUESTS or not _is_valid_api_key(openai.api_key):
+        return generate()
+    key = flight_key("stream", document_text, examples, document_id, use_cache, refresh)
+    return _subscribed(single_flight.get_group().stream(key, generate), models, document_text, document_id)
+
+
+def _subscribed(stream, models, document_text, document_id):
+    """합쳐진 스트림을 끝까지 받은 뒤 모으지 못한 모델 이름을 채웁니다."""
+    yield from stream
+    _note_route_models(models, document_text, document_id)
+
+
+def _stream_test_cases(document_text, examples, use_cache, refresh, document_id, models=None):
+    """stream_test_cases의 실제 생성 과정 (요청 합치기 없이)."""
+    if not _is_valid_api_key(openai.api_key):
+        logger.warning("유효한 OpenAI API 키가 설정되지 않았습니다. 테스트 데이터를 반환합니다.")
+        yield from _fallback_test_data()
+        return
+
+    cache = generation_cache.get_cache() if use_cache else None
+    key = cache_key(document_text, examples) if cache else None
+    if cache and refresh:
+        cache.invalidate(key)
+    elif cache:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("생성 캐시 적중: %s", key[:12])
+            metrics.GENERATIONS.inc(source="cache")
+            _note_route_models(models, document_text, document_id)
+            yield from cached
+            return
+
+    chunks = document_chunks(document_text, document_id)
+    if not chunks:
+        yield from _fallback_test_data()
+        return
+
+    total = len(chunks)
+    fingerprints = section_fingerprints(chunks, examples) if document_id else []
+    reused = reuse_sections(document_id, fingerprints, refresh)
+    pending = [index for index in range(total) if index not in reused]
+    if models is not None:
+        models.update(route_models([chunks[index] for index in reused]))
+
+    # 청크별 원래 결과 (섹션 저장소에 저장하기 위해 TID를 다시 매기기 전 사본을 보관)
+    chunk_results = [reused.get(index) for index in range(total)]
+    events = queue.Queue()
+
+    def run(index):
         try:
-            test_cases = json.loads(response_text)
-        except json.JSONDecodeError:
-            # JSON 형식 추출 실패 시 예외 처리
-            import re
-            json_pattern = r'(\[[\s\S]*\])'  # 배열 형태의 JSON 추출
-            json_matches = re.findall(json_pattern, response_text)
-
-            if json_matches:
-                try:
-                    test_cases = json.loads(json_matches[0])
-                except json.JSONDecodeError as e:
-                    print(f"JSON 파싱 오류: {e}")
-                    print(f"추출된 JSON 문자열: {json_matches[0]}")
-                    return generate_test_data()
+            for case in _stream_chunk(chunks[index], examples, part=(index + 1, total), models=models):
+                events.put(('case', index, case))
+            events.put(('done', index, None))
+        except Exception as e:
+            logger.warning("청크 %d/%d 스트리밍 실패: %s", index + 1, total, e)
+            events.put(('failed', index, None))
+
+    # 이미 내보낸 케이스의 순서는 바꿀 수 없으므로 대분류별로 묶지 않고 도착 순서대로 번호를 매김
+    duplicates = dedup.DuplicateIndex() if Config.DEDUP_MODE != "off" else None
+    renumber = dedup.CategoryRenumberer() if duplicates else (TidRenumberer() if total > 1 else None)
+
+    def accept(case):
+        """내보낼 케이스면 TID를 매겨 반환하고, 합쳐서 버릴 중복이면 None을 반환합니다."""
+        representative = duplicates.add(case) if duplicates else None
+        if representative is not None and Config.DEDUP_MODE == "merge":
+            metrics.DUPLICATE_CASES.inc(action="merged")
+            return None
+        if renumber:
+            renumber(case)
+        if representative is not None:
+            metrics.DUPLICATE_CASES.inc(action="flagged")
+            case["Duplicate_Of"] = representative["TID"]
+        return case
+
+    collected = []
+    for index in sorted(reused):
+        for case in reused[index]:
+            case = accept(dict(case))
+            if case is not None:
+                collected.append(case)
+                yield case
+
+    streamed = {index: [] for index in pending}
+    finished = failed = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, min(Config.LLM_MAX_CONCURRENCY, len(pending))))
+    try:
+        for index in pending:
+            executor.submit(run, index)
+        while finished < len(pending):
+            kind, index, case = events.get()
+            if kind == 'case':
+                streamed[index].append(dict(case))
+                case = accept(case)
+                if case is not None:
+                    collected.append(case)
+                    yield case
             else:
-                print(f"원본 응답: {response_text}")
-                return generate_test_data()
-        
-        # (6) 테스트 케이스가 리스트 형태인지 확인 후 반환
-        if isinstance(test_cases, list):
+                finished += 1
+                if kind == 'failed':
+                    failed += 1
+                else:
+                    chunk_results[index] = streamed[index]
+    finally:
+        # 클라이언트 연결이 끊긴 경우 아직 시작하지 않은 청크는 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    save_sections(document_id, document_text, fingerprints, chunk_results)
+    if not collected:
+        yield from _fallback_test_data()
+        return
+    metrics.GENERATIONS.inc(source="llm")
+    if cache and not failed:
+        cache.put(key, collected)
+
+
+def _received_json(cases):
+    """이어쓰기 요청에 돌려줄 이미 받은 케이스 (구조화 출력이면 스키마와 같은 형태로 감쌈)."""
+    return json.dumps({"test_cases": cases} if Config.LLM_STRUCTURED_OUTPUT else cases, ensure_ascii=False)
+
+
+def _chunk_messages(user_prompt, received=None):
+    """
+    청크 요청 메시지를 구성합니다.
+
+    received가 있으면 잘린 응답에서 이미 받은 케이스를 assistant 메시지로 돌려주고
+    나머지만 요청하는 이어쓰기 메시지를 덧붙입니다.
+    """
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+    if received:
+        continuation = {"role": "user", "content": CONTINUATION_PROMPT}
+        available = (
+            Config.LLM_CONTEXT_TOKENS - Config.LLM_COMPLETION_TOKENS
+            - prompt_builder.count_message_tokens(messages + [continuation])
+            - prompt_builder.MESSAGE_OVERHEAD_TOKENS
+        )
+        # 문맥 길이를 넘지 않도록 필요하면 오래된 케이스부터 빼고 돌려줌
+        start = 0
+        content = _received_json(received)
+        while start < len(received) - 1 and prompt_builder.count_tokens(content) > available:
+            start += max(1, (len(received) - start) // 10)
+            content = _received_json(received[start:])
+        messages += [{"role": "assistant", "content": content}, continuation]
+    return messages
+
+
+def _completion_args(route, messages, deadline):
+    """경로(router.Route)에 맞는 chat.completions 요청 인자를 만듭니다."""
+    kwargs = {
+        "model": route.model,
+        "messages": messages,
+        "max_completion_tokens": Config.LLM_COMPLETION_TOKENS,  # 충분한 응답 길이를 확보
+        "deadline": deadline,
+        "route": route.name,
+    }
+    if Config.LLM_STRUCTURED_OUTPUT:
+        kwargs["response_format"] = schema.RESPONSE_FORMAT
+    # 추론 모델만 reasoning_effort를 받음 (빠른 모델 경로는 LLM_FAST_EFFORT가 있을 때만)
+    if route.effort:
+        kwargs["reasoning_effort"] = route.effort
+    return kwargs
+
+
+def _chunk_deadline():
+    """청크 하나의 재시도 포함 마감 시각 (Config.LLM_CHUNK_DEADLINE이 0이면 None)."""
+    if Config.LLM_CHUNK_DEADLINE <= 0:
+        return None
+    return time.monotonic() + Config.LLM_CHUNK_DEADLINE
+
+
+def _generate_chunk(document_text, examples, part=None, models=None):
+    """
+    단일 청크에 대해 API를 호출하고 응답을 테스트 케이스 목록으로 파싱합니다.
+
+    청크 난이도로 경로를 고르고(router.choose), 빠른 모델의 응답을 해석할 수 없거나
+    케이스가 하나도 없으면 추론 모델로 다시 요청합니다. 케이스를 얻은 경로의 모델 이름은
+    models 집합에 더합니다.
+
+    Raises:
+        ValueError: 응답을 JSON으로 해석할 수 없는 경우
+    """
+    user_prompt = build_user_prompt(document_text, examples, part)
+    route = router.choose(document_text)
+    metrics.LLM_ROUTED_CHUNKS.inc(route=route.name)
+    deadline = _chunk_deadline()
+    while True:
+        escalation = router.escalate(route)
+        try:
+            test_cases = _generate_with_route(user_prompt, route, deadline)
+        except ValueError:
+            if escalation is None:
+                raise
+            test_cases = []
+        if test_cases or escalation is None:
+            if test_cases and models is not None:
+                models.add(route.model)
             return test_cases
-        else:
-            # 만약 단일 객체 혹은 다른 형태라면 리스트로 감싸서 반환
-            return [test_cases]
-
-    except Exception as e:
-        print(f"OpenAI API 호출 중 오류 발생: {str(e)}")
-        # 오류 로깅 강화
-        import traceback
-        print(traceback.format_exc())
-        return generate_test_data()
+        logger.info("%s 응답에서 테스트 케이스를 얻지 못해 %s(으)로 다시 요청합니다.", route.model, escalation.model)
+        metrics.LLM_ESCALATIONS.inc()
+        route = escalation
+
+
+def _generate_with_route(user_prompt, route, deadline=None):
+    """
+    한 경로의 모델로 청크를 생성합니다.
+
+    응답이 max_completion_tokens에서 잘리면(finish_reason == "length") 완성된 케이스는
+    살리고, 나머지만 이어서 요청합니다 (최대 MAX_CONTINUATIONS회).
+    """
+    test_cases = []
+
+    for attempt in range(MAX_CONTINUATIONS + 1):
+        # 공용 클라이언트가 요청 한도 대기와 429/5xx 재시도를 처리하며,
+        # 마감이 가까운 재시도는 생성 깊이를 낮춤
+        logger.debug("API 호출 시작: 모델 = %s (%s)", route.model, route.name)
+        response = client.create_chat_completion(
+            **_completion_args(route, _chunk_messages(user_prompt, test_cases), deadline)
+        )
+        logger.debug("API 호출 성공")
+
+        # 응답 텍스트 추출 (구조화 출력에서 모델이 응답을 거부하면 refusal에 사유가 옴)
+        choice = response.choices[0]
+        if getattr(choice.message, "refusal", None):
+            raise ValueError(f"모델이 응답을 거부했습니다: {choice.message.refusal}")
+        response_text = (choice.message.content or "").strip()
+        truncated = choice.finish_reason == "length"
+        if not truncated:
+            test_cases.extend(parse_test_cases(response_text))
+            return test_cases
+
+        cases, complete = _salvage_truncated(response_text)
+        test_cases.extend(cases)
+        if complete:
+            return test_cases
+        if attempt < MAX_CONTINUATIONS:
+            metrics.JSON_REPAIRS.inc(kind="continuation")
+            logger.info("응답이 길이 제한으로 잘렸습니다. 완성된 케이스 %d개를 살리고 나머지를 이어서 요청합니다.", len(cases))
+
+    logger.warning("이어쓰기 %d회 후에도 응답이 잘려 있어 받은 케이스 %d개만 사용합니다.", MAX_CONTINUATIONS, len(test_cases))
+    return test_cases
+
+
+def _salvage_truncated(response_text):
+    """
+    길이 제한으로 잘린 응답에서 완성된 케이스를 건져냅니다.
+
+    배열이 열리기 전에 잘렸더라도 받은 텍스트가 그대로 해석되면(단일 객체 등) 사용합니다.
+
+    Returns:
+        tuple: (레코드 목록, 응답이 끝까지 완성되었는지 여부)
+    """
+    try:
+        cases, complete = salvage_test_cases(response_text)
+    except ValueError:
+        try:
+            return parse_test_cases(response_text), True
+        except ValueError:
+            return [], False  # 배열이 시작되기 전에 잘림
+    metrics.JSON_REPAIRS.inc(kind="salvaged")
+    return schema.to_records(cases), complete
+
+
+def _stream_chunk(document_text, examples, part=None, models=None):
+    """
+    단일 청크를 스트리밍으로 요청하고, 완성되는 테스트 케이스를 차례로 반환합니다.
+
+    _generate_chunk와 같은 경로를 사용하며, 빠른 모델이 케이스를 하나도 내보내지 못하고
+    끝나거나 실패하면 추론 모델로 다시 스트리밍합니다. 케이스를 내보낸 경로의 모델 이름은
+    models 집합에 더합니다.
+    """
+    user_prompt = build_user_prompt(document_text, examples, part)
+    route = router.choose(document_text)
+    metrics.LLM_ROUTED_CHUNKS.inc(route=route.name)
+    deadline = _chunk_deadline()
+    while True:
+        escalation = router.escalate(route)
+        emitted = 0
+        try:
+            for case in _stream_with_route(user_prompt, route, deadline):
+                emitted += 1
+                if emitted == 1 and models is not None:
+                    models.add(route.model)
+                yield case
+        except Exception:
+            # 이미 내보낸 케이스는 되돌릴 수 없으므로 아무것도 내보내지 않았을 때만 올려 보냄
+            if escalation is None or emitted:
+                raise
+        if emitted or escalation is None:
+            return
+        logger.info("%s 스트림에서 테스트 케이스를 얻지 못해 %s(으)로 다시 요청합니다.", route.model, escalation.model)
+        metrics.LLM_ESCALATIONS.inc()
+        route = escalation
+
+
+def _stream_with_route(user_prompt, route, deadline=None):
+    """
+    한 경로의 모델로 청크를 스트리밍합니다.
+
+    스트림이 길이 제한으로 끝나면 이미 보낸 케이스 뒤의 나머지만 이어서 스트리밍합니다.
+    """
+    received = []  # 이어쓰기 요청에 돌려줄 원본 사본 (호출자가 TID를 바꿀 수 있으므로)
+
+    for attempt in range(MAX_CONTINUATIONS + 1):
+        logger.debug("스트리밍 API 호출 시작: 모델 = %s (%s)", route.model, route.name)
+        stream = client.create_chat_completion(
+            stream=True,
+            **_completion_args(route, _chunk_messages(user_prompt, received), deadline)
+        )
+
+        parser = TestCaseStreamParser()
+        text = []
+        finish_reason = None
+        for event in stream:
+            if not event.choices:
+                continue
+            finish_reason = event.choices[0].finish_reason or finish_reason
+            delta = event.choices[0].delta.content
+            if not delta:
+                continue
+            text.append(delta)
+            for case in schema.to_records(parser.feed(delta)):
+                received.append(dict(case))
+                yield case
+
+        if finish_reason != "length" or parser.complete:
+            # 배열이 아닌 형태(단일 객체 등)로 응답한 경우 전체 텍스트를 다시 해석
+            if not parser.started:
+                yield from parse_test_cases(''.join(text).strip())
+            return
+        if not parser.started:
+            # 배열이 열리기 전에 잘림: 블로킹 경로처럼 받은 텍스트에서 케이스를 건져냄
+            cases, complete = _salvage_truncated(''.join(text).strip())
+            for case in cases:
+                received.append(dict(case))
+                yield case
+            if complete:
+                return
+        if attempt < MAX_CONTINUATIONS:
+            metrics.JSON_REPAIRS.inc(kind="continuation")
+            logger.info("스트리밍 응답이 길이 제한으로 잘렸습니다. 케이스 %d개 이후를 이어서 요청합니다.", len(received))
+
+    logger.warning("이어쓰기 %d회 후에도 응답이 잘려 있어 받은 케이스 %d개만 사용합니다.", MAX_CONTINUATIONS, len(received))
+
+
+def parse_test_cases(response_text):
+    """
+    응답 텍스트를 검증된 테스트 케이스 레코드 목록으로 파싱합니다 (schema.parse_response).
+
+    Raises:
+        ValueError: 응답에서 JSON 배열을 찾을 수 없는 경우
+    """
+    test_cases, parsed = schema.parse_response(response_text)
+    if not parsed:
+        metrics.JSON_REPAIRS.inc(kind="salvaged")
+        logger.info("JSON으로 바로 해석되지 않는 응답에서 테스트 케이스 %d개를 복구했습니다.", len(test_cases))
+    return test_cases
+
+
+def _fallback_test_data():
+    """생성에 실패하여 예시 데이터로 대체한 횟수를 기록하고 예시 데이터를 반환합니다."""
+    metrics.GENERATIONS.inc(source="fallback")
+    return generate_test_data()
+
 
 def generate_test_data():
     """테스트 데이터 생성 (API 호출 실패 시 사용)"""
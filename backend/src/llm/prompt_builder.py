@@ -0,0 +1,177 @@
+import logging
+import re
+import json
+import math
+from collections import Counter
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 메시지 하나당 역할/구분자 등으로 추가되는 토큰 수 (chat 형식 오버헤드)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# 응답 시작 부분에 추가되는 토큰 수
+REPLY_OVERHEAD_TOKENS = 3
+
+# 한글·한자·가나 (토큰화 시 대체로 글자당 1토큰 이상)
+WIDE_CHAR_PATTERN = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7af]")
+
+# 유사도 계산용 단어 패턴
+WORD_PATTERN = re.compile(r"\w+")
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """tiktoken이 설치되어 있으면 모델에 맞는 인코딩을, 없으면 None을 반환합니다."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            try:
+                _encoding = tiktoken.encoding_for_model(Config.OPENAI_MODEL)
+            except KeyError:
+                _encoding = tiktoken.get_encoding("o200k_base")
+        except ImportError:
+            logger.warning("tiktoken이 설치되어 있지 않아 토큰 수를 근사치로 계산합니다. pip install tiktoken으로 설치하세요.")
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text):
+    """
+    텍스트의 토큰 수를 셉니다.
+
+    tiktoken이 없으면 한글 등은 글자당 1토큰, 나머지는 4글자당 1토큰으로 넉넉하게
+    추정합니다 (실제보다 적게 세어 문맥 길이를 넘지 않도록).
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    wide = len(WIDE_CHAR_PATTERN.findall(text))
+    return wide + math.ceil((len(text) - wide) / 4)
+
+
+def count_message_tokens(messages):
+    """chat 메시지 목록의 프롬프트 토큰 수를 셉니다."""
+    return sum(count_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS for message in messages) \
+        + REPLY_OVERHEAD_TOKENS
+
+
+def fit_to_tokens(text, max_tokens):
+    """
+    텍스트가 max_tokens 이내가 되도록 뒷부분을 잘라냅니다.
+
+    Returns:
+        tuple: (잘라낸 텍스트, 잘렸는지 여부)
+    """
+    if max_tokens <= 0:
+        return "", bool(text)
+    if count_tokens(text) <= max_tokens:
+        return text, False
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens]), True
+
+    # 근사 토큰 수는 길이에 단조 증가하므로 이진 탐색으로 들어가는 최대 길이를 찾음
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low], True
+
+
+def compact_examples(examples):
+    """
+    예시를 공백 없는 열 기반 JSON으로 직렬화합니다.
+
+    모든 예시가 같은 키를 반복하지 않도록 {"columns": [...], "rows": [[...], ...]} 형태로
+    키를 한 번만 적습니다.
+    """
+    columns = []
+    for example in examples:
+        for key in example:
+            if key not in columns:
+                columns.append(key)
+    rows = [[example.get(column, "") for column in columns] for example in examples]
+    return json.dumps({"columns": columns, "rows": rows}, ensure_ascii=False, separators=(',', ':'))
+
+
+def _terms(text):
+    """단어와 한글 단어의 글자 바이그램을 유사도 계산용 용어로 추출합니다."""
+    terms = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        terms.append(word)
+        if len(word) > 2 and WIDE_CHAR_PATTERN.match(word):
+            # 조사·어미가 붙어도 겹치도록 바이그램을 함께 사용
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def _example_text(example):
+    return " ".join(str(value) for value in example.values() if value)
+
+
+def select_examples(document_text, library, max_examples, max_tokens=None):
+    """
+    예시 라이브러리에서 문서 조각과 어휘가 가장 많이 겹치는 예시를 고릅니다.
+
+    용어마다 라이브러리 내 희소성(IDF)으로 가중치를 주고 예시 길이로 정규화한 점수로
+    정렬합니다. 겹치는 예시가 없어도 형식 안내를 위해 최소 1개는 포함하고, 그 외에는
+    겹치는 용어가 있는 예시만 넣습니다.
+
+    Args:
+        document_text (str): 문서 조각
+        library (list): 예시 테스트 케이스 목록
+        max_examples (int): 최대 예시 수
+        max_tokens (int, optional): 직렬화한 예시의 최대 토큰 수
+
+    Returns:
+        list: 선택된 예시 (라이브러리 순서 유지)
+    """
+    if len(library) <= 1:
+        return list(library)
+
+    example_terms = [Counter(_terms(_example_text(example))) for example in library]
+    document_frequency = Counter(term for terms in example_terms for term in terms)
+    idf = {term: math.log((1 + len(library)) / (1 + count)) + 1 for term, count in document_frequency.items()}
+    document_terms = set(_terms(document_text))
+
+    scores = []
+    for index, terms in enumerate(example_terms):
+        overlap = sum(idf[term] for term in terms if term in document_terms)
+        scores.append(overlap / math.sqrt(sum(terms.values()) or 1))
+    ranked = sorted(range(len(library)), key=lambda index: (-scores[index], index))
+
+    selected = [ranked[0]]
+    for index in ranked[1:max_examples]:
+        if scores[index] <= 0:
+            break
+        candidate = [library[i] for i in sorted(selected + [index])]
+        if max_tokens is not None and count_tokens(compact_examples(candidate)) > max_tokens:
+            break
+        selected.append(index)
+    return [library[index] for index in sorted(selected)]
+
+
+def document_budget(system_prompt, user_prompt_without_document):
+    """
+    문맥 길이에서 응답 예약분과 문서 이외의 프롬프트를 뺀, 문서에 쓸 수 있는 토큰 수
+
+    Args:
+        system_prompt (str): 시스템 프롬프트
+        user_prompt_without_document (str): 문서 자리를 비운 유저 프롬프트
+    """
+    used = count_message_tokens([
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt_without_document}
+    ])
+    return Config.LLM_CONTEXT_TOKENS - Config.LLM_COMPLETION_TOKENS - used
@@ -0,0 +1,110 @@
+import re
+from collections import namedtuple
+from src.utils.config import Config
+
+# 상태 전이, 조건 분기, 수치 규칙처럼 케이스 설계가 까다로운 기획 문구
+STATE_KEYWORDS = (
+    "상태", "전이", "전환", "조건", "경우", "만약", "이면", "실패", "성공", "취소", "중단",
+    "재시도", "쿨타임", "확률", "중첩", "누적", "최대", "최소", "이상", "이하", "초과", "미만",
+    "제한", "단계", "대기", "만료", "예외", "동시",
+)
+# 영문 키워드는 단어 단위로만 셈 (notification의 "if", statement의 "state"는 제외)
+STATE_WORDS = ("state", "transition", "if", "else", "when", "until", "retry", "timeout", "cooldown")
+# 한글 키워드는 조사가 붙으므로("상태가", "조건이면") 부분 문자열로 셈
+KEYWORD_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in STATE_KEYWORDS)
+    + r"|\b(?:" + "|".join(re.escape(word) for word in STATE_WORDS) + r")\b",
+    re.IGNORECASE
+)
+
+# 표의 행으로 보는 줄: 구분자(|, 탭)가 있거나 공백 2칸 이상으로 나뉜 칸이 3개 이상
+TABLE_SEPARATOR = re.compile(r"\||\t| {2,}")
+
+# 구간별 가중치 (합계 1): 길이, 표 비율, 1,000자당 상태·조건 키워드 수
+SIZE_WEIGHT = 0.3
+TABLE_WEIGHT = 0.3
+KEYWORD_WEIGHT = 0.4
+TABLE_SATURATION = 0.5  # 줄의 절반 이상이 표이면 표 점수 최대
+KEYWORDS_PER_KCHAR_SATURATION = 8.0  # 1,000자당 키워드 8개 이상이면 키워드 점수 최대
+
+Route = namedtuple("Route", ["name", "model", "effort"])
+
+
+def complexity(text):
+    """
+    섹션(청크)의 생성 난이도를 0~1 사이 점수로 계산합니다.
+
+    길이(Config.LLM_CHUNK_CHARS 대비), 표로 보이는 줄의 비율, 상태 전이·조건 키워드
+    밀도를 가중 합산합니다. 안내 문구 위주의 UI 텍스트는 낮게, 수치 표와 상태 규칙이
+    많은 시스템 기획은 높게 나옵니다.
+    """
+    text = text or ""
+    if not text.strip():
+        return 0.0
+    size = min(1.0, len(text) / max(1, Config.LLM_CHUNK_CHARS))
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    table_lines = sum(1 for line in lines if len(TABLE_SEPARATOR.split(line.strip())) >= 3)
+    table = min(1.0, table_lines / len(lines) / TABLE_SATURATION) if lines else 0.0
+
+    per_kchar = len(KEYWORD_PATTERN.findall(text)) * 1000.0 / len(text)
+    keywords = min(1.0, per_kchar / KEYWORDS_PER_KCHAR_SATURATION)
+
+    return SIZE_WEIGHT * size + TABLE_WEIGHT * table + KEYWORD_WEIGHT * keywords
+
+
+def fast_route():
+    """빠르고 저렴한 모델 경로 (LLM_FAST_EFFORT가 비어 있으면 reasoning_effort를 보내지 않음)."""
+    return Route("fast", Config.LLM_FAST_MODEL, Config.LLM_FAST_EFFORT or None)
+
+
+def reasoning_route(hard=False):
+    """추론 모델 경로. 어려운 섹션은 더 높은 생성 깊이(Config.LLM_HARD_EFFORT)를 사용합니다."""
+    if hard:
+        return Route("reasoning_high", Config.OPENAI_MODEL, Config.LLM_HARD_EFFORT)
+    return Route("reasoning", Config.OPENAI_MODEL, Config.LLM_REASONING_EFFORT)
+
+
+def routing_enabled():
+    return bool(Config.LLM_ROUTING and Config.LLM_FAST_MODEL)
+
+
+def choose(text):
+    """
+    섹션 난이도 점수로 경로를 고릅니다.
+
+    점수가 Config.LLM_ROUTE_FAST_BELOW 미만이면 빠른 모델, Config.LLM_ROUTE_HARD_FROM
+    이상이면 높은 생성 깊이의 추론 모델, 그 사이는 기본 생성 깊이의 추론 모델을
+    사용합니다. 라우팅을 끄면(LLM_ROUTING=false 또는 LLM_FAST_MODEL 비움) 항상 기본
+    추론 모델 경로를 반환합니다.
+    """
+    if not routing_enabled():
+        return reasoning_route()
+    score = complexity(text)
+    if score < Config.LLM_ROUTE_FAST_BELOW:
+        return fast_route()
+    return reasoning_route(hard=score >= Config.LLM_ROUTE_HARD_FROM)
+
+
+def escalate(route):
+    """
+    빠른 모델의 응답을 쓸 수 없을 때(파싱 실패, 빈 결과) 올려 보낼 경로를 반환합니다.
+
+    추론 모델 경로는 더 올릴 곳이 없으므로 None을 반환합니다.
+    """
+    if route.name == "fast":
+        return reasoning_route()
+    return None
+
+
+def signature():
+    """생성 캐시·섹션 지문에 넣을 라우팅 설정 (설정이 바뀌면 이전 결과를 재사용하지 않음)."""
+    return {
+        "model": Config.OPENAI_MODEL,
+        "reasoning_effort": Config.LLM_REASONING_EFFORT,
+        "hard_effort": Config.LLM_HARD_EFFORT,
+        "fast_model": Config.LLM_FAST_MODEL if routing_enabled() else None,
+        "fast_effort": Config.LLM_FAST_EFFORT if routing_enabled() else None,
+        "fast_below": Config.LLM_ROUTE_FAST_BELOW if routing_enabled() else None,
+        "hard_from": Config.LLM_ROUTE_HARD_FROM if routing_enabled() else None,
+    }
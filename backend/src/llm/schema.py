@@ -0,0 +1,104 @@
+import json
+from src.llm.json_stream import salvage_test_cases
+
+# 테스트 케이스 레코드의 필드 (Excel 열 순서)
+TEST_CASE_FIELDS = (
+    "TID", "대분류", "중분류", "소분류", "Precondition",
+    "Test_Step", "Expected_Result", "Result", "BTS_Key", "Comment",
+)
+_FIELD_SET = frozenset(TEST_CASE_FIELDS)
+
+# 구조화 출력(strict) 스키마. 최상위는 객체여야 하므로 목록을 test_cases 키로 감쌈
+TEST_CASES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "test_cases": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {field: {"type": "string"} for field in TEST_CASE_FIELDS},
+                "required": list(TEST_CASE_FIELDS),
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["test_cases"],
+    "additionalProperties": False,
+}
+
+# chat.completions의 response_format 인자
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "test_cases", "strict": True, "schema": TEST_CASES_SCHEMA},
+}
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        # 스키마 없이 생성한 응답은 단계 목록을 배열로 주기도 함
+        return "\n".join(_text(item) for item in value)
+    return str(value)
+
+
+def to_record(obj):
+    """
+    모델이 만든 객체 하나를 스키마 필드만 가진 문자열 레코드로 검증합니다.
+
+    스키마를 그대로 따른 객체는 키 집합과 값 형식만 확인하고 그대로 반환합니다.
+    그 밖에는 빠진 필드를 빈 문자열로 채우고, 문자열이 아닌 값은 문자열로 바꾸며,
+    스키마에 없는 필드는 버립니다.
+
+    Returns:
+        dict: TEST_CASE_FIELDS를 키로 가진 레코드 (객체가 아니면 None)
+    """
+    if not isinstance(obj, dict):
+        return None
+    if obj.keys() == _FIELD_SET and all(type(value) is str for value in obj.values()):
+        return obj
+    return {field: _text(obj.get(field)) for field in TEST_CASE_FIELDS}
+
+
+def to_records(items):
+    """객체 목록을 한 번 순회하며 레코드 목록으로 검증합니다 (객체가 아닌 원소는 건너뜀)."""
+    records = []
+    for item in items:
+        record = to_record(item)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def parse_response(text):
+    """
+    응답 본문을 레코드 목록으로 검증합니다.
+
+    구조화 출력 응답({"test_cases": [...]})은 json.loads 한 번과 레코드 검증 한 번으로
+    끝납니다. JSON으로 바로 해석되지 않는 응답(길이 제한으로 잘린 응답, 구조화 출력을
+    끈 경우의 설명 문구·펜스 등)은 완성된 객체만 건져냅니다.
+
+    Args:
+        text (str): 모델 응답 본문
+
+    Returns:
+        tuple: (레코드 목록, 응답을 그대로 해석했는지 여부 (False면 객체를 건져낸 경우))
+
+    Raises:
+        ValueError: 응답에서 테스트 케이스 배열을 찾을 수 없는 경우
+    """
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        cases, _ = salvage_test_cases(text)
+        return to_records(cases), False
+    if isinstance(payload, dict):
+        if isinstance(payload.get("test_cases"), list):
+            payload = payload["test_cases"]
+        elif payload.keys() & _FIELD_SET:
+            payload = [payload]  # 케이스 하나만 객체로 응답한 경우
+    if not isinstance(payload, list):
+        raise ValueError("응답에 test_cases 배열이 없습니다")
+    return to_records(payload), True
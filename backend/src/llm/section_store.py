@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from src.utils.config import Config
+
+
+class SectionStore:
+    """
+    문서별 섹션 지문과 섹션마다 생성된 테스트 케이스를 저장하는 SQLite 저장소
+
+    판은 문서 이름(클라이언트가 보낸 파일 이름 등)과 문서 내용의 해시로 구분하므로,
+    이름이 같은 다른 문서가 서로의 기록을 덮어쓰지 않습니다. 같은 이름의 개정판이
+    들어오면 최근 판들(Config.SECTION_VERSIONS개)에서 지문이 같은 섹션의 케이스를
+    재사용하고, 추가·변경된 섹션만 다시 생성합니다. 지문은 섹션 내용과 프롬프트로
+    정해지므로 다른 문서의 판에서 가져온 케이스도 같은 섹션의 결과입니다.
+    """
+
+    def __init__(self, db_path, max_versions):
+        self.db_path = db_path
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            # 이름만으로 구분하던 이전 형식의 기록은 버림 (다음 생성에서 다시 채워짐)
+            conn.execute("DROP TABLE IF EXISTS document_sections")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS section_versions ("
+                " document_id TEXT NOT NULL,"
+                " document_hash TEXT NOT NULL,"
+                " position INTEGER NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " cases TEXT NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (document_id, document_hash, position))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """트랜잭션을 커밋하고 연결을 닫는 SQLite 연결 컨텍스트"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, document_id):
+        """
+        문서 이름으로 저장된 최근 판들의 섹션 지문과 케이스를 반환합니다.
+
+        같은 지문이 여러 판에 있으면 가장 최근 판의 케이스를 사용합니다.
+
+        Returns:
+            dict: 섹션 지문 → 테스트 케이스 목록 (저장된 적이 없으면 빈 dict)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT fingerprint, cases FROM section_versions WHERE document_id = ?"
+                " ORDER BY updated_at, rowid",
+                (document_id,)
+            ).fetchall()
+        return {fingerprint: json.loads(cases) for fingerprint, cases in rows}
+
+    def save(self, document_id, document_hash, sections):
+        """
+        문서 한 판의 섹션 목록을 교체하고, 이름별로 최근 max_versions개 판만 남깁니다.
+
+        Args:
+            document_id (str): 문서 이름 (예: 업로드 파일 이름)
+            document_hash (str): 이 판의 내용 해시
+            sections (list): 문서 순서대로 정렬된 (섹션 지문, 테스트 케이스 목록) 목록
+        """
+        now = time.time()
+        rows = [
+            (document_id, document_hash, position, fingerprint, json.dumps(cases, ensure_ascii=False), now)
+            for position, (fingerprint, cases) in enumerate(sections)
+        ]
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "DELETE FROM section_versions WHERE document_id = ? AND document_hash = ?",
+                (document_id, document_hash)
+            )
+            conn.executemany(
+                "INSERT INTO section_versions"
+                " (document_id, document_hash, position, fingerprint, cases, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute(
+                "DELETE FROM section_versions WHERE document_id = ? AND document_hash NOT IN ("
+                " SELECT document_hash FROM section_versions WHERE document_id = ?"
+                " GROUP BY document_hash ORDER BY MAX(updated_at) DESC, MAX(rowid) DESC LIMIT ?)",
+                (document_id, document_id, max(1, self.max_versions))
+            )
+
+    def delete(self, document_id):
+        """문서 이름의 모든 판의 섹션 기록을 삭제하고 삭제된 섹션 수를 반환합니다."""
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM section_versions WHERE document_id = ?", (document_id,))
+            return cursor.rowcount
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """설정값으로 생성한 공용 섹션 저장소를 반환합니다."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SectionStore(Config.SECTION_STORE_PATH, Config.SECTION_VERSIONS)
+    return _store
@@ -0,0 +1,184 @@
+import threading
+from src.utils import metrics
+
+
+def _copy(result):
+    """호출자마다 결과를 따로 고칠 수 있도록 케이스 목록을 얕게 복사합니다."""
+    if isinstance(result, list):
+        return [dict(item) if isinstance(item, dict) else item for item in result]
+    return result
+
+
+class _Flight:
+    """진행 중인 생성 한 건의 결과 (스트림이면 지금까지 나온 케이스)."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.items = []
+        self.finished = False
+        self.subscribers = 0
+
+
+class _Subscription:
+    """
+    스트림 구독자 한 명의 반복자
+
+    구독은 stream()을 호출할 때 세므로, 끝까지 받거나 close()하거나 한 번도 반복하지
+    않고 버려져도(__del__) 구독을 정확히 한 번 해제합니다. 제너레이터는 시작 전에
+    버려지면 finally가 실행되지 않으므로 쓰지 않습니다.
+    """
+
+    def __init__(self, flight):
+        self._flight = flight
+        self._position = 0
+        self._released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        flight = self._flight
+        if self._released:
+            raise StopIteration
+        try:
+            with flight.condition:
+                while self._position >= len(flight.items) and not flight.finished:
+                    flight.condition.wait()
+                if self._position < len(flight.items):
+                    item = flight.items[self._position]
+                    self._position += 1
+                    return dict(item) if isinstance(item, dict) else item
+        except BaseException:
+            self.close()
+            raise
+        self.close()
+        if flight.error is not None:
+            raise flight.error
+        raise StopIteration
+
+    def close(self):
+        """구독을 해제합니다 (여러 번 호출해도 한 번만 해제)."""
+        with self._flight.condition:
+            if self._released:
+                return
+            self._released = True
+            self._flight.subscribers -= 1
+
+    def __del__(self):
+        self.close()
+
+
+class SingleFlight:
+    """
+    같은 프롬프트 지문의 동시 생성 요청을 하나의 LLM 호출로 합칩니다.
+
+    먼저 들어온 요청(리더)만 실제로 생성하고, 그 사이에 들어온 같은 키의 요청은
+    리더의 결과를 복사해 받습니다. 스트림은 지금까지 나온 케이스를 먼저 보내고
+    이후 케이스는 도착하는 대로 이어서 보냅니다. 생성이 끝나면 키를 지우므로
+    이후 요청은 생성 캐시에서 결과를 받습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def _join(self, key):
+        """키의 진행 중인 생성에 참여합니다. 새로 만들었으면 (flight, True)를 반환합니다."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            with flight.condition:
+                flight.subscribers += 1
+        return flight, leader
+
+    def do(self, key, func):
+        """
+        func()를 키당 한 번만 실행하고 그 결과를 같은 키로 기다리던 호출자 모두에게 반환합니다.
+
+        리더에서 발생한 예외는 기다리던 호출자에게도 그대로 전달됩니다.
+        """
+        flight, leader = self._join(key)
+        if not leader:
+            metrics.COALESCED_REQUESTS.inc(mode="generate")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _copy(flight.result)
+
+        try:
+            result = func()
+            # 리더의 호출자가 결과를 고치기 전에 기다리는 요청에 줄 사본을 만들어 둠
+            flight.result = _copy(result)
+            return result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stream(self, key, factory):
+        """
+        factory()가 반환하는 제너레이터를 키당 하나만 실행하고, 같은 키의 모든 구독자에게
+        처음부터 같은 순서로 항목을 나누어 주는 반복자(_Subscription)를 반환합니다.
+
+        생성은 별도 스레드에서 진행되므로 한 구독자의 연결이 끊겨도 다른 구독자는 계속
+        받으며, 모든 구독자가 떠나면 원래 제너레이터를 닫아 남은 청크를 취소합니다.
+        """
+        flight, leader = self._join(key)
+        if leader:
+            threading.Thread(target=self._pump, args=(key, flight, factory), daemon=True).start()
+        else:
+            metrics.COALESCED_REQUESTS.inc(mode="stream")
+        return _Subscription(flight)
+
+    def _pump(self, key, flight, factory):
+        generator = None
+        try:
+            generator = factory()
+            for item in generator:
+                with self._lock:
+                    with flight.condition:
+                        flight.items.append(item)
+                        flight.condition.notify_all()
+                        if flight.subscribers > 0:
+                            continue
+                        # 구독자가 모두 떠났으면 새 요청이 붙지 않도록 키를 먼저 지움
+                        del self._flights[key]
+                break
+        except Exception as e:
+            flight.error = e
+        finally:
+            if generator is not None:
+                generator.close()
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            with flight.condition:
+                flight.finished = True
+                flight.condition.notify_all()
+
+    def in_flight(self):
+        """진행 중인 생성 수를 반환합니다."""
+        with self._lock:
+            return len(self._flights)
+
+
+_group = None
+_group_lock = threading.Lock()
+
+
+def get_group():
+    """프로세스 전체에서 공유하는 SingleFlight 인스턴스를 반환합니다."""
+    global _group
+    if _group is None:
+        with _group_lock:
+            if _group is None:
+                _group = SingleFlight()
+    return _group
@@ -0,0 +1,133 @@
+from collections.abc import Mapping
+from itertools import islice
+from src.llm.schema import TEST_CASE_FIELDS
+
+_BASE_FIELDS = frozenset(TEST_CASE_FIELDS)
+
+
+class TestCase(Mapping):
+    """
+    TestCaseBatch의 한 행을 가리키는 읽기 전용 레코드
+
+    값은 배치의 열 목록에 그대로 두고 (배치, 행 번호)만 가지므로 행마다 dict를 만들지
+    않습니다. Mapping이므로 case["TID"], case.get(...), dict(case)로 기존 dict처럼 읽을
+    수 있습니다. 스키마 필드는 항상 있고, 추가 필드(Duplicate_Of 등)는 값이 있는 행에만
+    있습니다.
+    """
+
+    __test__ = False  # 이름이 Test로 시작해도 pytest가 테스트 클래스로 수집하지 않도록 함
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, field):
+        value = self._batch._columns[field][self._index]
+        if value is None and field not in _BASE_FIELDS:
+            raise KeyError(field)
+        return value
+
+    def __iter__(self):
+        for field, column in self._batch._columns.items():
+            if field in _BASE_FIELDS or column[self._index] is not None:
+                yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"TestCase({dict(self)!r})"
+
+
+class TestCaseBatch:
+    """
+    테스트 케이스 목록을 필드별 열(list)로 보관하는 컨테이너
+
+    만들 때 한 번에 기본값(스키마 필드는 빈 문자열)을 채우므로 Excel, JSON 응답,
+    보관소가 같은 필드를 봅니다. Excel 작성과 보관소 저장은 열을 그대로 순회하고,
+    JSON 응답은 필요한 범위의 행만 dict로 만듭니다. 케이스가 수만 개인 일괄 처리에서
+    행마다 dict를 유지하는 것보다 메모리를 적게 씁니다.
+    """
+
+    __test__ = False
+    __slots__ = ("fields", "_columns", "_length")
+
+    def __init__(self, columns, length):
+        self._columns = columns
+        self._length = length
+        self.fields = tuple(columns)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        dict 목록에서 배치를 만듭니다.
+
+        열은 스키마 필드(TEST_CASE_FIELDS) 순서 뒤에 추가 필드를 처음 나온 순서대로
+        붙입니다. 빠진 스키마 필드는 빈 문자열, 빠진 추가 필드는 None으로 채웁니다.
+        """
+        records = [record for record in records if isinstance(record, Mapping)]
+        fields = list(TEST_CASE_FIELDS)
+        known = set(fields)
+        for record in records:
+            if record.keys() <= known:
+                continue
+            for field in record:
+                if field not in known:
+                    known.add(field)
+                    fields.append(field)
+        columns = {
+            field: [record.get(field, "" if field in _BASE_FIELDS else None) for record in records]
+            for field in fields
+        }
+        return cls(columns, len(records))
+
+    @classmethod
+    def of(cls, test_cases):
+        """배치는 그대로, dict 목록은 배치로 바꿔 반환합니다."""
+        if isinstance(test_cases, cls):
+            return test_cases
+        return cls.from_records(test_cases)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield TestCase(self, index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            columns = {field: column[index] for field, column in self._columns.items()}
+            return TestCaseBatch(columns, len(range(start, stop, step)))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("테스트 케이스 번호가 범위를 벗어났습니다")
+        return TestCase(self, index)
+
+    def column(self, field):
+        """필드의 열(list)을 반환합니다. 복사하지 않으므로 고치지 마세요."""
+        return self._columns[field]
+
+    def rows(self, start=0, stop=None):
+        """start~stop 행의 값을 fields 순서의 튜플로 차례로 반환합니다."""
+        return zip(*(islice(column, start, stop) for column in self._columns.values()))
+
+    def records(self, start=0, stop=None):
+        """start~stop 행을 dict로 차례로 반환합니다 (값이 None인 추가 필드는 뺌)."""
+        fields = self.fields
+        if len(fields) == len(TEST_CASE_FIELDS):
+            for row in self.rows(start, stop):
+                yield dict(zip(fields, row))
+            return
+        for row in self.rows(start, stop):
+            yield {
+                field: value for field, value in zip(fields, row)
+                if value is not None or field in _BASE_FIELDS
+            }
+
+    def to_records(self, start=0, stop=None):
+        """start~stop 행을 JSON 응답용 dict 목록으로 반환합니다."""
+        return list(self.records(start, stop))
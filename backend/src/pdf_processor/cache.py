@@ -0,0 +1,125 @@
+import logging
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 해시 계산 시 한 번에 읽을 크기
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    PDF 텍스트 추출 결과를 파일 내용 해시(SHA-256)로 저장하는 디스크 캐시
+
+    문서 전체 결과는 <해시>, 추출기별 페이지 결과는 <해시>.<추출기 이름> 키를 사용합니다.
+    항목마다 <해시>.json 파일 하나를 사용하며, 조회 시 수정 시각을 갱신하고
+    전체 크기가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다(LRU).
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        캐시된 추출 결과를 조회합니다.
+
+        Returns:
+            dict: 저장된 항목 (문서 전체 결과는 {"text": 추출 텍스트, "extractor": 사용된 추출기}) 또는 None
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            os.utime(path)  # LRU 순서 갱신
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, text, extractor):
+        """추출 결과를 저장하고 필요하면 오래된 항목을 정리합니다."""
+        self.put_entry(key, {"text": text, "extractor": extractor})
+
+    def put_entry(self, key, entry):
+        """JSON으로 직렬화할 수 있는 항목을 그대로 저장합니다."""
+        with self._lock:
+            # 임시 파일에 쓴 뒤 교체하여 동시 조회 시 깨진 파일이 보이지 않도록 함
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump(entry, file, ensure_ascii=False)
+                os.replace(tmp_path, self._entry_path(key))
+            except OSError as e:
+                logger.warning("추출 캐시 저장 실패: %s", e)
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                return
+            self._evict()
+
+    def _evict(self):
+        """전체 크기가 상한 이하가 될 때까지 가장 오래 사용되지 않은 항목을 삭제합니다."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """모든 캐시 항목을 삭제합니다."""
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """설정값으로 생성한 공용 추출 캐시를 반환합니다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ExtractionCache(
+                    Config.EXTRACTION_CACHE_DIR,
+                    Config.EXTRACTION_CACHE_MAX_MB * 1024 * 1024
+                )
+    return _cache
@@ -0,0 +1,237 @@
+import logging
+import io
+import shutil
+import subprocess
+import tempfile
+from PyPDF2.generic import IndirectObject
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 페이지 종류별로 시도할 추출기 순서
+# - text: 글꼴이 있는 텍스트 페이지
+# - mixed: 글꼴과 이미지가 함께 있는 페이지 (텍스트 추출이 모두 부족하면 OCR)
+# - image: 글꼴 없이 이미지만 있는 스캔 페이지 (텍스트 추출기를 건너뛰고 바로 OCR)
+# - empty: 글꼴도 이미지도 없는 빈 페이지 (추출하지 않음)
+ROUTES = {
+    "text": ("pypdf2", "pdfminer", "pdftotext"),
+    "mixed": ("pypdf2", "pdfminer", "pdftotext", "ocr"),
+    "image": ("ocr",),
+    "empty": (),
+}
+
+# 글꼴 없이 이 크기 이상의 내용 스트림이 있으면 인라인 이미지 페이지로 간주 (바이트)
+INLINE_IMAGE_CONTENT_BYTES = 4096
+
+
+class Engine:
+    """
+    페이지 단위 텍스트 추출기
+
+    Args:
+        name (str): 추출기 이름 (캐시 키와 지표 레이블에 사용)
+        extract: (PDF 경로 또는 내용, 페이지 번호, PyPDF2 PdfReader) → 텍스트
+        available: 추출기를 쓸 수 있는지 확인하는 함수 (선택 의존성 검사용)
+        version: 결과에 영향을 주는 설정을 문자열로 반환하는 함수 (값이 바뀌면 이 추출기의 캐시를 무시)
+    """
+
+    def __init__(self, name, extract, available=None, version=None):
+        self.name = name
+        self.extract = extract
+        self._available = available
+        self._checked = None
+        self.version = version or (lambda: "1")
+
+    @property
+    def available(self):
+        if self._checked is None:
+            self._checked = self._available() if self._available else True
+        return self._checked
+
+
+ENGINES = {}
+
+
+def register_engine(name, extract, available=None, version=None):
+    """추출기를 등록합니다. 같은 이름으로 다시 등록하면 교체됩니다."""
+    ENGINES[name] = Engine(name, extract, available, version)
+    return ENGINES[name]
+
+
+def engines_for(route):
+    """페이지 종류에 대해 사용할 수 있는 추출기 목록을 순서대로 반환합니다."""
+    return [ENGINES[name] for name in ROUTES[route] if name in ENGINES and ENGINES[name].available]
+
+
+def _resolve(value):
+    return value.get_object() if isinstance(value, IndirectObject) else value
+
+
+def _content_length(page):
+    """페이지 내용 스트림의 크기 (압축된 상태, 스트림을 풀지 않음)"""
+    contents = _resolve(page.get("/Contents"))
+    if contents is None:
+        return 0
+    streams = contents if isinstance(contents, list) else [contents]
+    total = 0
+    for stream in streams:
+        stream = _resolve(stream)
+        length = _resolve(stream.get("/Length", 0)) if hasattr(stream, "get") else 0
+        total += int(length or 0)
+    return total
+
+
+def classify_page(page):
+    """
+    페이지 리소스 사전만 보고 페이지 종류(text, mixed, image, empty)를 판별합니다.
+
+    내용 스트림을 풀지 않으므로 페이지 텍스트 추출보다 훨씬 저렴합니다.
+    폼 XObject는 텍스트를 담을 수 있으므로 글꼴과 같이 취급합니다.
+    """
+    try:
+        resources = _resolve(page.get("/Resources")) or {}
+        has_text = bool(_resolve(resources.get("/Font")))
+        has_image = False
+        for xobject in (_resolve(resources.get("/XObject")) or {}).values():
+            subtype = _resolve(xobject).get("/Subtype")
+            if subtype == "/Image":
+                has_image = True
+            elif subtype == "/Form":
+                has_text = True
+        if not has_text and not has_image:
+            has_image = _content_length(page) >= INLINE_IMAGE_CONTENT_BYTES
+    except Exception as e:
+        logger.warning("페이지 사전 검사 중 오류 (텍스트 페이지로 처리): %s", e)
+        return "text"
+
+    if has_text:
+        return "mixed" if has_image else "text"
+    return "image" if has_image else "empty"
+
+
+def plan_routes(reader):
+    """
+    문서의 페이지별 추출 경로를 정합니다.
+
+    먼저 Config.EXTRACT_PRESCAN_PAGES개 페이지를 고르게 표본으로 검사하여, 표본이 모두
+    스캔 페이지면 문서 전체를 스캔 문서로 보고 나머지 페이지는 검사하지 않고 OCR로
+    보냅니다. 그 외에는 페이지마다 리소스 사전을 검사하여 경로를 정합니다.
+
+    Returns:
+        tuple: (문서 종류 "scanned" 또는 "text", 페이지별 경로 목록)
+    """
+    pages = reader.pages
+    page_count = len(pages)
+    if page_count == 0:
+        return "text", []
+
+    sample_size = max(1, min(Config.EXTRACT_PRESCAN_PAGES, page_count))
+    step = page_count / sample_size
+    sample = sorted({int(i * step) for i in range(sample_size)})
+    sampled = {page_num: classify_page(pages[page_num]) for page_num in sample}
+    if all(route == "image" for route in sampled.values()):
+        return "scanned", ["image"] * page_count
+
+    return "text", [sampled.get(page_num) or classify_page(pages[page_num]) for page_num in range(page_count)]
+
+
+def open_pdf(pdf_path):
+    """경로면 파일을 열고, 메모리 내용이면 읽기용 스트림으로 감쌉니다."""
+    if isinstance(pdf_path, str):
+        return open(pdf_path, 'rb')
+    return io.BytesIO(pdf_path)
+
+
+def _extract_pypdf2(pdf_path, page_num, reader):
+    return reader.pages[page_num].extract_text() or ""
+
+
+def extract_with_pdfminer(pdf_path, page_num=None, reader=None):
+    """pdfminer.six를 사용하여 텍스트 추출 (page_num을 지정하면 해당 페이지만)"""
+    from pdfminer.high_level import extract_text as pdfminer_extract
+    try:
+        page_numbers = None if page_num is None else [page_num]
+        with open_pdf(pdf_path) as file:
+            return pdfminer_extract(file, page_numbers=page_numbers)
+    except Exception as e:
+        logger.warning("pdfminer 텍스트 추출 중 오류 발생: %s", e)
+        return ""
+
+
+def _pdfminer_available():
+    try:
+        import pdfminer.high_level  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("pdfminer.six가 설치되어 있지 않습니다. pip install pdfminer.six로 설치하세요.")
+        return False
+
+
+def _with_file_path(pdf_path, callback):
+    """파일 경로가 필요한 도구에 메모리 내용을 임시 파일로 전달합니다."""
+    if isinstance(pdf_path, str):
+        return callback(pdf_path)
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as tmp:
+        tmp.write(pdf_path)
+        tmp.flush()
+        return callback(tmp.name)
+
+
+def extract_with_external_tool(pdf_path, page_num=None, reader=None):
+    """외부 도구(예: pdftotext)를 사용하여 텍스트 추출 (page_num을 지정하면 해당 페이지만)"""
+    def run(path):
+        command = ['pdftotext']
+        if page_num is not None:
+            command += ['-f', str(page_num + 1), '-l', str(page_num + 1)]
+        # 출력 파일 대신 표준 출력('-')으로 결과를 받음
+        command += [path, '-']
+        try:
+            result = subprocess.run(command, check=True, capture_output=True)
+            return result.stdout.decode('utf-8', errors='ignore')
+        except (subprocess.SubprocessError, FileNotFoundError) as e:
+            logger.warning("외부 도구 실행 오류: %s", e)
+            return ""
+
+    return _with_file_path(pdf_path, run)
+
+
+def _pdftotext_available():
+    return shutil.which('pdftotext') is not None
+
+
+def extract_with_ocr(pdf_path, page_num, reader=None):
+    """페이지를 이미지로 렌더링한 뒤 Tesseract로 글자를 인식합니다."""
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    def run(path):
+        images = convert_from_path(path, dpi=Config.OCR_DPI, first_page=page_num + 1, last_page=page_num + 1)
+        return "\n".join(pytesseract.image_to_string(image, lang=Config.OCR_LANGUAGES) for image in images)
+
+    try:
+        return _with_file_path(pdf_path, run)
+    except Exception as e:
+        logger.warning("OCR 페이지 %d 처리 중 오류 발생: %s", page_num + 1, e)
+        return ""
+
+
+def _ocr_available():
+    """OCR은 선택 기능이므로 설정과 패키지, 실행 파일이 모두 있을 때만 사용합니다."""
+    if not Config.OCR_ENABLED:
+        return False
+    try:
+        import pytesseract  # noqa: F401
+        import pdf2image  # noqa: F401
+    except ImportError:
+        logger.warning("OCR 패키지가 없어 스캔 페이지는 건너뜁니다. pip install pytesseract pdf2image로 설치하세요.")
+        return False
+    if not shutil.which('tesseract') or not shutil.which('pdftoppm'):
+        logger.warning("tesseract 또는 pdftoppm 실행 파일이 없어 스캔 페이지는 건너뜁니다.")
+        return False
+    return True
+
+
+register_engine("pypdf2", _extract_pypdf2)
+register_engine("pdfminer", extract_with_pdfminer, _pdfminer_available)
+register_engine("pdftotext", extract_with_external_tool, _pdftotext_available)
+register_engine("ocr", extract_with_ocr, _ocr_available, lambda: f"{Config.OCR_LANGUAGES}@{Config.OCR_DPI}")
@@ -1,77 +1,277 @@
+import logging
 import PyPDF2
-import os
-import subprocess
-import tempfile
-from pathlib import Path
-
-def extract_text_from_pdf(pdf_path):
-    """PDF 파일에서 텍스트를 추출합니다. 여러 방법을 시도합니다."""
-    # 방법 1: PyPDF2 사용
-    text = extract_with_pypdf2(pdf_path)
-    if text and len(text.strip()) > 100:  # 충분한 텍스트가 추출되었는지 확인
-        return text
-    
-    # 방법 2: pdfminer 사용 (설치된 경우)
-    try:
-        text = extract_with_pdfminer(pdf_path)
-        if text and len(text.strip()) > 100:
-            return text
-    except ImportError:
-        print("pdfminer.six가 설치되어 있지 않습니다. pip install pdfminer.six로 설치하세요.")
-    
-    # 방법 3: 외부 도구 사용 (가능한 경우)
+import hashlib
+import threading
+import multiprocessing
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from src.utils.config import Config
+from src.pdf_processor import engines
+from src.pdf_processor.cache import file_sha256, get_cache
+from src.utils import metrics
+from src.utils.logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# 페이지 구분자 (chunker가 페이지 경계로 인식하는 폼 피드 포함)
+PAGE_SEPARATOR = "\n\f"
+
+# 페이지에서 이 길이 미만의 텍스트만 나오면 다음 추출기로 해당 페이지만 다시 시도
+MIN_PAGE_TEXT_LENGTH = 20
+
+# 문서 전체 텍스트가 이 길이 미만이면 추출 실패로 간주
+MIN_DOCUMENT_TEXT_LENGTH = 100
+
+EXTRACTION_FAILED_MESSAGE = "PDF에서 텍스트를 추출할 수 없습니다. 텍스트 기반 PDF인지 확인하세요."
+
+def extract_text_from_pdf(pdf_path, use_cache=True):
+    """
+    PDF 파일에서 텍스트를 추출합니다. 페이지 종류에 맞는 추출기를 골라 사용합니다.
+
+    같은 내용의 파일은 SHA-256 해시로 캐시를 조회하여 PDF를 다시 파싱하지 않습니다.
+    """
+    text, _ = extract_text_with_engine(pdf_path, use_cache)
+    return text
+
+def extract_text_with_engine(pdf_path, use_cache=True, sha256=None):
+    """
+    PDF 파일에서 텍스트를 추출하고, 어떤 추출기가 사용되었는지 함께 반환합니다.
+
+    문서 전체 결과와 별도로 추출기별 페이지 결과도 캐시하므로, 추출기 설정(OCR 언어 등)이
+    바뀌면 해당 추출기가 처리한 페이지만 다시 추출합니다.
+
+    Args:
+        pdf_path: PDF 파일 경로 또는 PDF 내용(bytes, mmap 등 bytes 유사 객체)
+        use_cache (bool): 추출 캐시 사용 여부
+        sha256 (str, optional): 이미 계산한 내용 해시 (업로드 수신 중 계산한 값 등)
+
+    Returns:
+        tuple: (추출 텍스트, 추출기 이름 또는 None)
+    """
+    if not use_cache:
+        return _extract_timed(pdf_path)
+
+    cache = get_cache()
+    if sha256:
+        key = sha256
+    elif isinstance(pdf_path, str):
+        key = file_sha256(pdf_path)
+    else:
+        key = hashlib.sha256(pdf_path).hexdigest()
+    entry = cache.get(key)
+    if entry is not None and entry.get('versions', {}) == _engine_versions(entry['extractor']):
+        metrics.CACHE_LOOKUPS.inc(cache="extraction", result="hit")
+        logger.info("추출 캐시 적중: %s (%s)", key[:12], entry['extractor'])
+        return entry['text'], entry['extractor']
+    metrics.CACHE_LOOKUPS.inc(cache="extraction", result="miss")
+
+    text, engine = _extract_timed(pdf_path, key)
+    if engine:  # 추출에 실패한 결과는 캐시하지 않음
+        cache.put_entry(key, {'text': text, 'extractor': engine, 'versions': _engine_versions(engine)})
+    return text, engine
+
+def _engine_versions(extractor):
+    """'+'로 이은 추출기 이름에서 기본값이 아닌 추출기 설정 버전만 모읍니다."""
+    versions = {}
+    for name in (extractor or "").split("+"):
+        engine = engines.ENGINES.get(name)
+        if engine and engine.version() != "1":
+            versions[name] = engine.version()
+    return versions
+
+def _extract_timed(pdf_path, cache_key=None):
+    """추출 시간을 사용된 추출기별로 기록하며 추출합니다."""
+    started = time.perf_counter()
+    text, engine = _extract_uncached(pdf_path, cache_key)
+    metrics.EXTRACTION_SECONDS.observe(time.perf_counter() - started, extractor=engine or "failed")
+    return text, engine
+
+def _extract_uncached(pdf_path, cache_key=None):
+    """
+    페이지 단위로 텍스트를 추출하여 (텍스트, 추출기 이름)을 반환합니다.
+
+    추출기 이름은 페이지별로 사용된 추출기를 사용 빈도순으로 '+'로 이은 값입니다
+    (예: "pypdf2", "pypdf2+ocr").
+    """
     try:
-        text = extract_with_external_tool(pdf_path)
-        if text and len(text.strip()) > 100:
-            return text
+        pages = extract_pages(pdf_path, cache_key)
     except Exception as e:
-        print(f"외부 도구 사용 중 오류: {e}")
-    
-    # 기본 PyPDF2 결과 반환 (위의 모든 방법이 실패한 경우)
-    return text or "PDF에서 텍스트를 추출할 수 없습니다. 텍스트 기반 PDF인지 확인하세요."
+        # PyPDF2가 문서 자체를 열지 못하면 문서 단위 추출기로 대체
+        logger.warning("PyPDF2 텍스트 추출 중 오류 발생: %s", e)
+        return _extract_whole_document(pdf_path)
 
-def extract_with_pypdf2(pdf_path):
-    """PyPDF2를 사용하여 텍스트 추출"""
+    text = PAGE_SEPARATOR.join(page_text for page_text, _ in pages)
+    if len(text.strip()) < MIN_DOCUMENT_TEXT_LENGTH:
+        return text if text.strip() else EXTRACTION_FAILED_MESSAGE, None
+
+    used = Counter(engine for page_text, engine in pages if engine)
+    return text, "+".join(engine for engine, _ in used.most_common())
+
+def _extract_whole_document(pdf_path):
+    """문서 전체를 pdfminer, pdftotext 순으로 추출합니다."""
     text = ""
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-        return text
-    except Exception as e:
-        print(f"PyPDF2 텍스트 추출 중 오류 발생: {e}")
-        return ""
+    for name in ("pdfminer", "pdftotext"):
+        engine = engines.ENGINES.get(name)
+        if engine is None or not engine.available:
+            continue
+        text = engine.extract(pdf_path, None, None)
+        if text and len(text.strip()) > MIN_DOCUMENT_TEXT_LENGTH:
+            return text, name
 
-def extract_with_pdfminer(pdf_path):
-    """pdfminer.six를 사용하여 텍스트 추출"""
-    from pdfminer.high_level import extract_text as pdfminer_extract
-    try:
-        return pdfminer_extract(pdf_path)
-    except Exception as e:
-        print(f"pdfminer 텍스트 추출 중 오류 발생: {e}")
-        return ""
+    return text or EXTRACTION_FAILED_MESSAGE, None
 
-def extract_with_external_tool(pdf_path):
-    """외부 도구(예: pdftotext)를 사용하여 텍스트 추출"""
-    # pdftotext가 설치되어 있는지 확인
-    try:
-        with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as tmp:
-            tmp_path = tmp.name
-        
-        # pdftotext 명령어 실행
-        subprocess.run(['pdftotext', pdf_path, tmp_path], check=True, capture_output=True)
-        
-        # 결과 읽기
-        with open(tmp_path, 'r', encoding='utf-8', errors='ignore') as file:
-            text = file.read()
-        
-        # 임시 파일 삭제
-        os.unlink(tmp_path)
-        return text
-    except (subprocess.SubprocessError, FileNotFoundError) as e:
-        print(f"외부 도구 실행 오류: {e}")
-        return "" 
\ No newline at end of file
+def extract_pages(pdf_path, cache_key=None):
+    """
+    모든 페이지의 텍스트를 페이지 순서대로 추출합니다.
+
+    먼저 페이지 리소스만 검사하여 페이지마다 추출 경로(engines.ROUTES)를 정하므로
+    스캔 페이지는 텍스트 추출기를 거치지 않고 바로 OCR로, 빈 페이지는 추출 없이
+    건너뜁니다. 추출할 페이지 수가 Config.EXTRACT_PARALLEL_MIN_PAGES 이상이면 페이지를
+    나누어 프로세스 풀(Config.EXTRACT_WORKERS개)에서 병렬로 추출합니다.
+
+    Args:
+        pdf_path: PDF 파일 경로 또는 PDF 내용
+        cache_key (str, optional): 추출기별 페이지 캐시 키 (없으면 캐시를 사용하지 않음)
+
+    Returns:
+        list: 페이지별 (텍스트, 추출기 이름 또는 None) 목록
+    """
+    with engines.open_pdf(pdf_path) as file:
+        profile, routes = engines.plan_routes(PyPDF2.PdfReader(file))
+    if profile == "scanned":
+        if engines.engines_for("image"):
+            logger.info("스캔 문서로 판단되어 %d개 페이지를 OCR로 추출합니다.", len(routes))
+        else:
+            logger.warning("스캔 문서로 판단되었지만 OCR을 사용할 수 없어 텍스트 추출을 건너뜁니다.")
+
+    pages = _load_page_cache(cache_key) if cache_key else {}
+    todo = []
+    for page_num, route in enumerate(routes):
+        if page_num in pages:
+            continue
+        if engines.engines_for(route):
+            todo.append((page_num, route))
+        else:
+            pages[page_num] = ("", None)  # 추출할 수단이 없는 페이지(빈 페이지 등)는 건너뜀
+
+    workers = min(Config.EXTRACT_WORKERS, len(todo))
+    if workers <= 1 or len(todo) < Config.EXTRACT_PARALLEL_MIN_PAGES:
+        extracted = extract_page_list(pdf_path, todo)
+    else:
+        # 연속된 페이지 묶음으로 나누어 작업자마다 한 번씩만 문서를 열도록 함
+        shard_size = -(-len(todo) // workers)
+        shards = [todo[start:start + shard_size] for start in range(0, len(todo), shard_size)]
+        if not isinstance(pdf_path, (str, bytes)):
+            pdf_path = bytes(pdf_path)  # mmap 등은 작업자 프로세스로 전달할 수 있도록 bytes로 변환
+        pool = _get_process_pool()
+        futures = [pool.submit(extract_page_list, pdf_path, shard) for shard in shards]
+        extracted = []
+        for future in futures:
+            extracted.extend(future.result())
+
+    new_pages = {page_num: result for (page_num, _), result in zip(todo, extracted)}
+    for _, engine in new_pages.values():
+        metrics.EXTRACTED_PAGES.inc(engine=engine or "none")
+    if cache_key:
+        _save_page_cache(cache_key, new_pages)
+    pages.update(new_pages)
+    return [pages[page_num] for page_num in range(len(routes))]
+
+def extract_page_list(pdf_path, todo):
+    """
+    주어진 페이지들의 텍스트를 추출합니다. 프로세스 풀 작업자에서 실행됩니다.
+
+    Args:
+        pdf_path: PDF 파일 경로 또는 PDF 내용
+        todo (list): (페이지 번호, 추출 경로) 목록
+
+    Returns:
+        list: todo 순서대로 (텍스트, 추출기 이름 또는 None) 목록
+    """
+    pages = []
+    with engines.open_pdf(pdf_path) as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page_num, route in todo:
+            pages.append(_extract_page(pdf_path, pdf_reader, page_num, route))
+    return pages
+
+def _extract_page(pdf_path, pdf_reader, page_num, route):
+    """
+    경로에 따라 추출기를 차례로 시도하여 충분한 텍스트가 나온 첫 결과를 사용합니다.
+
+    모두 부족하면 가장 긴 텍스트를 추출기 없이(None) 반환합니다 (이미지 페이지 등).
+    """
+    text = ""
+    for engine in engines.engines_for(route):
+        try:
+            candidate = engine.extract(pdf_path, page_num, pdf_reader) or ""
+        except Exception as e:
+            logger.warning("%s 페이지 %d 추출 중 오류 발생: %s", engine.name, page_num + 1, e)
+            continue
+        if len(candidate.strip()) >= MIN_PAGE_TEXT_LENGTH:
+            return candidate, engine.name
+        if len(candidate.strip()) > len(text.strip()):
+            text = candidate
+    return text, None
+
+def _load_page_cache(cache_key):
+    """추출기별 페이지 캐시를 읽어 {페이지 번호: (텍스트, 추출기 이름)}으로 합칩니다."""
+    cache = get_cache()
+    pages = {}
+    for engine in engines.ENGINES.values():
+        entry = cache.get(f"{cache_key}.{engine.name}")
+        if entry is None or entry.get('version') != engine.version():
+            continue
+        for page_num, text in entry['pages'].items():
+            pages[int(page_num)] = (text, engine.name)
+    return pages
+
+def _save_page_cache(cache_key, new_pages):
+    """새로 추출한 페이지를 추출기별 캐시 항목에 더합니다."""
+    by_engine = defaultdict(dict)
+    for page_num, (text, engine) in new_pages.items():
+        if engine:
+            by_engine[engine][str(page_num)] = text
+
+    cache = get_cache()
+    for name, pages in by_engine.items():
+        key = f"{cache_key}.{name}"
+        version = engines.ENGINES[name].version()
+        entry = cache.get(key)
+        if entry is not None and entry.get('version') == version:
+            pages = {**entry['pages'], **pages}
+        cache.put_entry(key, {'pages': pages, 'version': version})
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def _get_process_pool():
+    """
+    페이지 추출용 공용 프로세스 풀을 반환합니다 (요청마다 생성 비용을 치르지 않도록 재사용).
+
+    풀은 요청 스레드(gthread)와 LLM 호출 스레드가 도는 중에 처음 만들어지므로, 다른 스레드가
+    쥔 잠금까지 복제하는 fork 대신 spawn으로 새 인터프리터에서 작업자를 시작합니다.
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=Config.EXTRACT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=configure_logging
+                )
+    return _process_pool
+
+def shutdown_process_pool(wait=True):
+    """
+    공용 프로세스 풀의 작업자를 종료합니다 (gunicorn 작업자 종료 시 호출).
+
+    이후 병렬 추출이 필요하면 풀을 새로 만듭니다.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
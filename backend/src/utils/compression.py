@@ -0,0 +1,91 @@
+import logging
+import gzip
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 압축할 응답 형식 (이미 압축된 Excel 파일과 스트리밍 응답은 제외)
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain'}
+
+_brotli = None
+_brotli_loaded = False
+
+
+def _get_brotli():
+    """brotli 패키지가 설치되어 있으면 모듈을, 없으면 None을 반환합니다 (gzip만 사용)."""
+    global _brotli, _brotli_loaded
+    if not _brotli_loaded:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            logger.warning("brotli가 설치되어 있지 않아 gzip으로만 압축합니다. pip install brotli로 설치하세요.")
+            _brotli = None
+        _brotli_loaded = True
+    return _brotli
+
+
+def _accepted(accept_encoding):
+    """Accept-Encoding 헤더에서 q=0이 아닌 인코딩 이름 집합을 반환합니다."""
+    accepted = set()
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name.strip():
+            accepted.add(name.strip())
+    return accepted
+
+
+def negotiate(accept_encoding):
+    """클라이언트가 받을 수 있는 인코딩 중 br, gzip 순으로 고릅니다. 없으면 None."""
+    accepted = _accepted(accept_encoding)
+    if ("br" in accepted or "*" in accepted) and _get_brotli() is not None:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress_response(response, request):
+    """
+    GET 응답에 약한 ETag를 붙여 If-None-Match가 일치하면 304로 바꾸고, 본문이
+    Config.RESPONSE_COMPRESS_MIN_BYTES 이상이면 br 또는 gzip으로 압축합니다.
+
+    ETag는 압축 전 본문으로 계산하므로 인코딩과 관계없이 같은 값을 사용합니다.
+
+    Args:
+        response: Flask 응답
+        request: 현재 Flask 요청
+
+    Returns:
+        수정된 응답
+    """
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers):
+        return response
+
+    if request.method in ('GET', 'HEAD'):
+        response.add_etag(weak=True)
+        response.make_conditional(request)
+        if response.status_code != 200:
+            return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < Config.RESPONSE_COMPRESS_MIN_BYTES:
+        return response
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    if encoding == "br":
+        response.set_data(_get_brotli().compress(data, quality=Config.BROTLI_QUALITY))
+    elif encoding == "gzip":
+        response.set_data(gzip.compress(data, compresslevel=Config.GZIP_LEVEL, mtime=0))
+    else:
+        return response
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -1,4 +1,5 @@
 import os
+import logging
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -9,19 +10,119 @@ class Config:
     
     # API 설정
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")  # 기본값 설정
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "o3-mini")  # 추론 모델 (reasoning_effort 지원)
+    LLM_REASONING_EFFORT = os.getenv("LLM_REASONING_EFFORT", "medium")  # 추론 모델 기본 생성 깊이 (low, medium, high)
+    LLM_HARD_EFFORT = os.getenv("LLM_HARD_EFFORT", "high")  # 어려운 섹션에 쓸 생성 깊이
+    
+    # 섹션 난이도별 모델 라우팅 (단순한 섹션은 빠른 모델, 어려운 섹션은 높은 생성 깊이의 추론 모델)
+    LLM_ROUTING = os.getenv("LLM_ROUTING", "true").lower() == "true"
+    LLM_FAST_MODEL = os.getenv("LLM_FAST_MODEL", "gpt-4o-mini")  # 비우면 모든 섹션에 OPENAI_MODEL 사용
+    LLM_FAST_EFFORT = os.getenv("LLM_FAST_EFFORT", "")  # 빠른 모델도 추론 모델이면 생성 깊이 지정
+    LLM_ROUTE_FAST_BELOW = float(os.getenv("LLM_ROUTE_FAST_BELOW", "0.25"))  # 난이도 점수가 이보다 낮으면 빠른 모델
+    LLM_ROUTE_HARD_FROM = float(os.getenv("LLM_ROUTE_HARD_FROM", "0.6"))  # 난이도 점수가 이 이상이면 LLM_HARD_EFFORT
+    LLM_EFFORT_FALLBACK_SECONDS = float(os.getenv("LLM_EFFORT_FALLBACK_SECONDS", "60"))  # 마감까지 남은 시간이 이보다 짧으면 재시도 시 생성 깊이를 낮춤
+    LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() == "true"  # 테스트 케이스 JSON 스키마(strict)로 응답 형식 강제
+    LLM_CHUNK_DEADLINE = float(os.getenv("LLM_CHUNK_DEADLINE", "540"))  # 청크 하나의 재시도 포함 마감 시간 (초, 0이면 없음)
+    
+    # OpenAI 클라이언트 연결/재시도/요청 한도 설정
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "180"))  # 요청 타임아웃 (초)
+    OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))  # 연결 타임아웃 (초)
+    OPENAI_POOL_SIZE = int(os.getenv("OPENAI_POOL_SIZE", "20"))  # keep-alive 연결 풀 크기
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))  # 429/5xx 재시도 횟수
+    OPENAI_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "1"))  # 백오프 기본 대기 (초)
+    OPENAI_BACKOFF_MAX = float(os.getenv("OPENAI_BACKOFF_MAX", "30"))  # 백오프 최대 대기 (초)
+    OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))  # 분당 요청 수 한도 (0이면 제한 없음)
+    OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))  # 분당 토큰 수 한도 (0이면 제한 없음)
+    
+    # 긴 기획서 분할 생성 설정
+    LLM_CHUNK_CHARS = int(os.getenv("LLM_CHUNK_CHARS", "12000"))  # 청크 하나의 최대 글자 수
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # 동시 LLM 요청 수 상한
+    COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"  # 같은 문서의 동시 생성 요청을 한 번의 생성으로 합침
+    
+    # 프롬프트 토큰 예산 설정
+    LLM_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", "128000"))  # 모델 문맥 길이 (토큰)
+    LLM_COMPLETION_TOKENS = int(os.getenv("LLM_COMPLETION_TOKENS", "8000"))  # 응답용으로 예약하는 토큰 수
+    PROMPT_MAX_EXAMPLES = int(os.getenv("PROMPT_MAX_EXAMPLES", "3"))  # 청크마다 넣을 최대 예시 수
+    PROMPT_EXAMPLE_TOKENS = int(os.getenv("PROMPT_EXAMPLE_TOKENS", "1500"))  # 예시에 쓸 최대 토큰 수
+    EXAMPLE_LIBRARY_PATH = os.getenv(
+        "EXAMPLE_LIBRARY_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'llm', 'example_library.json')
+    )
+    
+    # 생성 후 거의 같은 테스트 케이스 처리 (merge: 제거, flag: Duplicate_Of 열에 표시, off: 사용 안 함)
+    DEDUP_MODE = os.getenv("DEDUP_MODE", "merge")
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))  # 중복으로 볼 자카드 유사도
+    
+    # 응답 크기 설정 (업로드는 문서 핸들과 미리보기만, 생성 결과는 첫 페이지만 응답)
+    UPLOAD_PREVIEW_CHARS = int(os.getenv("UPLOAD_PREVIEW_CHARS", "500"))  # 업로드 응답의 텍스트 미리보기 길이
+    RESPONSE_PAGE_SIZE = int(os.getenv("RESPONSE_PAGE_SIZE", "50"))  # 생성 응답에 포함할 케이스 수
+    RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))  # 이보다 작은 응답은 압축하지 않음
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))  # brotli 패키지가 있을 때만 사용
     
     # 파일 경로 설정
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
-    OUTPUT_FOLDER = os.path.join(BASE_DIR, 'output')
+    UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", os.path.join(BASE_DIR, 'uploads'))
+    OUTPUT_FOLDER = os.getenv("OUTPUT_FOLDER", os.path.join(BASE_DIR, 'output'))
+    CACHE_FOLDER = os.getenv("CACHE_FOLDER", os.path.join(BASE_DIR, 'cache'))
+    
+    # PDF 추출 캐시 설정 (파일 해시 기준, 크기 초과 시 LRU 삭제)
+    EXTRACTION_CACHE_DIR = os.path.join(CACHE_FOLDER, 'extraction')
+    EXTRACTION_CACHE_MAX_MB = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "256"))
+    
+    # 업로드 수신 및 파일 보존 설정
+    UPLOAD_SPOOL_MB = int(os.getenv("UPLOAD_SPOOL_MB", "8"))  # 이 크기까지는 업로드를 메모리에만 유지
+    FILE_RETENTION_HOURS = float(os.getenv("FILE_RETENTION_HOURS", "24"))  # 업로드/출력 파일 보존 기간
+    RETENTION_SWEEP_MINUTES = float(os.getenv("RETENTION_SWEEP_MINUTES", "10"))  # 정리 주기
+    
+    # PDF 페이지 병렬 추출 설정
+    EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(os.cpu_count() or 1)))  # 프로세스 수
+    EXTRACT_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACT_PARALLEL_MIN_PAGES", "16"))  # 병렬 추출 최소 페이지 수
+    EXTRACT_PRESCAN_PAGES = int(os.getenv("EXTRACT_PRESCAN_PAGES", "5"))  # 스캔 문서 판별용 표본 페이지 수
+    
+    # 스캔 페이지 OCR 설정 (pytesseract, pdf2image와 tesseract, pdftoppm 실행 파일이 있을 때만 사용)
+    OCR_ENABLED = os.getenv("OCR_ENABLED", "true").lower() == "true"
+    OCR_LANGUAGES = os.getenv("OCR_LANGUAGES", "kor+eng")  # Tesseract 언어
+    OCR_DPI = int(os.getenv("OCR_DPI", "300"))  # 페이지 렌더링 해상도
+    
+    # LLM 생성 결과 캐시 설정 (프롬프트 지문 기준, TTL 및 항목 수 제한)
+    GENERATION_CACHE_PATH = os.path.join(CACHE_FOLDER, 'generation.sqlite3')
+    GENERATION_CACHE_TTL_HOURS = float(os.getenv("GENERATION_CACHE_TTL_HOURS", "168"))
+    GENERATION_CACHE_MAX_ENTRIES = int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", "500"))
+    
+    # 문서별 섹션 지문과 섹션별 생성 결과 저장소 (개정판 업로드 시 변경된 섹션만 재생성)
+    SECTION_STORE_PATH = os.path.join(CACHE_FOLDER, 'sections.sqlite3')
+    SECTION_VERSIONS = int(os.getenv("SECTION_VERSIONS", "3"))  # 문서 이름별로 보관할 판(내용 해시) 수
+    
+    # 생성 결과 보관소 (문서, 생성 실행, 테스트 케이스를 누적 저장하고 검색, 캐시와 달리 정리하지 않음)
+    DATA_FOLDER = os.getenv("DATA_FOLDER", os.path.join(BASE_DIR, 'data'))
+    CASE_STORE_PATH = os.path.join(DATA_FOLDER, 'test_cases.sqlite3')
+    # 업로드만 하고 생성하지 않은 문서의 추출 텍스트 보존 기간 (생성 실행이 있는 문서는 보존)
+    DOCUMENT_TEXT_RETENTION_HOURS = float(os.getenv("DOCUMENT_TEXT_RETENTION_HOURS", "24"))
+    
+    # 백그라운드 생성 작업 대기열 설정
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))  # 작업자 스레드 수
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "32"))  # 대기 가능한 최대 작업 수
+    JOB_RETENTION_MINUTES = int(os.getenv("JOB_RETENTION_MINUTES", "60"))  # 완료 작업 보존 시간
+    
+    # 운영 서버(gunicorn) 설정 - gunicorn.conf.py에서 사용
+    # LLM 호출은 I/O 대기이므로 프로세스 하나에 스레드를 많이 두고, 작업 대기열과 지표가
+    # 프로세스별로 유지되므로 기본 작업자 프로세스는 1개
+    WEB_BIND = os.getenv("WEB_BIND", "0.0.0.0:5000")
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))  # 작업자 프로세스 수
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "32"))  # 작업자당 동시 요청 수 (SSE 스트림도 하나씩 차지)
+    WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", "600"))  # 응답 없는 작업자를 재시작하기까지의 시간 (초)
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "300"))  # 종료 시 진행 중 생성을 기다리는 시간 (초)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    FLASK_DEBUG = os.getenv("FLASK_DEBUG", "false").lower() == "true"  # 개발 서버 디버거/리로더
     
     @classmethod
     def init_app(cls):
         """필수 설정 값 검증"""
         if not cls.OPENAI_API_KEY:
-            print("경고: OPENAI_API_KEY가 설정되지 않았습니다. 테스트 모드로 동작합니다.")
+            logging.getLogger(__name__).warning("OPENAI_API_KEY가 설정되지 않았습니다. 테스트 모드로 동작합니다.")
         
         # 필요한 디렉토리 생성
         os.makedirs(cls.UPLOAD_FOLDER, exist_ok=True)
-        os.makedirs(cls.OUTPUT_FOLDER, exist_ok=True) 
\ No newline at end of file
+        os.makedirs(cls.OUTPUT_FOLDER, exist_ok=True)
+        os.makedirs(cls.CACHE_FOLDER, exist_ok=True) 
\ No newline at end of file
@@ -0,0 +1,154 @@
+import logging
+import time
+import uuid
+import queue
+import threading
+from src.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 작업을 더 받을 수 없을 때 발생합니다."""
+
+
+class JobQueue:
+    """
+    프로세스 내 백그라운드 작업 대기열
+
+    고정 크기의 작업자 스레드가 대기열에서 작업을 꺼내 실행하며, 대기 중인 작업 수가
+    상한을 넘으면 제출을 거부합니다. 완료된 작업은 보존 시간이 지나면 정리됩니다.
+    """
+
+    def __init__(self, workers, max_queued, retention_seconds):
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        for index in range(workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        작업을 대기열에 넣고 작업 ID를 바로 반환합니다.
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        if self._closed:
+            raise QueueFullError("서버가 종료 중이라 작업을 받을 수 없습니다")
+        self._prune()
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'status': 'queued',
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        try:
+            self._queue.put_nowait((job_id, func, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job_id]
+            raise QueueFullError("대기 중인 작업이 너무 많습니다")
+        return job_id
+
+    def drain(self, timeout):
+        """
+        새 작업을 더 받지 않고 대기/실행 중인 작업이 끝날 때까지 최대 timeout초 기다립니다.
+
+        작업자 스레드는 데몬 스레드이므로, 프로세스 종료 전에 호출하지 않으면 진행 중인
+        생성이 중간에 끊깁니다.
+
+        Returns:
+            bool: 시간 안에 모든 작업이 끝났는지 여부
+        """
+        self._closed = True
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def get(self, job_id):
+        """작업 상태의 사본을 반환합니다. 없는 작업이면 None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self):
+        """대기/실행 중 작업 수 등 대기열 상태를 반환합니다."""
+        with self._lock:
+            statuses = [job['status'] for job in self._jobs.values()]
+        return {
+            'workers': self.workers,
+            'max_queued': self._queue.maxsize,
+            'queued': statuses.count('queued'),
+            'running': statuses.count('running')
+        }
+
+    def _work(self):
+        while True:
+            job_id, func, args, kwargs = self._queue.get()
+            self._update(job_id, status='running', started_at=time.time())
+            try:
+                result = func(*args, **kwargs)
+                self._update(job_id, status='succeeded', result=result, finished_at=time.time())
+            except Exception as e:
+                logger.exception("작업 %s 실패", job_id)
+                self._update(job_id, status='failed', error=str(e), finished_at=time.time())
+            finally:
+                self._queue.task_done()
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job.update(fields)
+
+    def _prune(self):
+        """보존 시간이 지난 완료 작업을 정리합니다."""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['finished_at'] and job['finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def drain_job_queue(timeout):
+    """공용 작업 대기열이 만들어졌으면 남은 작업을 마칠 때까지 기다립니다 (종료 처리용)."""
+    if _job_queue is None:
+        return True
+    return _job_queue.drain(timeout)
+
+
+def get_job_queue():
+    """설정값으로 생성한 공용 작업 대기열을 반환합니다."""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue(
+                    Config.JOB_WORKERS,
+                    Config.JOB_QUEUE_SIZE,
+                    Config.JOB_RETENTION_MINUTES * 60
+                )
+    return _job_queue
@@ -0,0 +1,20 @@
+import logging
+from src.utils.config import Config
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(process)d:%(threadName)s] %(name)s: %(message)s"
+
+_configured = False
+
+
+def configure_logging():
+    """
+    Config.LOG_LEVEL 수준으로 루트 로거를 설정합니다 (여러 번 호출해도 한 번만 적용).
+
+    gunicorn으로 실행하면 gunicorn 자체 로그와 같은 표준 오류로 출력되며, 요청별 상세
+    로그는 DEBUG 수준이므로 LOG_LEVEL=DEBUG일 때만 보입니다.
+    """
+    global _configured
+    if _configured:
+        return
+    logging.basicConfig(level=Config.LOG_LEVEL, format=LOG_FORMAT)
+    _configured = True
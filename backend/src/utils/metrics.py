@@ -0,0 +1,250 @@
+import logging
+import time
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 기본 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# 업로드 크기 구간 (바이트, 64KB ~ 64MB)
+SIZE_BUCKETS = tuple(64 * 1024 * 4 ** i for i in range(6))
+
+# 토큰 수 구간
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """레이블 값 조합별로 값을 보관하는 지표의 공통 부분"""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.labelnames and self.kind != "histogram":
+            self._values[()] = 0  # 레이블 없는 지표는 관측 전에도 0으로 노출
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 지표의 레이블은 {self.labelnames} 이어야 합니다")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """증가만 하는 누적 지표"""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """현재 값을 나타내는 지표 (진행 중인 요청 수, 비율 등)"""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        """블록이 실행되는 동안 값을 1 올려 둡니다."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """관측값을 구간별로 누적하는 지표 (Prometheus의 _bucket/_sum/_count 형식)"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """블록의 실행 시간(초)을 관측합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_sample(self, key, state):
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """지표 목록을 보관하고 Prometheus 텍스트 형식으로 출력합니다."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """출력 직전에 호출할 함수를 등록합니다 (비율 등 계산 값 갱신용)."""
+        self._collectors.append(collector)
+
+    def render(self):
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("지표 수집 중 오류")
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# HTTP
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "tc_http_requests_in_flight", "처리 중인 HTTP 요청 수", ["endpoint"]))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "tc_http_request_seconds", "HTTP 요청 처리 시간 (스트리밍 응답은 전송 완료까지)", ["endpoint", "status"]))
+
+# 업로드 / 추출
+UPLOAD_SIZE_BYTES = REGISTRY.register(Histogram(
+    "tc_upload_size_bytes", "업로드된 PDF 크기", buckets=SIZE_BUCKETS))
+EXTRACTION_SECONDS = REGISTRY.register(Histogram(
+    "tc_extraction_seconds", "PDF 텍스트 추출 시간 (사용된 추출기별, 실패는 failed)", ["extractor"]))
+EXTRACTED_PAGES = REGISTRY.register(Counter(
+    "tc_extraction_pages_total", "추출기별로 처리한 페이지 수 (텍스트를 얻지 못한 페이지는 none)", ["engine"]))
+
+# LLM
+LLM_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "tc_llm_requests_in_flight", "진행 중인 LLM 요청 수"))
+LLM_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "tc_llm_request_seconds", "LLM 요청 시간 (스트리밍은 마지막 조각까지)", ["mode", "outcome"]))
+LLM_RETRIES = REGISTRY.register(Counter(
+    "tc_llm_retries_total", "일시 오류로 인한 LLM 재시도 횟수"))
+LLM_PROMPT_TOKENS = REGISTRY.register(Histogram(
+    "tc_llm_prompt_tokens", "요청당 프롬프트 토큰 수", buckets=TOKEN_BUCKETS))
+LLM_COMPLETION_TOKENS = REGISTRY.register(Histogram(
+    "tc_llm_completion_tokens", "요청당 완성 토큰 수", buckets=TOKEN_BUCKETS))
+LLM_ROUTED_CHUNKS = REGISTRY.register(Counter(
+    "tc_llm_routed_chunks_total", "난이도 라우팅으로 경로가 정해진 청크 수 (fast, reasoning, reasoning_high)", ["route"]))
+LLM_ROUTE_SECONDS = REGISTRY.register(Histogram(
+    "tc_llm_route_request_seconds", "경로별 LLM 요청 시간 (재시도 대기 포함)", ["route", "outcome"]))
+LLM_ROUTE_TOKENS = REGISTRY.register(Counter(
+    "tc_llm_route_tokens_total", "경로별 토큰 사용량", ["route", "kind"]))
+LLM_ESCALATIONS = REGISTRY.register(Counter(
+    "tc_llm_escalations_total", "빠른 모델의 응답을 쓸 수 없어 추론 모델로 다시 생성한 청크 수"))
+LLM_EFFORT_FALLBACKS = REGISTRY.register(Counter(
+    "tc_llm_effort_fallbacks_total", "마감이 가까워 생성 깊이를 낮춰 재시도한 횟수 (낮춘 뒤의 생성 깊이별)", ["effort"]))
+JSON_REPAIRS = REGISTRY.register(Counter(
+    "tc_json_repairs_total", "JSON 복구 경로 사용 횟수 (salvaged: 부분 복구, continuation: 이어쓰기 요청)", ["kind"]))
+DUPLICATE_CASES = REGISTRY.register(Counter(
+    "tc_duplicate_cases_total", "거의 같은 테스트 케이스 수 (merged: 제거, flagged: 표시)", ["action"]))
+COALESCED_REQUESTS = REGISTRY.register(Counter(
+    "tc_coalesced_requests_total", "진행 중인 같은 생성에 합쳐져 LLM을 호출하지 않은 요청 수", ["mode"]))
+GENERATIONS = REGISTRY.register(Counter(
+    "tc_generations_total", "테스트 케이스 생성 결과 (llm, cache, fallback: 예시 데이터로 대체)", ["source"]))
+
+# Excel
+EXCEL_RENDER_SECONDS = REGISTRY.register(Histogram(
+    "tc_excel_render_seconds", "Excel 파일 생성 시간"))
+
+# 캐시
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "tc_cache_lookups_total", "캐시 조회 횟수", ["cache", "result"]))
+CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    "tc_cache_hit_ratio", "캐시 적중률 (프로세스 시작 이후)", ["cache"]))
+
+
+def _update_hit_ratios():
+    for cache in ("extraction", "generation"):
+        hits = CACHE_LOOKUPS.value(cache=cache, result="hit")
+        misses = CACHE_LOOKUPS.value(cache=cache, result="miss")
+        CACHE_HIT_RATIO.set(hits / (hits + misses) if hits + misses else 0.0, cache=cache)
+
+
+REGISTRY.add_collector(_update_hit_ratios)
+
+
+def render():
+    """모든 지표를 Prometheus 텍스트 형식으로 반환합니다."""
+    return REGISTRY.render()
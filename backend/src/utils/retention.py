@@ -0,0 +1,58 @@
+import logging
+import os
+import time
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def purge_old_files(folder, max_age_seconds):
+    """
+    폴더에서 수정된 지 max_age_seconds가 지난 파일을 삭제합니다.
+
+    Returns:
+        int: 삭제한 파일 수
+    """
+    if not os.path.isdir(folder):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for entry in os.scandir(folder):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError as e:
+            logger.warning("보존 기간 지난 파일 삭제 실패 (%s): %s", entry.path, e)
+    return removed
+
+
+def start_retention_sweeper(folders, max_age_seconds, interval_seconds, purgers=()):
+    """
+    주기적으로 폴더들의 오래된 파일을 삭제하는 백그라운드 스레드를 시작합니다.
+
+    Args:
+        folders (list): 정리할 폴더 목록 (업로드, 출력 폴더 등)
+        max_age_seconds (float): 파일 보존 기간
+        interval_seconds (float): 정리 주기
+        purgers (list): 같은 주기로 실행할 (이름, 함수) 목록. 함수는 삭제한 항목 수를 반환
+    """
+    def sweep():
+        while True:
+            for folder in folders:
+                removed = purge_old_files(folder, max_age_seconds)
+                if removed:
+                    logger.info("보존 기간이 지난 파일 %d개 삭제: %s", removed, folder)
+            for name, purge in purgers:
+                try:
+                    removed = purge()
+                except Exception:
+                    logger.exception("보존 기간 정리 실패 (%s)", name)
+                    continue
+                if removed:
+                    logger.info("보존 기간이 지난 항목 %d개 삭제: %s", removed, name)
+            time.sleep(interval_seconds)
+
+    thread = threading.Thread(target=sweep, name="retention-sweeper", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# backend 디렉토리에서 실행하는 앱과 같이 src 패키지를 임포트할 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
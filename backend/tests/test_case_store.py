@@ -0,0 +1,29 @@
+from src.llm.case_store import CaseStore
+
+
+def _store(tmp_path):
+    return CaseStore(str(tmp_path / "test_cases.sqlite3"))
+
+
+def test_upload_only_documents_are_listed(tmp_path):
+    store = _store(tmp_path)
+    store.save_document("hash-upload", "업로드만 한 문서", name="upload.pdf")
+    store.record_run([{"TID": "TC001"}], "hash-run", name="run.pdf")
+
+    items = store.list_documents()["items"]
+    assert [(item["name"], item["run_count"]) for item in items] == [("run.pdf", 1), ("upload.pdf", 0)]
+
+
+def test_purge_removes_only_expired_texts_without_runs(tmp_path):
+    store = _store(tmp_path)
+    store.save_document("hash-upload", "업로드만 한 문서", name="upload.pdf")
+    store.save_document("hash-run", "생성한 문서", name="run.pdf")
+    store.record_run([{"TID": "TC001"}], "hash-run")
+
+    assert store.purge_unused_texts(3600) == 0
+    assert store.document_text("hash-upload") == "업로드만 한 문서"
+
+    assert store.purge_unused_texts(-1) == 1
+    assert store.document_text("hash-upload") is None
+    assert store.document_text("hash-run") == "생성한 문서"
+    assert [item["name"] for item in store.list_documents()["items"]] == ["run.pdf"]
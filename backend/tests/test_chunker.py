@@ -0,0 +1,26 @@
+from src.llm import chunker
+
+
+def _document(count, size=300):
+    return "\n\n".join(f"# {index}. 섹션 {index}\n" + f"규칙 {index}. " * size for index in range(1, count + 1))
+
+
+def test_content_boundaries_only_apply_to_tracked_documents(monkeypatch):
+    # 모든 섹션을 경계로 만들어 경계에서 끊는지가 결과에 드러나게 함
+    monkeypatch.setattr(chunker, "_is_boundary", lambda section: True)
+    text = _document(8, size=100)
+    max_chars = 8000
+
+    packed = chunker.chunk_text(text, max_chars)
+    stable = chunker.chunk_text(text, max_chars, stable_boundaries=True)
+
+    assert len(packed) < len(stable)
+    assert all(len(chunk) >= max_chars * chunker.BOUNDARY_MIN_FILL for chunk in stable[:-1])
+
+
+def test_chunks_keep_every_section():
+    text = _document(12)
+    for stable in (False, True):
+        chunks = chunker.chunk_text(text, 6000, stable_boundaries=stable)
+        assert all(len(chunk) <= 6000 for chunk in chunks)
+        assert chunker.normalize(" ".join(chunks)) == chunker.normalize(" ".join(chunker.split_sections(text)))
@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from src.llm import client
+from src.utils.config import Config
+
+
+class FakeTime:
+    """client 모듈의 time을 대신하는 가짜 시계 (sleep은 시계만 앞당김)."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(client, "time", fake)
+    return fake
+
+
+def _rate_limit_error(headers):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after-ms": "1500"}, 1.5),
+    ({"retry-after": "2"}, 2.0),
+    ({"retry-after-ms": "250", "retry-after": "2"}, 0.25),
+])
+def test_retry_delay_follows_retry_after_headers(headers, expected):
+    assert client.retry_delay(0, _rate_limit_error(headers)) == expected
+
+
+@pytest.mark.parametrize("error", [None, _rate_limit_error({}), _rate_limit_error({"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"})])
+def test_retry_delay_falls_back_to_jittered_backoff(monkeypatch, error):
+    monkeypatch.setattr(Config, "OPENAI_BACKOFF_BASE", 1.0)
+    monkeypatch.setattr(Config, "OPENAI_BACKOFF_MAX", 3.0)
+    for attempt in range(5):
+        assert 0 <= client.retry_delay(attempt, error) <= min(3.0, 2 ** attempt)
+
+
+def test_token_bucket_waits_for_refill(clock):
+    bucket = client.TokenBucket(60)  # 초당 1개
+    bucket.acquire(60)
+    assert clock.sleeps == []
+    bucket.acquire(3)
+    assert sum(clock.sleeps) == pytest.approx(3.0)
+
+
+def test_token_bucket_caps_request_and_refill_at_capacity(clock):
+    bucket = client.TokenBucket(60)
+    clock.now += 600
+    bucket.acquire(1000)  # 용량보다 큰 요청은 용량만큼만 기다림
+    assert clock.sleeps == []
+    bucket.acquire(1)
+    assert sum(clock.sleeps) == pytest.approx(1.0)
+
+
+def test_token_bucket_adjust_returns_or_charges_difference(clock):
+    bucket = client.TokenBucket(60)
+    bucket.acquire(60)
+    bucket.adjust(-30)  # 추정보다 30개 덜 씀
+    bucket.acquire(30)
+    assert clock.sleeps == []
+    bucket.adjust(10)  # 추정보다 10개 더 씀
+    bucket.acquire(1)
+    assert sum(clock.sleeps) == pytest.approx(11.0)
+
+
+def test_disabled_limits_never_wait(clock):
+    limiter = client.RateLimiter(0, 0)
+    for _ in range(100):
+        limiter.acquire(10 ** 6)
+    limiter.record_usage(10 ** 6, 0)
+    assert clock.sleeps == []
+
+
+def _chunk(content=None, finish_reason=None, usage=None):
+    choices = [] if usage else [SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def test_stream_usage_reconciles_estimate(monkeypatch, clock):
+    limiter = client.RateLimiter(0, 600)  # 초당 토큰 10개
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        return iter([
+            _chunk("[]"), _chunk(finish_reason="stop"),
+            _chunk(usage=SimpleNamespace(prompt_tokens=80, completion_tokens=20, total_tokens=100)),
+        ])
+
+    monkeypatch.setattr(client, "get_client", lambda: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    monkeypatch.setattr(client, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(client, "estimate_tokens", lambda messages, max_tokens: 500)
+
+    events = list(client.create_chat_completion(model="m", messages=[], stream=True))
+    assert len(events) == 3
+    assert requests[0]["stream_options"] == {"include_usage": True}
+    # 추정치 500 중 쓰지 않은 400이 돌아와 남은 토큰이 500개가 됨
+    limiter.acquire(500)
+    assert clock.sleeps == []
+    limiter.acquire(1)
+    assert sum(clock.sleeps) == pytest.approx(0.1)
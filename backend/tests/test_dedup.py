@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from src.llm import dedup
+
+np = pytest.importorskip("numpy")
+
+CASES = [
+    {"Test_Step": "1. 로그인 버튼 클릭", "Expected_Result": "2) 메인 화면 표시"},
+    {"Test_Step": "１. 로그인 버튼 클릭 ✅", "Expected_Result": "٣- 완료 메시지 표시"},
+    {"Test_Step": "İstanbul 지점 선택 😀", "Expected_Result": "ΟΔΟΣ 표시\n𝟏. 𝐀𝐁𝐂 항목 확인"},
+    {"Test_Step": "", "Expected_Result": None},
+    {"Test_Step": "   \n  - : 12", "Expected_Result": "ǅ Straße ﬁle_name"},
+]
+
+
+def _random_text(rng):
+    alphabet = "0１٣𝟏 \t\n.)-:_aZİΣσẞ가힣😀𐐀✅,!"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+
+
+def _split(test_cases):
+    codes, lengths = dedup._normalized_codes(test_cases)
+    ends = np.cumsum(lengths)
+    return ["".join(map(chr, codes[end - length:end].tolist())) for end, length in zip(ends, lengths)]
+
+
+def test_numpy_normalization_matches_case_text():
+    assert _split(CASES) == [dedup.case_text(case) for case in CASES]
+
+
+def test_numpy_normalization_matches_case_text_on_random_text():
+    rng = random.Random(0)
+    cases = [{"Test_Step": _random_text(rng), "Expected_Result": _random_text(rng)} for _ in range(300)]
+    assert _split(cases) == [dedup.case_text(case) for case in cases]
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from src.utils import jobs
+
+
+def _wait_for(job_queue, job_id, *statuses):
+    deadline = time.monotonic() + 5
+    while job_queue.get(job_id)["status"] not in statuses and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job_queue.get(job_id)
+
+
+def test_submit_runs_job_and_keeps_result():
+    job_queue = jobs.JobQueue(workers=1, max_queued=4, retention_seconds=60)
+    job_id = job_queue.submit(lambda a, b=0: a + b, 2, b=3)
+    job = _wait_for(job_queue, job_id, "succeeded")
+    assert job["status"] == "succeeded"
+    assert job["result"] == 5
+    assert job["error"] is None
+    assert job["started_at"] <= job["finished_at"]
+    assert job_queue.get("missing") is None
+
+
+def test_failing_job_records_error_and_worker_keeps_running():
+    job_queue = jobs.JobQueue(workers=1, max_queued=4, retention_seconds=60)
+
+    def fail():
+        raise ValueError("생성 실패")
+
+    failed = job_queue.submit(fail)
+    succeeded = job_queue.submit(lambda: "ok")
+    assert job_queue.drain(5)
+    assert job_queue.get(failed)["status"] == "failed"
+    assert job_queue.get(failed)["error"] == "생성 실패"
+    assert job_queue.get(succeeded)["result"] == "ok"
+
+
+def test_status_and_stats_follow_running_job():
+    job_queue = jobs.JobQueue(workers=1, max_queued=4, retention_seconds=60)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocked():
+        started.set()
+        release.wait(5)
+
+    running = job_queue.submit(blocked)
+    assert started.wait(5)
+    queued = job_queue.submit(lambda: None)
+    assert job_queue.get(running)["status"] == "running"
+    assert job_queue.get(queued)["status"] == "queued"
+    assert job_queue.stats() == {"workers": 1, "max_queued": 4, "queued": 1, "running": 1}
+    release.set()
+    assert job_queue.drain(5)
+
+
+def test_submit_rejects_when_queue_is_full():
+    job_queue = jobs.JobQueue(workers=1, max_queued=1, retention_seconds=60)
+    started = threading.Event()
+    release = threading.Event()
+    job_queue.submit(lambda: (started.set(), release.wait(5)))
+    assert started.wait(5)
+    job_queue.submit(lambda: None)
+    with pytest.raises(jobs.QueueFullError):
+        job_queue.submit(lambda: None)
+    assert job_queue.stats()["queued"] == 1
+    release.set()
+    assert job_queue.drain(5)
+
+
+def test_drain_waits_for_job_finishing_during_drain():
+    job_queue = jobs.JobQueue(workers=1, max_queued=4, retention_seconds=60)
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.2)
+        return "done"
+
+    running = job_queue.submit(slow)
+    queued = job_queue.submit(lambda: "next")
+    assert started.wait(5)
+    assert job_queue.drain(5)
+    assert job_queue.get(running)["result"] == "done"
+    assert job_queue.get(queued)["result"] == "next"
+    # 종료 중에는 새 작업을 받지 않음
+    with pytest.raises(jobs.QueueFullError):
+        job_queue.submit(lambda: None)
+
+
+def test_drain_times_out_while_job_is_running():
+    job_queue = jobs.JobQueue(workers=1, max_queued=4, retention_seconds=60)
+    release = threading.Event()
+    job_id = job_queue.submit(release.wait, 5)
+    assert not job_queue.drain(0.05)
+    release.set()
+    assert job_queue.drain(5)
+    assert job_queue.get(job_id)["status"] == "succeeded"
+
+
+def test_finished_jobs_are_pruned_after_retention():
+    job_queue = jobs.JobQueue(workers=1, max_queued=4, retention_seconds=0)
+    job_id = job_queue.submit(lambda: None)
+    assert _wait_for(job_queue, job_id, "succeeded")["status"] == "succeeded"
+    time.sleep(0.01)
+    job_queue.submit(lambda: None)
+    assert job_queue.get(job_id) is None
+    assert job_queue.drain(5)
+
+
+def test_drain_job_queue_drains_shared_queue(monkeypatch):
+    # gunicorn worker_exit가 사용하는 경로
+    monkeypatch.setattr(jobs, "_job_queue", None)
+    assert jobs.drain_job_queue(0)
+
+    job_queue = jobs.JobQueue(workers=1, max_queued=4, retention_seconds=60)
+    monkeypatch.setattr(jobs, "_job_queue", job_queue)
+    job_id = job_queue.submit(time.sleep, 0.1)
+    assert jobs.drain_job_queue(5)
+    assert job_queue.get(job_id)["status"] == "succeeded"
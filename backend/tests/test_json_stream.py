@@ -0,0 +1,31 @@
+import pytest
+
+from src.llm import json_stream
+
+RESPONSE = '```json\n{"test_cases": [{"TID": "A-1", "Test_Step": "로그인 [확인] 클릭"}, {"TID": "A-2", "Test_Step": "\\"}\\" 입력"}]}\n```'
+
+
+def test_parser_returns_objects_across_pieces():
+    parser = json_stream.TestCaseStreamParser()
+    cases = []
+    for start in range(0, len(RESPONSE), 7):
+        cases += parser.feed(RESPONSE[start:start + 7])
+    assert [case["TID"] for case in cases] == ["A-1", "A-2"]
+    assert cases[1]["Test_Step"] == '"}" 입력'
+    assert parser.started and parser.complete
+
+
+def test_salvage_keeps_objects_closed_before_truncation():
+    cases, complete = json_stream.salvage_test_cases('설명입니다.\n[{"TID": "A-1"}, {"TID": "A-2"}, {"TID": "A-')
+    assert [case["TID"] for case in cases] == ["A-1", "A-2"]
+    assert not complete
+
+
+def test_salvage_truncated_inside_first_object():
+    assert json_stream.salvage_test_cases('[{"TID": "A-1", "Test_Step": "클릭 [') == ([], False)
+
+
+@pytest.mark.parametrize("text", ["", "응답할 수 없습니다.", '{"TID": "A-1", "Test_Step": "클릭"}', '{"TID": "A-'])
+def test_salvage_rejects_text_without_array(text):
+    with pytest.raises(ValueError):
+        json_stream.salvage_test_cases(text)
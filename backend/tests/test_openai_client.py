@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from src.llm import openai_client, router, schema
+
+CASE = '{"TID": "A-1", "Test_Step": "로그인 버튼 클릭", "Expected_Result": "메인 화면 표시"}'
+ROUTE = router.Route("fast", "test-model", None)
+
+
+def _stream(*pieces, finish_reason="stop"):
+    events = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece), finish_reason=None)])
+              for piece in pieces]
+    events.append(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None), finish_reason=finish_reason)]))
+    return iter(events)
+
+
+def _fake_completions(monkeypatch, responses):
+    requests = []
+
+    def create_chat_completion(**kwargs):
+        requests.append(kwargs)
+        return responses[len(requests) - 1]
+
+    monkeypatch.setattr(openai_client.client, "create_chat_completion", create_chat_completion)
+    return requests
+
+
+def test_stream_truncated_before_array_continues(monkeypatch):
+    requests = _fake_completions(monkeypatch, [
+        _stream('{"test_cases": ', finish_reason="length"),
+        _stream('{"test_cases": [', CASE, "]}"),
+    ])
+    cases = list(openai_client._stream_with_route("prompt", ROUTE))
+    assert [case["TID"] for case in cases] == ["A-1"]
+    assert set(cases[0]) == set(schema.TEST_CASE_FIELDS)
+    assert len(requests) == 2
+
+
+def test_stream_truncated_single_object_is_used(monkeypatch):
+    # 배열 없이 단일 객체로 응답하고 길이 제한으로 끝난 경우에도 받은 텍스트를 해석함
+    requests = _fake_completions(monkeypatch, [_stream(CASE[:30], CASE[30:], finish_reason="length")])
+    cases = list(openai_client._stream_with_route("prompt", ROUTE))
+    assert [case["TID"] for case in cases] == ["A-1"]
+    assert len(requests) == 1
+
+
+def test_stream_truncated_on_every_attempt_ends_without_cases(monkeypatch):
+    _fake_completions(monkeypatch, [
+        _stream('{"TID": "A-', finish_reason="length") for _ in range(openai_client.MAX_CONTINUATIONS + 1)
+    ])
+    assert list(openai_client._stream_with_route("prompt", ROUTE)) == []
+
+
+def test_blocking_truncated_single_object_is_used(monkeypatch):
+    message = SimpleNamespace(content=CASE, refusal=None)
+    response = SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="length")])
+    requests = _fake_completions(monkeypatch, [response])
+    assert [case["TID"] for case in openai_client._generate_with_route("prompt", ROUTE)] == ["A-1"]
+    assert len(requests) == 1
@@ -0,0 +1,25 @@
+from src.llm import router
+
+
+def test_ascii_keywords_match_whole_words_only():
+    text = "notification modify statement elsewhere whenever untilted retrying"
+    assert router.KEYWORD_PATTERN.findall(text) == []
+
+
+def test_ascii_keywords_match_as_words():
+    text = "If the state changes, retry until timeout."
+    assert [match.lower() for match in router.KEYWORD_PATTERN.findall(text)] == [
+        "if", "state", "retry", "until", "timeout"
+    ]
+
+
+def test_korean_keywords_match_with_particles():
+    text = "상태가 바뀌면 재시도하고, 조건이면 대기합니다."
+    assert router.KEYWORD_PATTERN.findall(text) == ["상태", "재시도", "조건", "이면", "대기"]
+
+
+def test_ascii_substrings_keep_plain_text_on_fast_route(monkeypatch):
+    monkeypatch.setattr(router.Config, "LLM_ROUTING", True)
+    monkeypatch.setattr(router.Config, "LLM_FAST_MODEL", "fast-model")
+    text = "The notification lets players modify the statement. " * 10
+    assert router.choose(text).name == "fast"
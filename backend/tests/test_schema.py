@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from src.llm import schema
+
+
+def _record(**values):
+    return {field: values.get(field, "") for field in schema.TEST_CASE_FIELDS}
+
+
+def test_schema_record_is_returned_as_is():
+    record = _record(TID="A-1", Test_Step="클릭")
+    assert schema.to_record(record) is record
+
+
+def test_missing_keys_are_filled_with_empty_strings():
+    record = schema.to_record({"TID": "A-1", "Test_Step": "클릭"})
+    assert list(record) == list(schema.TEST_CASE_FIELDS)
+    assert record == _record(TID="A-1", Test_Step="클릭")
+
+
+def test_extra_keys_are_dropped():
+    record = schema.to_record({**_record(TID="A-1"), "Priority": "High", "source": "llm"})
+    assert set(record) == set(schema.TEST_CASE_FIELDS)
+    assert record["TID"] == "A-1"
+
+
+def test_non_string_values_become_strings():
+    record = schema.to_record({
+        **_record(),
+        "TID": 7,
+        "Precondition": None,
+        "Test_Step": ["1. 로그인", ["2. 메뉴", "3. 저장"]],
+        "Result": True,
+    })
+    assert record["TID"] == "7"
+    assert record["Precondition"] == ""
+    assert record["Test_Step"] == "1. 로그인\n2. 메뉴\n3. 저장"
+    assert record["Result"] == "True"
+
+
+@pytest.mark.parametrize("item", [None, "A-1", ["A-1"], 3])
+def test_non_objects_are_skipped(item):
+    assert schema.to_record(item) is None
+    assert schema.to_records([item, {"TID": "A-1"}]) == [_record(TID="A-1")]
+
+
+def test_parse_object_wrapped_array():
+    text = json.dumps({"test_cases": [_record(TID="A-1"), {"TID": "A-2", "Extra": 1}]}, ensure_ascii=False)
+    records, parsed = schema.parse_response(text)
+    assert parsed
+    assert records == [_record(TID="A-1"), _record(TID="A-2")]
+
+
+def test_parse_bare_array_and_single_object():
+    assert schema.parse_response('[{"TID": "A-1"}]') == ([_record(TID="A-1")], True)
+    assert schema.parse_response('{"TID": "A-1"}') == ([_record(TID="A-1")], True)
+
+
+def test_parse_salvages_truncated_response():
+    records, parsed = schema.parse_response('```json\n{"test_cases": [{"TID": "A-1"}, {"TID": "A-')
+    assert not parsed
+    assert records == [_record(TID="A-1")]
+
+
+@pytest.mark.parametrize("text", ['{"cases": []}', '"A-1"', "설명만 있는 응답"])
+def test_parse_rejects_response_without_cases(text):
+    with pytest.raises(ValueError):
+        schema.parse_response(text)
@@ -0,0 +1,25 @@
+from src.llm.section_store import SectionStore
+
+
+def test_documents_with_the_same_name_do_not_overwrite_each_other(tmp_path):
+    store = SectionStore(str(tmp_path / "sections.sqlite3"), max_versions=3)
+    store.save("기획서.pdf", "hash-a", [("fp-a", [{"TID": "A"}])])
+    store.save("기획서.pdf", "hash-b", [("fp-b", [{"TID": "B"}])])
+
+    assert store.load("기획서.pdf") == {"fp-a": [{"TID": "A"}], "fp-b": [{"TID": "B"}]}
+
+
+def test_only_recent_versions_are_kept(tmp_path):
+    store = SectionStore(str(tmp_path / "sections.sqlite3"), max_versions=2)
+    for version in range(4):
+        store.save("기획서.pdf", f"hash-{version}", [(f"fp-{version}", [{"TID": str(version)}])])
+
+    assert set(store.load("기획서.pdf")) == {"fp-2", "fp-3"}
+
+
+def test_saving_a_version_again_replaces_its_sections(tmp_path):
+    store = SectionStore(str(tmp_path / "sections.sqlite3"), max_versions=3)
+    store.save("기획서.pdf", "hash-a", [("fp-old", [])])
+    store.save("기획서.pdf", "hash-a", [("fp-new", [])])
+
+    assert set(store.load("기획서.pdf")) == {"fp-new"}
@@ -0,0 +1,122 @@
+import gc
+import threading
+import time
+
+import openai
+import pytest
+
+from src.llm import openai_client, single_flight
+from src.utils import metrics
+
+
+@pytest.fixture
+def blocking_generation(monkeypatch):
+    """첫 호출이 release될 때까지 진행 중으로 남는 가짜 생성 함수를 설치합니다."""
+    monkeypatch.setattr(openai, "api_key", "sk-test-0000000000000000")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fake_generate(document_text, examples, use_cache, refresh, document_id, models=None):
+        calls.append((use_cache, refresh))
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+        return [{"TID": "TC001", "source": "refresh" if refresh else ("cache" if use_cache else "llm")}]
+
+    monkeypatch.setattr(openai_client, "_generate_test_cases", fake_generate)
+    return started, release, calls
+
+
+def _run_in_thread(results, name, **kwargs):
+    def run():
+        results[name] = openai_client.generate_test_cases("기획서 본문", [], **kwargs)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _wait_for_coalesced(before):
+    deadline = time.monotonic() + 5
+    while metrics.COALESCED_REQUESTS.value(mode="generate") == before and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_identical_request_attaches_to_leader(blocking_generation):
+    started, release, calls = blocking_generation
+    results = {}
+    before = metrics.COALESCED_REQUESTS.value(mode="generate")
+    leader = _run_in_thread(results, "leader")
+    assert started.wait(5)
+    follower = _run_in_thread(results, "follower")
+    _wait_for_coalesced(before)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert results["leader"] == results["follower"]
+    assert results["leader"] is not results["follower"]
+
+
+def test_refresh_request_does_not_attach_to_cached_leader(blocking_generation):
+    started, release, calls = blocking_generation
+    results = {}
+    leader = _run_in_thread(results, "leader")
+    assert started.wait(5)
+    refreshed = _run_in_thread(results, "refresh", refresh=True)
+    uncached = _run_in_thread(results, "uncached", use_cache=False)
+    refreshed.join(5)
+    uncached.join(5)
+    release.set()
+    leader.join(5)
+
+    assert sorted(calls) == [(False, False), (True, False), (True, True)]
+    assert results["refresh"][0]["source"] == "refresh"
+    assert results["uncached"][0]["source"] == "llm"
+    assert results["leader"][0]["source"] == "cache"
+
+
+def _gated_stream(release, produced):
+    def factory():
+        for index in range(3):
+            release.wait(5)
+            produced.append(index)
+            yield {"TID": f"TC{index:03d}"}
+    return factory
+
+
+def test_stream_subscribers_receive_all_items():
+    group = single_flight.SingleFlight()
+    release = threading.Event()
+    produced = []
+    first = group.stream("key", _gated_stream(release, produced))
+    second = group.stream("key", _gated_stream(release, produced))
+    release.set()
+    assert [case["TID"] for case in first] == ["TC000", "TC001", "TC002"]
+    assert [case["TID"] for case in second] == ["TC000", "TC001", "TC002"]
+    assert produced == [0, 1, 2]
+
+
+def test_unstarted_subscription_releases_when_dropped():
+    group = single_flight.SingleFlight()
+    release = threading.Event()
+    produced = []
+    kept = group.stream("key", _gated_stream(release, produced))
+    dropped = group.stream("key", _gated_stream(release, produced))
+    flight = group._flights["key"]
+    assert flight.subscribers == 2
+
+    del dropped
+    gc.collect()
+    assert flight.subscribers == 1
+
+    # 남은 구독자도 반복 전에 닫으면 첫 항목 뒤에 생성을 멈춤
+    kept.close()
+    kept.close()
+    assert flight.subscribers == 0
+    release.set()
+    with flight.condition:
+        assert flight.condition.wait_for(lambda: flight.finished, 5)
+    assert produced == [0]
+    assert group.in_flight() == 0
@@ -10,31 +10,45 @@ import './App.css';
 
 function App() {
   const [file, setFile] = useState(null);
-  const [extractedText, setExtractedText] = useState(null);
-  const [filePath, setFilePath] = useState(null);
+  const [documentHandle, setDocumentHandle] = useState(null);
   const [progress, setProgress] = useState(0);
   const [status, setStatus] = useState('');
   const [showProgress, setShowProgress] = useState(false);
   const [testCases, setTestCases] = useState([]);
   const [excelPath, setExcelPath] = useState(null);
   const [showResult, setShowResult] = useState(false);
+  const [streaming, setStreaming] = useState(false);
   const [error, setError] = useState(null);
 
   const resetState = () => {
     setFile(null);
-    setExtractedText(null);
-    setFilePath(null);
+    setDocumentHandle(null);
     setProgress(0);
     setStatus('');
     setShowProgress(false);
     setTestCases([]);
     setExcelPath(null);
     setShowResult(false);
+    setStreaming(false);
     setError(null);
   };
 
+  // SSE 메시지 블록("event: ...\ndata: ...")을 파싱합니다.
+  const parseSseBlock = (block) => {
+    let event = 'message';
+    const dataLines = [];
+    block.split('\n').forEach(line => {
+      if (line.startsWith('event:')) {
+        event = line.slice(6).trim();
+      } else if (line.startsWith('data:')) {
+        dataLines.push(line.slice(5).trim());
+      }
+    });
+    return { event, data: dataLines.length ? JSON.parse(dataLines.join('\n')) : null };
+  };
+
   const handleGenerateClick = async () => {
-    if (!extractedText) {
+    if (!documentHandle) {
       setError('먼저 PDF 파일을 업로드하세요.');
       return;
     }
@@ -42,40 +56,64 @@ function App() {
     setShowProgress(true);
     setStatus('테스트 케이스 생성 중...');
     setProgress(70);
+    setTestCases([]);
+    setExcelPath(null);
 
     try {
-      const response = await fetch('http://localhost:5000/api/generate', {
+      // 생성되는 즉시 테스트 케이스를 받기 위해 스트리밍 엔드포인트 사용
+      const response = await fetch('http://localhost:5000/api/generate/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({
-          text: extractedText,
-          file_path: filePath
+          document: documentHandle,
+          // 같은 파일 이름의 개정판은 변경된 섹션만 다시 생성
+          document_id: file ? file.name : undefined
         }),
       });
 
-      const data = await response.json();
-      
-      if (data.error) {
-        setError(data.error);
+      if (!response.ok) {
+        const data = await response.json();
+        setError(data.error || `서버 응답 오류: ${response.status}`);
         return;
       }
 
-      setExcelPath(data.excel_path);
-      if (data.test_cases && Array.isArray(data.test_cases)) {
-        setTestCases(data.test_cases);
-      }
+      setStreaming(true);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
 
-      setProgress(100);
-      setStatus('테스트 케이스 생성 완료!');
-      
-      setTimeout(() => {
-        setShowProgress(false);
-        setShowResult(true);
-      }, 500);
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+          const { event, data } = parseSseBlock(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+
+          if (event === 'test_case') {
+            // 첫 케이스가 도착하면 바로 미리보기를 표시
+            setTestCases(prev => [...prev, data]);
+            setShowProgress(false);
+            setShowResult(true);
+          } else if (event === 'done') {
+            setExcelPath(data.excel_path);
+            setProgress(100);
+            setStatus('테스트 케이스 생성 완료!');
+            setShowProgress(false);
+            setShowResult(true);
+          } else if (event === 'error') {
+            setError(data.error);
+          }
+        }
+      }
     } catch (error) {
       setError('테스트 케이스 생성 중 오류가 발생했습니다: ' + error.message);
+    } finally {
+      setStreaming(false);
     }
   };
 
@@ -95,8 +133,7 @@ function App() {
             <FileUploader
               file={file}
               setFile={setFile}
-              setExtractedText={setExtractedText}
-              setFilePath={setFilePath}
+              setDocumentHandle={setDocumentHandle}
               setProgress={setProgress}
               setStatus={setStatus}
               setShowProgress={setShowProgress}
@@ -111,11 +148,12 @@ function App() {
 
           {showResult && (
             <div className="result-section">
-              <TestCasePreview testCases={testCases} />
-              <DownloadSection excelPath={excelPath} />
+              <TestCasePreview testCases={testCases} streaming={streaming} />
+              {excelPath && <DownloadSection excelPath={excelPath} />}
               <button 
                 className="btn btn-secondary mt-3"
                 onClick={resetState}
+                disabled={streaming}
               >
                 다시 시작하기
               </button>
@@ -3,7 +3,7 @@ import { useDropzone } from 'react-dropzone';
 import { Card, Button } from 'react-bootstrap';
 import '../styles/FileUploader.css';
 
-function FileUploader({ file, setFile, setExtractedText, setFilePath, setProgress, setStatus, setShowProgress, setError, onGenerateClick }) {
+function FileUploader({ file, setFile, setDocumentHandle, setProgress, setStatus, setShowProgress, setError, onGenerateClick }) {
   
   const onDrop = useCallback(acceptedFiles => {
     const selectedFile = acceptedFiles[0];
@@ -15,7 +15,7 @@ function FileUploader({ file, setFile, setExtractedText, setFilePath, setProgres
     
     setFile(selectedFile);
     uploadFile(selectedFile);
-  }, [setFile, setError, setExtractedText, setFilePath, setProgress, setStatus, setShowProgress]);
+  }, [setFile, setError, setDocumentHandle, setProgress, setStatus, setShowProgress]);
 
   const { getRootProps, getInputProps, isDragActive } = useDropzone({ 
     onDrop,
@@ -53,16 +53,16 @@ function FileUploader({ file, setFile, setExtractedText, setFilePath, setProgres
       }
       
       // 텍스트 길이 확인
-      if (!data.text || data.text.length < 50) {
+      if (!data.length || data.length < 50) {
         setError('PDF에서 추출된 텍스트가 너무 적습니다. 다른 PDF 파일을 시도해보세요.');
         setShowProgress(false);
         return;
       }
       
-      setExtractedText(data.text);
-      setFilePath(data.file_path);
+      // 추출 텍스트는 서버에 보관되므로 문서 핸들만 받아 생성 요청에 사용
+      setDocumentHandle(data.document);
       setProgress(60);
-      setStatus('텍스트 추출 완료. 텍스트 길이: ' + data.text.length + '자');
+      setStatus('텍스트 추출 완료. 텍스트 길이: ' + data.length + '자');
       setShowProgress(false);
     } catch (error) {
       console.error('파일 업로드 오류:', error);
@@ -1,7 +1,7 @@
 import React from 'react';
 import { Tabs, Tab, Table } from 'react-bootstrap';
 
-function TestCasePreview({ testCases }) {
+function TestCasePreview({ testCases, streaming = false }) {
   // 최대 10개까지만 표시
   const casesToShow = testCases.slice(0, 10);
   const columns = ['TID', '대분류', '중분류', '소분류', 'Precondition', 'Test_Step', 'Expected_Result'];
@@ -10,7 +10,10 @@ function TestCasePreview({ testCases }) {
     <div className="test-case-preview mb-4">
       <Tabs defaultActiveKey="preview" className="mb-3">
         <Tab eventKey="preview" title="미리보기">
-          <div className="alert alert-info">생성된 테스트 케이스 미리보기 (최대 10개)</div>
+          <div className="alert alert-info">
+            생성된 테스트 케이스 미리보기 (최대 10개)
+            {streaming && ` - 생성 중... (현재 ${testCases.length}개 수신)`}
+          </div>
           <div className="table-responsive border rounded">
             <Table bordered striped hover>
               <thead>